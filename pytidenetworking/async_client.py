@@ -0,0 +1,93 @@
+from typing import List, Tuple, Union
+
+from pytidenetworking.client import Client
+from pytidenetworking.connection import Connection
+from pytidenetworking.message import Message
+from pytidenetworking.transports.iclient import IClient
+from pytidenetworking.transports.udp.async_udp_client import AsyncUDPClient
+from pytidenetworking.utils.delayed_events import DelayedEvent
+from pytidenetworking.utils.logengine import getLogger
+from pytidenetworking.utils.loop_scheduler import LoopScheduler
+from pytidenetworking.utils.slab_allocator import SlabBuffer
+from pytidenetworking.utils.timing_wheel import TimerHandle
+
+logger = getLogger("pytide.AsyncClient")
+
+
+class AsyncClient(Client):
+    """
+    A client driven by the running asyncio event loop instead of update() calls. Received messages are handled as
+    soon as the loop is idle, delayed events (heartbeats, connection attempts, resends) run as timers of the loop.
+
+    The transport has to be an asyncio transport (AsyncUDPClient or AsyncTCPClient), which is opened by connect().
+    """
+    def __init__(self, transport: IClient = None):
+        """
+        Initialisation
+        :param transport: The transport to use for sending and receiving data. (Defaults to AsyncUDPClient)
+        """
+        if transport is None:
+            transport = AsyncUDPClient()
+        super(AsyncClient, self).__init__(transport)
+
+        self.__transport: IClient = transport
+        """
+        The asyncio transport, opened on connect
+        """
+        self.__scheduler: LoopScheduler = LoopScheduler(self)
+        """
+        Schedules the delayed events and message handling on the event loop
+        """
+
+    async def connect(self, hostAddress: Tuple[str, int], maxConnectionAttempts: int = 5,
+                      messageHandlerGroupId: int = 0, message: Message = None, useMessageHandlers: bool = True):
+        """
+        Opens the transport on the running event loop and attempts to connect to a server at the given host address
+
+        :param hostAddress: Address of the server to connect to
+        :param maxConnectionAttempts: How many connection attempts to make before giving up
+        :param messageHandlerGroupId: Currently unused
+        :param message: Data that should be sent to the server with the connection attempt.
+        :param useMessageHandlers: if true, use message handlers (default behaviour)
+        :return: True if the connection attempt was started
+        """
+        self.disconnect()
+        try:
+            await self.__transport.open(*hostAddress)
+        except OSError as e:
+            logger.error("Failed to connect to {}:{}: {}".format(*hostAddress, e))
+            if message is not None:
+                message.release()
+            return False
+        return super(AsyncClient, self).connect(hostAddress, maxConnectionAttempts, messageHandlerGroupId, message,
+                                                useMessageHandlers)
+
+    def changeTransport(self, transport: IClient):
+        super(AsyncClient, self).changeTransport(transport)
+        self.__transport = transport
+
+    def update(self):
+        """
+        Not required, the client is updated by the event loop. Handles the queued messages right away.
+
+        :return:
+        """
+        self._updateTime()
+        self._endOfUpdate()
+
+    def executeLater(self, delay: int, event: DelayedEvent) -> TimerHandle:
+        return self.__scheduler.executeLater(delay, event)
+
+    def _framesPending(self, connection: Connection):
+        super(AsyncClient, self)._framesPending(connection)
+        # Sent at the end of the next iteration's update
+        self.__scheduler.scheduleUpdate()
+
+    def stopTime(self):
+        super(AsyncClient, self).stopTime()
+        self.__scheduler.cancelAll()
+
+    def _handleData(self, data: Union[bytes, bytearray, List[int], SlabBuffer], amount: int, connection: Connection):
+        self._updateTime()
+        super(AsyncClient, self)._handleData(data, amount, connection)
+        self.__scheduler.scheduleUpdate()
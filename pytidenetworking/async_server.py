@@ -0,0 +1,78 @@
+from typing import List, Union
+
+from pytidenetworking.connection import Connection
+from pytidenetworking.server import Server
+from pytidenetworking.transports.iserver import IServer
+from pytidenetworking.transports.udp.async_udp_server import AsyncUDPServer
+from pytidenetworking.utils.delayed_events import DelayedEvent
+from pytidenetworking.utils.loop_scheduler import LoopScheduler
+from pytidenetworking.utils.slab_allocator import SlabBuffer
+from pytidenetworking.utils.timing_wheel import TimerHandle
+
+
+class AsyncServer(Server):
+    """
+    A server driven by the running asyncio event loop instead of update() calls. Received messages are handled as
+    soon as the loop is idle, delayed events (heartbeats, resends, timeouts) run as timers of the loop.
+
+    The transport has to be an asyncio transport (AsyncUDPServer or AsyncTCPServer), which is opened by start().
+    """
+    def __init__(self, transport: IServer = None):
+        """
+        Constructor
+        :param transport: the Transport to use (Defaults to AsyncUDPServer)
+        """
+        if transport is None:
+            transport = AsyncUDPServer()
+        super(AsyncServer, self).__init__(transport)
+
+        self.__transport: IServer = transport
+        """
+        The asyncio transport, opened on start
+        """
+        self.__scheduler: LoopScheduler = LoopScheduler(self)
+        """
+        Schedules the delayed events and message handling on the event loop
+        """
+
+    async def start(self, port: int, maxClientCount: int):
+        """
+        Opens the transport on the running event loop and starts the server
+
+        :param port: The local port on which to start the server
+        :param maxClientCount: The maximum number of concurrent connections to allow
+        :return:
+        """
+        self.stop()
+        await self.__transport.open(port)
+        super(AsyncServer, self).start(port, maxClientCount)
+
+    def changeTransport(self, newTransport: IServer):
+        super(AsyncServer, self).changeTransport(newTransport)
+        self.__transport = newTransport
+
+    def update(self):
+        """
+        Not required, the server is updated by the event loop. Handles the queued messages right away.
+
+        :return:
+        """
+        self._updateTime()
+        self._endOfUpdate()
+
+    def executeLater(self, delay: int, event: DelayedEvent) -> TimerHandle:
+        return self.__scheduler.executeLater(delay, event)
+
+    def _framesPending(self, connection: Connection):
+        super(AsyncServer, self)._framesPending(connection)
+        # Sent at the end of the next iteration's update
+        self.__scheduler.scheduleUpdate()
+
+    def stopTime(self):
+        super(AsyncServer, self).stopTime()
+        self.__scheduler.cancelAll()
+
+    def _handleData(self, data: Union[bytes, bytearray, List[int], SlabBuffer], amount: int, connection: Connection):
+        self._updateTime()
+        super(AsyncServer, self)._handleData(data, amount, connection)
+        self.__scheduler.scheduleUpdate()
@@ -1,9 +1,12 @@
 # Updated to 2.1.0
-from typing import Optional, Dict, Callable, Union, Tuple, List
+from socket import socket
+from typing import Optional, Dict, Callable, Union, Tuple, List, Type, Iterable
 
+from .coalescing import putCoalescingFlag
 from .connection import Connection
 from .message import Message, createInternal as createMessage
 from .message_base import MessageHeader
+from .message_schema import MessageSchema
 from .peer import Peer, DisconnectReason, RejectReason, increaseActiveCount, decreaseActiveCount, HeartbeatEvent, \
     rejectReasonToString, disconnectReasonToString
 from .transports.iclient import IClient
@@ -72,6 +75,16 @@ class Client(Peer):
         Methods used to handle messages, accessible by their corresponding message IDs
         """
 
+        self.__batchHandlers: Dict[int, Callable[[List[Message]], None]] = {}
+        """
+        Methods used to handle all messages of an ID received during an update at once, accessible by their message IDs
+        """
+
+        self.__batches: Dict[int, List[Message]] = {}
+        """
+        Messages received during the current update for each batch handler
+        """
+
         self.__transport: IClient = transport
         """
         The underlying transport's client that is used for sending and receiving data.
@@ -178,15 +191,23 @@ class Client(Peer):
 
     #region Message Handlers
 
-    def registerMessageHandler(self, messageID: int, callback: Callable[[Message], None]):
+    def registerMessageHandler(self, messageID: int, callback: Callable[[Union[Message, MessageSchema]], None],
+                               schema: Optional[Type[MessageSchema]] = None):
         """
         Registers a handler for messages with the given ID
 
         :param messageID: Message ID handled by the handler
         :param callback: MessageHandler for messages with the given ID
+        :param schema: if given, the handler receives an instance of this schema read from the message, instead of the
+            message itself
         :return:
         """
-        self.__messageHandlers[messageID] = callback
+        if schema is not None:
+            def readSchema(message: Message):
+                callback(schema.read(message))
+            self.__messageHandlers[messageID] = readSchema
+        else:
+            self.__messageHandlers[messageID] = callback
 
     def removeMessageHandler(self, messageID: int):
         """
@@ -197,6 +218,50 @@ class Client(Peer):
         """
         del self.__messageHandlers[messageID]
 
+    def registerBatchMessageHandler(self, messageID: int, callback: Callable[[List[Message]], None]):
+        """
+        Registers a handler receiving all messages with the given ID at once: at the end of each update, the handler is
+        called with the list of messages received during that update, in the order they were received. Takes precedence
+        over a handler registered with registerMessageHandler.
+
+        The messages are only valid until the handler returned, as they are released afterwards. Handlers keeping a
+        message call message.retain(), which copies it out of the buffer it was received in.
+
+        :param messageID: Message ID handled by the handler
+        :param callback: handler for lists of messages with the given ID
+        :return:
+        """
+        self.__batchHandlers[messageID] = callback
+        self.__batches.setdefault(messageID, [])
+
+    def removeBatchMessageHandler(self, messageID: int):
+        """
+        Removes the batch handler for messages with the given ID. Messages received for it during the current update are
+        dropped.
+
+        :param messageID: Message ID of handler to remove
+        :return:
+        """
+        del self.__batchHandlers[messageID]
+        for message in self.__batches.pop(messageID, ()):
+            message.release()
+
+    def _handleBatches(self):
+        """
+        Calls the batch handlers with the messages received during this update
+        :return:
+        """
+        # Handlers may register or remove batch handlers
+        for messageID, batch in list(self.__batches.items()):
+            if len(batch) == 0 or self.__batches.get(messageID) is not batch:
+                continue
+            self.__batches[messageID] = []
+            try:
+                self.__batchHandlers[messageID](batch)
+            finally:
+                for message in batch:
+                    message.release()
+
     #endregion
 
     def changeTransport(self, transport: IClient):
@@ -253,6 +318,8 @@ class Client(Peer):
                 logger.error("Use the parameterless 'Message.Create()' overload when setting connection attempt data!")
             self.__connectMessage.appendMessage(message)
             message.release()
+        if self.coalescePackets:
+            putCoalescingFlag(self.__connectMessage)
 
         self.startTime()
         self.heartbeat()
@@ -315,7 +382,13 @@ class Client(Peer):
         """
         super(Client, self).update()
         self.__transport.poll()
-        self._handleMessages()
+        self._endOfUpdate()
+
+    def sockets(self) -> List[socket]:
+        """
+        :return: the sockets of the transport, which update() receives from
+        """
+        return self.__transport.sockets()
 
     def handle(self, message: Message, header: Union[MessageHeader, int], connection: Connection):
         """
@@ -369,6 +442,15 @@ class Client(Peer):
         """
         return self.__connection.sendMessage(message, shouldRelease)
 
+    def sendBatch(self, messages: Iterable[Message], shouldRelease: bool = True) -> List[int]:
+        """
+        Sends the given messages in one go, see Connection.sendBatch
+        :param messages: Messages to send, in order
+        :param shouldRelease: True if the messages should be released back into the pool. Defaults to true.
+        :return: the sequence IDs of the messages
+        """
+        return self.__connection.sendBatch(messages, shouldRelease)
+
     def disconnect(self, connection: Connection = None, reason: DisconnectReason = None):
         """
         Disconnect this client from the server
@@ -397,6 +479,7 @@ class Client(Peer):
         if self.isNotConnected:
             return
 
+        self.__connection.flushFrames()
         self.unsubToTransportEvents()
         decreaseActiveCount()
 
@@ -478,7 +561,11 @@ class Client(Peer):
         messageID = message.msgID
         self.MessageReceived(self.__connection, messageID, message)
         if self._useMessageHandlers:
-            if messageID in self.__messageHandlers:
+            batch = self.__batches.get(messageID)
+            if batch is not None:
+                # Kept until the end of the update, released by _handleBatches()
+                batch.append(message.hold())
+            elif messageID in self.__messageHandlers:
                 self.__messageHandlers[messageID](message)
             else:
                 logger.warning("No message handler method found for message ID '{}'".format(messageID))
@@ -0,0 +1,152 @@
+from typing import Callable, Iterator, List, Tuple, Union
+
+from pytidenetworking.message import Message
+from pytidenetworking.message_base import MessageHeader, _MAX_SIZE
+from pytidenetworking.utils.converter import BITS_PER_BYTE
+from pytidenetworking.utils.varint import encodeVarULong, decodeVarULong
+
+COALESCING_FLAG = 0x4C414F43
+"""
+Appended to the connect and welcome messages by peers supporting packet coalescing. Riptide ignores it, as it follows
+all data read from these messages. Removed from received messages before they are handed to user code.
+"""
+
+MAX_COALESCED_SIZE = _MAX_SIZE
+"""
+Maximum size in bytes of a datagram containing coalesced frames
+"""
+
+
+#region Negotiation
+
+def putCoalescingFlag(message: Message):
+    """
+    Appends the coalescing flag to a connect or welcome message. The flag is aligned to the end of the frame, so the
+    receiver finds it without knowing the size of the data before it.
+
+    :param message: message to append the flag to
+    :return:
+    """
+    padding = -(message.headerBits + message.writtenBits) % BITS_PER_BYTE
+    if padding > 0:
+        message.putBits(0, padding)
+    message.putUInt32(COALESCING_FLAG)
+
+
+def stripCoalescingFlag(message: Message) -> bool:
+    """
+    Removes the coalescing flag from a received connect or welcome message, so the message reads as if it was sent
+    without the flag
+
+    :param message: a received connect or welcome message
+    :return: True if the sender appended the coalescing flag, i.e. supports packet coalescing
+    """
+    flagPosition = message.writtenBits - 32
+    if flagPosition < message.readBits or (message.dataOffset + flagPosition) % BITS_PER_BYTE != 0:
+        return False
+    readBit = message.readBit
+    flag = message.getUInt32(flagPosition)
+    message.readBit = readBit
+    if flag != COALESCING_FLAG:
+        return False
+    # The padding before the flag ends the frame, just like the padding of a frame sent without the flag
+    message.writeBit = flagPosition
+    return True
+
+#endregion
+
+
+class PacketCoalescer:
+    """
+    Packs the frames sent on a connection into datagrams of up to MAX_COALESCED_SIZE bytes: a Coalesced header byte,
+    followed by each frame's length (as varint) and bytes.
+    """
+
+    def __init__(self, send: Callable[[Union[bytes, bytearray, memoryview], int], None]):
+        """
+        Constructor
+
+        :param send: sends a datagram on the connection
+        """
+        self.__send: Callable[[Union[bytes, bytearray, memoryview], int], None] = send
+        self.__buffer: bytearray = bytearray(MAX_COALESCED_SIZE)
+        self.__buffer[0] = MessageHeader.Coalesced
+        self.__size: int = 1
+        self.__frameCount: int = 0
+        self.__firstFrame: Tuple[int, int] = (0, 0)
+        """
+        Position and size of the first frame within the buffer, sent on its own if no other frame follows
+        """
+
+    @property
+    def hasFrames(self) -> bool:
+        """
+        :return: True if frames are waiting to be sent
+        """
+        return self.__frameCount > 0
+
+    def add(self, dataBuffer: Union[bytes, bytearray, memoryview, List[int]], amount: int) -> bool:
+        """
+        Adds a frame to the next datagram, sends the pending frames first if the frame doesn't fit anymore.
+
+        :param dataBuffer: the frame
+        :param amount: the size of the frame in bytes
+        :return: False if the frame is too big to be coalesced, after the pending frames were sent
+        """
+        lengthBytes = encodeVarULong(amount)
+        if self.__size + len(lengthBytes) + amount > MAX_COALESCED_SIZE:
+            self.flush()
+            if 1 + len(lengthBytes) + amount > MAX_COALESCED_SIZE:
+                return False
+
+        start = self.__size + len(lengthBytes)
+        self.__buffer[self.__size:start] = lengthBytes
+        self.__buffer[start:start + amount] = dataBuffer[:amount] if not isinstance(dataBuffer, list) \
+            else bytes(dataBuffer[:amount])
+        if self.__frameCount == 0:
+            self.__firstFrame = (start, amount)
+        self.__size = start + amount
+        self.__frameCount += 1
+        return True
+
+    def flush(self):
+        """
+        Sends the pending frames. A single frame is sent as it is.
+        :return:
+        """
+        if self.__frameCount == 0:
+            return
+        view = memoryview(self.__buffer)
+        if self.__frameCount == 1:
+            start, amount = self.__firstFrame
+            self.__send(view[start:start + amount], amount)
+        else:
+            self.__send(view[:self.__size], self.__size)
+        self.__size = 1
+        self.__frameCount = 0
+
+    def clear(self):
+        """
+        Drops the pending frames
+        :return:
+        """
+        self.__size = 1
+        self.__frameCount = 0
+
+
+def splitFrames(data: Union[bytes, bytearray, memoryview], amount: int) -> Iterator[Tuple[int, int]]:
+    """
+    Splits a datagram of coalesced frames
+
+    :param data: the received datagram, starting with the Coalesced header
+    :param amount: size of the datagram in bytes
+    :return: the position and size of each frame within data. Stops at the first malformed frame.
+    """
+    position = 1
+    while position < amount:
+        length, bitCount = decodeVarULong(data, position * BITS_PER_BYTE)
+        position += bitCount // BITS_PER_BYTE
+        if length <= 0 or position + length > amount:
+            return
+        yield position, length
+        position += length
@@ -1,25 +1,54 @@
 # Updated to 2.1.0
 
+from collections import deque
 from time import time
 from enum import IntEnum
-from typing import Optional, Dict, Union, List
+from typing import Optional, Dict, Union, List, Deque, Iterable
 
-from pytidenetworking.message_base import MessageBase, MessageSendMode, MessageHeader, HEADER_BITS
+from pytidenetworking.message_base import MessageBase, MessageSendMode, MessageHeader, HEADER_BITS, HEADER_BITMASK, \
+    _MAX_SIZE
 
+from .coalescing import PacketCoalescer, putCoalescingFlag, stripCoalescingFlag
 from .pending_message import PendingMessage, createPending
 from .message import createInternal as createMessage, Message
 
 from pytidenetworking.peer import Peer, DisconnectReason
-from .utils.bitfield import Bitfield
+from .utils.sequence_window import SequenceWindow
+from .utils.congestion import CongestionController
 from .utils.connection_metrics import ConnectionMetrics
 from .utils.converter import ushortFromBits, byteFromBits
 from .utils.eventhandler import EventHandler
+from .utils.exceptions import InsufficientCapacityException
 from .utils.logengine import getLogger
 from .utils.notify_sequencer import NotifySequencer
+from .utils.outbound_buffer import OutboundBuffer
+from .utils.pending_window import PendingWindow
 from .utils.relieble_sequencer import ReliableSequencer
+from .utils.delayed_events import DelayedEvent
+from .utils.timing_wheel import TimerHandle
+from .utils.token_bucket import TokenBucket
 
 LEFT_BIT = 0b1000_0000_0000_0000
 
+PACING_BURST = 10
+"""
+Time in milliseconds worth of the send rate a paced connection may send in a single burst
+"""
+PACED_HEADERS = (MessageHeader.Unreliable, MessageHeader.Notify, MessageHeader.Reliable)
+"""
+Headers of the messages held back by pacing. Acks, heartbeats and the other internal messages are sent right away,
+but count towards the send rate.
+"""
+MAX_WAITING_MESSAGES = 1 << 14
+"""
+Number of reliable messages that may wait for room in the pending window at most. Keeps the sequence IDs of waiting
+messages well within the half of the sequence ID range the remote peer considers newer than the ones it received.
+"""
+DEFAULT_MAX_PACED_BYTES = 64 * 1024
+"""
+Default number of bytes a connection holds back for pacing, before it drops unreliable and notify messages
+"""
+
 logger = getLogger("pytide.connection")
 
 class ConnectionState(IntEnum):
@@ -43,10 +72,38 @@ class ConnectionState(IntEnum):
     Connected. A connection has been established successfully.
     """
 
+class ResendEvent(DelayedEvent):
+    """
+    Resends the overdue pending messages of a connection when invoked.
+    """
+    def __init__(self, priority, connection):
+        super(ResendEvent, self).__init__(priority)
+        self.connection = connection
+
+    def __call__(self, *args, **kwargs):
+        self.connection.resendOverdue()
+
+class PacingEvent(DelayedEvent):
+    """
+    Sends the messages held back by the pacer of a connection when invoked.
+    """
+    def __init__(self, priority, connection):
+        super(PacingEvent, self).__init__(priority)
+        self.connection = connection
+
+    def __call__(self, *args, **kwargs):
+        self.connection.sendPaced()
+
 class Connection:
     """
     Represents a connection to a server or client
     """
+    FRAME_PREFIX_SIZE: int = 0
+    """
+    Number of bytes the transport frames each message with, reserved in front of the queued messages (see
+    writeFramePrefix())
+    """
+
     def __init__(self):
         """
         Initializes the connection.
@@ -68,6 +125,11 @@ class Connection:
         """
         Invoked when the reliable message with the given sequence ID is successfully delivered.
         """
+        self.pendingWindowFull = EventHandler()
+        """
+        Invoked with the sequence ID of a reliable message which has to wait for room in the pending window, once the
+        window filled up. The message and the ones sent after it are sent as earlier messages get acknowledged.
+        """
 
         self.__id: int = 0
         self.__state = ConnectionState.Connecting
@@ -94,10 +156,51 @@ class Connection:
         self.__notify: NotifySequencer = NotifySequencer(self)
         self.__reliable: ReliableSequencer = ReliableSequencer(self)
 
-        self.__pendingMessages: Dict[int, PendingMessage] = {}
+        self.__pendingMessages: PendingWindow = PendingWindow()
+        """
+        Reliably sent messages whose delivery has not been acknowledged yet, by sequence ID
+        """
+        self.__waitingMessages: Deque[PendingMessage] = deque()
+        """
+        Reliable messages not sent yet, as they did not fit into the pending window, oldest first
+        """
+        self.__resendTimer: Optional[TimerHandle] = None
+        """
+        Single timer for all pending messages, due at the earliest resend time among them
+        """
 
         self._peer: Optional[Peer] = None
 
+        self.__coalescer: Optional[PacketCoalescer] = None
+        """
+        Packs the messages sent during an update into as few datagrams as possible, None unless both peers negotiated
+        packet coalescing
+        """
+
+        self.__congestionController: Optional[CongestionController] = None
+        self.__pacer: Optional[TokenBucket] = None
+        """
+        Limits the messages sent to the rate of the congestion controller, None unless a congestion controller is set
+        """
+        self.__pacedFrames: Deque[bytes] = deque()
+        """
+        Messages held back by the pacer, oldest first
+        """
+        self.__pacedByteCount: int = 0
+        self.maxPacedBytes: int = DEFAULT_MAX_PACED_BYTES
+        """
+        Number of bytes held back by the pacer above which unreliable and notify messages are dropped instead of being
+        queued. Reliable messages are always queued, the pending window limits how many of them are in flight.
+        """
+        self.__pacingTimer: Optional[TimerHandle] = None
+
+        self.__outbound: Optional[OutboundBuffer] = None
+        """
+        Messages waiting to be sent by flushFrames(), oldest first. Used while sending a batch, or if the peer defers
+        sends (see Peer.deferSends) and packet coalescing is not negotiated. Created by initialize().
+        """
+        self.__batchDepth: int = 0
+
         self.__sendAttemptViolations: int = 0
         self.__lossRateViolations: int = 0
 
@@ -241,11 +344,55 @@ class Connection:
 #    def peer(self, value):
 #        self._peer = value
 
+    #region Congestion Control
+    @property
+    def congestionController(self) -> Optional[CongestionController]:
+        """
+        :return: The congestion controller deciding the send rate of this connection, None if messages are sent
+        without pacing
+        """
+        return self.__congestionController
+
+    @congestionController.setter
+    def congestionController(self, value: Optional[CongestionController]):
+        """
+        Sets the congestion controller deciding the send rate of this connection, None to send without pacing. Messages
+        held back so far are sent right away.
+
+        :param value: value to set
+        :return:
+        """
+        self.__congestionController = value
+        if value is None:
+            self.__pacer = None
+            self.__cancelPacing()
+            self.__pacedByteCount = 0
+            while len(self.__pacedFrames) > 0:
+                frame = self.__pacedFrames.popleft()
+                self.__transmit(frame, len(frame))
+        else:
+            now = self._peer.current_time if self._peer is not None else 0
+            self.__pacer = TokenBucket(value.rate, self.__pacingCapacity(value.rate), now)
+
+    @property
+    def pacedBytes(self) -> int:
+        """
+        :return: the number of bytes held back by the pacer
+        """
+        return self.__pacedByteCount
+
+    #endregion
+
     #endregion
 
     def initialize(self, peer: Peer, timeoutTime: int):
         self._peer = peer
         self.timeoutTime = timeoutTime
+        if self.__outbound is not None:
+            self.__outbound.clear()
+        self.__outbound = OutboundBuffer(peer.outboundSlabs, self.FRAME_PREFIX_SIZE)
+        if peer.congestionControl is not None:
+            self.congestionController = peer.congestionControl()
 
     def resetTimeout(self):
         """
@@ -267,17 +414,29 @@ class Connection:
         if message.sendMode == MessageSendMode.Notify:
             sequenceID = self.__notify.insertHeader(message)
             byteAmount = message.bytesInUse
-            self.send(*message.createBytestream())
+            self.sendFrame(*message.createBytestream())
             self.__connectionMetrics.sentNotify(byteAmount)
         elif message.sendMode == MessageSendMode.Unreliable:
             byteAmount = message.bytesInUse
-            self.send(*message.createBytestream())
+            self.sendFrame(*message.createBytestream())
             self.__connectionMetrics.sentUnreliable(byteAmount)
         else:
+            waiting = self.__waitingMessages
+            if len(waiting) >= MAX_WAITING_MESSAGES:
+                if shouldRelease:
+                    message.release()
+                raise InsufficientCapacityException()
             sequenceID = self.__reliable.nextSequenceID
             pendingMessage = createPending(sequenceID, message, self)
-            self.__pendingMessages[sequenceID] = pendingMessage
-            pendingMessage.trySend()
+            if len(waiting) == 0 and self.__pendingMessages.canAdd(sequenceID):
+                self.__pendingMessages.add(sequenceID, pendingMessage)
+                pendingMessage.trySend()
+            else:
+                # Sent in order once the remote peer acknowledged the oldest pending messages
+                waiting.append(pendingMessage)
+                if len(waiting) == 1:
+                    logger.warning("Pending window of {} is full, reliable messages wait for acknowledgements".format(self))
+                    self.pendingWindowFull(sequenceID)
             self.__connectionMetrics.incrementReliableUniques()
 
         if shouldRelease:
@@ -285,6 +444,36 @@ class Connection:
 
         return sequenceID
 
+    def __sendWaiting(self):
+        """
+        Moves the reliable messages waiting for room into the pending window and sends them, as far as they fit
+        :return:
+        """
+        waiting = self.__waitingMessages
+        window = self.__pendingMessages
+        while len(waiting) > 0 and window.canAdd(waiting[0].seqID):
+            pendingMessage = waiting.popleft()
+            window.add(pendingMessage.seqID, pendingMessage)
+            pendingMessage.trySend()
+
+    def sendBatch(self, messages: Iterable[MessageBase], shouldRelease: bool = True) -> List[int]:
+        """
+        Sends the given messages in one go: they are queued, and handed to the transport together once all of them
+        were assembled. If the peer defers sends (see Peer.deferSends), they are sent at the end of the update instead.
+
+        :param messages: Messages to send, in order
+        :param shouldRelease: If true, the messages are released back into the message pool. Defaults to true
+        :return: the sequence IDs of the messages
+        """
+        self.__batchDepth += 1
+        try:
+            sequenceIDs = [self.sendMessage(message, shouldRelease) for message in messages]
+        finally:
+            self.__batchDepth -= 1
+        if self.__batchDepth == 0 and not self._peer.deferSends:
+            self.__flushOutbound()
+        return sequenceIDs
+
     def send(self, dataBuffer: Union[bytes, bytearray, List[int]], amount: int):
         """
         Sends data
@@ -295,6 +484,211 @@ class Connection:
         # Not Implemented (only in subclasses)
         pass
 
+    def sendFrame(self, dataBuffer: Union[bytes, bytearray, memoryview, List[int]], amount: int):
+        """
+        Sends a single message. If a congestion controller is set, user messages exceeding its send rate are held back
+        and sent by sendPaced() later on, unreliable and notify messages are dropped once maxPacedBytes are held back.
+        If packet coalescing was negotiated, the message is sent together with the other messages of this update by
+        flushFrames().
+
+        :param dataBuffer: The buffer containing the message
+        :param amount: The number of bytes in the array which should be sent
+        :return:
+        """
+        pacer = self.__pacer
+        if pacer is not None:
+            self.__refillPacer()
+            header = dataBuffer[0] & HEADER_BITMASK
+            if header not in PACED_HEADERS:
+                pacer.consume(amount)
+            elif len(self.__pacedFrames) > 0 or not pacer.tryConsume(amount):
+                if header != MessageHeader.Reliable and self.__pacedByteCount + amount > self.maxPacedBytes:
+                    # Would only get more outdated while waiting, the receiver treats it as lost
+                    self.__connectionMetrics.incrementPacedDiscarded()
+                    return
+                # Copied, as the buffer is reused once the message is released
+                self.__pacedFrames.append(bytes(dataBuffer[:amount]))
+                self.__pacedByteCount += amount
+                self.__schedulePacing()
+                return
+        self.__transmit(dataBuffer, amount)
+
+    def sendPaced(self):
+        """
+        Sends the messages held back by the pacer, as far as the send rate allows, and schedules sending the rest
+        :return:
+        """
+        self.__pacingTimer = None
+        pacer = self.__pacer
+        if pacer is None:
+            return
+        self.__refillPacer()
+        frames = self.__pacedFrames
+        while len(frames) > 0 and pacer.tryConsume(len(frames[0])):
+            frame = frames.popleft()
+            self.__pacedByteCount -= len(frame)
+            self.__transmit(frame, len(frame))
+        if len(frames) > 0:
+            self.__schedulePacing()
+
+    def __refillPacer(self):
+        """
+        Updates the pacer to the current rate of the congestion controller, and refills it
+        :return:
+        """
+        rate = self.__congestionController.rate
+        self.__pacer.rate = rate
+        self.__pacer.capacity = self.__pacingCapacity(rate)
+        self.__pacer.refill(self._peer.current_time)
+
+    def __pacingCapacity(self, rate: float) -> int:
+        """
+        :param rate: send rate in bytes per second
+        :return: the burst size in bytes allowed at the given rate, at least one full sized message
+        """
+        return max(_MAX_SIZE, int(rate * PACING_BURST / 1000))
+
+    def __schedulePacing(self):
+        """
+        Makes sure sendPaced() is called once the pacer allows sending the oldest held back message
+        :return:
+        """
+        if self.__pacingTimer is not None and self.__pacingTimer.active:
+            return
+        delay = self.__pacer.timeUntil(len(self.__pacedFrames[0]))
+        self.__pacingTimer = self._peer.executeLater(delay, PacingEvent(delay, self))
+
+    def __cancelPacing(self):
+        if self.__pacingTimer is not None:
+            self.__pacingTimer.cancel()
+            self.__pacingTimer = None
+
+    def __transmit(self, dataBuffer: Union[bytes, bytearray, memoryview, List[int]], amount: int):
+        """
+        Sends a single message right away, or queues it to be sent by flushFrames()
+        :param dataBuffer: The buffer containing the message
+        :param amount: The number of bytes in the array which should be sent
+        :return:
+        """
+        coalescer = self.__coalescer
+        if coalescer is not None:
+            if not coalescer.hasFrames:
+                self._peer._framesPending(self)
+            if not coalescer.add(dataBuffer, amount):
+                self.send(dataBuffer, amount)
+        elif self.__batchDepth > 0 or self._peer.deferSends:
+            outbound = self.__outbound
+            if len(outbound) == 0:
+                self._peer._framesPending(self)
+            # Staged behind the queued messages, as the buffer is reused once the message is released
+            view, prefixPosition = outbound.add(dataBuffer, amount)
+            self.writeFramePrefix(view, prefixPosition, amount)
+        else:
+            self.send(dataBuffer, amount)
+
+    def writeFramePrefix(self, view: memoryview, position: int, amount: int):
+        """
+        Writes the transport's framing in front of a queued message. Transports with a FRAME_PREFIX_SIZE override this.
+
+        :param view: The staging buffer
+        :param position: The position of the FRAME_PREFIX_SIZE bytes reserved in front of the message
+        :param amount: The size of the message in bytes
+        :return:
+        """
+        pass
+
+    def sendFrames(self, frames: OutboundBuffer):
+        """
+        Sends the queued messages, each as a datagram of its own. Transports able to send several messages at once
+        override this. The staged messages are dropped once this returns.
+
+        :param frames: the messages to send, in order
+        :return:
+        """
+        for frame in frames.frames():
+            self.send(frame, len(frame))
+
+    def __flushOutbound(self):
+        outbound = self.__outbound
+        if outbound is None or len(outbound) == 0:
+            return
+        try:
+            self.sendFrames(outbound)
+        finally:
+            outbound.clear()
+
+    def flushFrames(self):
+        """
+        Sends the queued and coalesced messages, if any
+        :return:
+        """
+        self.__flushOutbound()
+        if self.__coalescer is not None:
+            self.__coalescer.flush()
+
+    @property
+    def coalescing(self) -> bool:
+        """
+        :return: True if packet coalescing was negotiated for this connection
+        """
+        return self.__coalescer is not None
+
+    def enableCoalescing(self):
+        """
+        Packs the messages sent on this connection into as few datagrams as possible from now on. Only to be called
+        once the remote peer announced it receives coalesced datagrams.
+        :return:
+        """
+        if self.__coalescer is None:
+            self.__coalescer = PacketCoalescer(self.send)
+
+    def scheduleResend(self, resendTime: int):
+        """
+        Makes sure the resend timer fires by the given time
+
+        :param resendTime: time of a pending message's next resend attempt
+        :return:
+        """
+        if self.__resendTimer is not None:
+            if self.__resendTimer.active and self.__resendTimer.deadline <= resendTime:
+                return
+            self.__resendTimer.cancel()
+        self.__resendTimer = self._peer.executeLater(max(0, resendTime - self._peer.current_time),
+                                                     ResendEvent(resendTime, self))
+
+    def resendOverdue(self):
+        """
+        Resends all pending messages whose resend time has passed, then rearms the resend timer for the earliest
+        remaining one
+        :return:
+        """
+        self.__resendTimer = None
+        now = self._peer.current_time
+        if len(self.__pacedFrames) > 0:
+            # Resending now would only add to the held back messages, possibly the very messages to resend
+            self.scheduleResend(now + max(1, self.__pacer.timeUntil(len(self.__pacedFrames[0]))))
+            return
+        # A single pass, oldest first. Resent messages rearm the timer themselves, the earliest of the others is
+        # collected on the way. Messages given up on are removed afterwards, as removing moves the window.
+        window = self.__pendingMessages
+        earliest = -1
+        givenUp = []
+        for pendingMessage in window:
+            if pendingMessage.resendTime <= now and not pendingMessage.wasCleared:
+                pendingMessage.retrySend()
+            if pendingMessage.wasCleared:
+                givenUp.append(pendingMessage)
+            elif pendingMessage.resendTime > now and (earliest < 0 or pendingMessage.resendTime < earliest):
+                earliest = pendingMessage.resendTime
+
+        for pendingMessage in givenUp:
+            if window.get(pendingMessage.seqID) is pendingMessage:
+                window.remove(pendingMessage.seqID)
+        if len(givenUp) > 0:
+            self.__sendWaiting()
+        if earliest >= 0:
+            self.scheduleResend(earliest)
+
     #endregion
 
     #region Notify Handling
@@ -303,9 +697,11 @@ class Connection:
         self.__notify.updateReceivedAcks(ushortFromBits(dataBuffer, HEADER_BITS), byteFromBits(dataBuffer, HEADER_BITS + 16))
         self.__connectionMetrics.receivedNotify(amount)
         if self.__notify.shouldHandle(ushortFromBits(dataBuffer, HEADER_BITS + 24)):
+            # Handlers keeping the message call message.retain()
             self.notifyReceived(message)
         else:
             self.__connectionMetrics.incrementNotifyDiscarded()
+        message.release()
     #endregion
 
     #region reliable handling
@@ -313,6 +709,27 @@ class Connection:
     def shouldHandle(self, sequenceID) -> bool:
         return self.__reliable.shouldHandle(sequenceID)
 
+    @property
+    def delaysAcks(self) -> bool:
+        """
+        :return: True if acks are delayed, to be sent as one per update by the peer (see Peer.delayAcks)
+        """
+        return self._peer is not None and self._peer.delayAcks
+
+    def delayAck(self):
+        """
+        Called by the reliable sequencer once it delayed an ack, has the peer flush it
+        :return:
+        """
+        self._peer._delayAck(self)
+
+    def flushAck(self):
+        """
+        Sends the delayed ack, if any
+        :return:
+        """
+        self.__reliable.flushAck()
+
     #endregion
 
     def localDisconnect(self):
@@ -323,24 +740,41 @@ class Connection:
         """
         self.__state = ConnectionState.NotConnected
 
-        for msg in self.__pendingMessages.values():
+        for msg in self.__pendingMessages.clear():
             msg.clear()
-
-        self.__pendingMessages.clear()
+        while len(self.__waitingMessages) > 0:
+            self.__waitingMessages.popleft().clear()
+
+        if self.__resendTimer is not None:
+            self.__resendTimer.cancel()
+            self.__resendTimer = None
+        self.__reliable.discardAck()
+        if self.__coalescer is not None:
+            self.__coalescer.clear()
+        self.__pacedFrames.clear()
+        self.__pacedByteCount = 0
+        self.__cancelPacing()
+        if self.__outbound is not None:
+            self.__outbound.clear()
 
     def resendMessage(self, sequenceID: int):
         """
         Resend the pending message with the given sequence ID
         :param: sequenceID - Sequence ID of the message
         """
-        if sequenceID in self.__pendingMessages:
-            self.__pendingMessages[sequenceID].retrySend()
+        pendingMessage = self.__pendingMessages.get(sequenceID)
+        if pendingMessage is not None:
+            pendingMessage.retrySend()
 
     def clearMessage(self, sequenceID: int):
-        if sequenceID in self.__pendingMessages:
+        pendingMessage = self.__pendingMessages.remove(sequenceID)
+        if pendingMessage is not None:
             self.reliableDelivered(sequenceID)
-            self.__pendingMessages[sequenceID].clear()
-            del self.__pendingMessages[sequenceID]
+            pendingMessage.clear()
+            if len(self.__waitingMessages) > 0:
+                self.__sendWaiting()
+            if self.__congestionController is not None:
+                self.__congestionController.onAcknowledged(self._peer.current_time, self.smoothRTT)
             self.__updateSendAttemptViolations()
 
     def setPending(self):
@@ -365,7 +799,7 @@ class Connection:
             self.__lossRateViolations = 0
 
     #region Messages
-    def sendAck(self, sequenceID: int, lastReceivedSeqID: int, receivedSeqIds: Bitfield):
+    def sendAck(self, sequenceID: int, lastReceivedSeqID: int, receivedSeqIds: SequenceWindow):
         """
         Sends an ack message for the given sequence ID
 
@@ -408,6 +842,8 @@ class Connection:
         """
         message = createMessage(MessageHeader.Welcome)
         message.putUInt16(self.__id)
+        if self.coalescing:
+            putCoalescingFlag(message)
         self.sendMessage(message)
 
     def handleWelcomeResponse(self, message: Message) -> bool:
@@ -465,6 +901,8 @@ class Connection:
         :return:
         """
         self.__id = message.getUInt16()
+        if stripCoalescingFlag(message) and self._peer.coalescePackets:
+            self.enableCoalescing()
         self.__state = ConnectionState.Connected
         self.resetTimeout()
 
@@ -515,14 +953,28 @@ class Connection:
 
     def onNotifyDelivered(self, sequenceID: int):
         self.__connectionMetrics.deliveredNotify()
+        if self.__congestionController is not None:
+            self.__congestionController.onAcknowledged(self._peer.current_time, self.smoothRTT)
         self.notifyDelivered(sequenceID)
         self.__updateLossViolations()
 
     def onNotifyLost(self, sequenceID: int):
         self.__connectionMetrics.lostNotify()
+        if self.__congestionController is not None:
+            self.__congestionController.onLoss(self._peer.current_time, self.smoothRTT)
         self.notifyLost(sequenceID)
         self.__updateLossViolations()
 
+    def onReliableResend(self, sequenceID: int):
+        """
+        Called when a reliable message is resent, as it was not acknowledged in time
+
+        :param sequenceID: sequence ID of the message
+        :return:
+        """
+        if self.__congestionController is not None:
+            self.__congestionController.onLoss(self._peer.current_time, self.smoothRTT)
+
     #endregion
 
     #endregion
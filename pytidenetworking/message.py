@@ -5,9 +5,15 @@ try:
 except ImportError:
     from typing_extensions import Literal, Optional
 
+from struct import Struct, unpack, unpack_from
+from typing import Sequence
+
 from .message_base import *
-from .utils.converter import fp32_to_bytes, fp64_to_bytes, bytes_to_fp32, bytes_to_fp64, BITS_PER_BYTE, \
-    BITS_PER_SEGMENT, bytesToBits, bytesFromBits, setBitsFromBytes, getBitsToBytes, setBits8, getBits
+from .message_base import _MAX_SIZE, _MAX_BIT_COUNT
+from .utils.converter import BITS_PER_BYTE, BITS_PER_SEGMENT, readBits, readBitsInt, writeBits, \
+    writeBitsInt, getBitsToBytes, setBits8, getBits, INT8_STRUCT, UINT8_STRUCT, INT16_STRUCT, UINT16_STRUCT, \
+    INT32_STRUCT, UINT32_STRUCT, INT64_STRUCT, UINT64_STRUCT, FLOAT_STRUCT, DOUBLE_STRUCT
+from .utils.varint import encodeVarULong, decodeVarULong, varULongSize
 from .utils.exceptions import InsufficientCapacityException, ArgumentOutOfRangeException, NotEnoughBytesError
 from .utils.logengine import getLogger
 
@@ -16,16 +22,24 @@ from .constants import activeCount
 from math import ceil
 
 from .utils.object_pool import ObjectPool
+from .utils.slab_allocator import SlabBuffer
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 logger = getLogger("pytide.Message")
 
 #region Static Vars
 
 POOL_SIZE = 10
+MAX_POOL_SIZE = 256
+"""
+Ceiling the message pool may grow to under load
+"""
 
-
-
-MESSAGE_POOL: ObjectPool['Message'] = ObjectPool(POOL_SIZE)
+MESSAGE_POOL: ObjectPool['Message'] = ObjectPool(POOL_SIZE, MAX_POOL_SIZE)
 
 @property
 def maxSize():
@@ -79,6 +93,28 @@ class Message(MessageBase):
         """
         super(Message, self).__init__()
 
+        self.__buffer: bytearray = bytearray(_MAX_SIZE)
+        """
+        Payload buffer of the message. Allocated once and reused whenever the message is taken from the pool again,
+        only the first bytesInUse bytes are valid.
+        """
+        self.data = self.__buffer
+        self.__layout: Tuple[int, int, int] = (-1, -1, -1)
+        """
+        Header, message ID and payload offset of the bytestream last assembled in the buffer
+        """
+        self.__references: int = 0
+        """
+        Number of holders of this message, see retain()
+        """
+        self.__frameReferences: int = 0
+        """
+        Number of holders of the bytestream assembled in the buffer, see shareFrame()
+        """
+        self.__receiveBuffer: Optional[SlabBuffer] = None
+        """
+        Transport buffer a received message reads from, held until the message no longer reads from it
+        """
 
     def init(self, header: Union[MessageSendMode, MessageHeader] = None):
         """
@@ -87,19 +123,208 @@ class Message(MessageBase):
         :param header: Header to set for the new use of the message object
         :return:
         """
-        self.data = bytearray()
+        if self.__frameReferences > 0:
+            # Still sent by the holders of the shared buffer
+            self.__buffer = bytearray(_MAX_SIZE)
+        self.data = self.__buffer
+        self.dataOffset = 0
+        self.__dropReceiveBuffer()
+        self.__layout = (-1, -1, -1)
+        self.__references = 1
+        self.__frameReferences = 0
         if header is not None:
             self.header = header
+            self.dataOffset = self.__reserveHeader()
         self.readBit = 0
         self.writeBit = 0
 
+    def __reserveHeader(self) -> int:
+        """
+        Reserves the space for the header and message ID at the front of the buffer, so the payload only needs to be
+        moved by a few bits to reach its position within the sent bytestream. The payload starts at the next byte
+        boundary, which keeps byte aligned values on the fast path while writing.
+
+        :return: the position of the first payload bit within the buffer
+        """
+        bitpos = self.headerBits
+        if self.hasMessageID and self.msgID >= 0:
+            bitpos += varULongSize(self.msgID) * BITS_PER_BYTE
+        return ceil(bitpos / BITS_PER_BYTE) * BITS_PER_BYTE
+
+    @property
+    def referenceCount(self) -> int:
+        """
+        :return: the number of holders of this message
+        """
+        return self.__references
+
+    def retain(self) -> "Message":
+        """
+        Adds a holder to this message. The message only returns to the pool once release() was called for every holder,
+        i.e. once more than retain() was called. Received messages are detached from the buffer they were received in,
+        so they can be kept after the handler returned.
+
+        :return: the message itself
+        """
+        if self.__frameReferences == 0:
+            self.detach()
+        self.__references += 1
+        return self
+
+    def hold(self) -> "Message":
+        """
+        Adds a holder to this message without detaching it from the buffer it was received in. Only meant for holders
+        releasing the message before the end of the current update (e.g. batched message handlers), as the message
+        keeps its transport buffer in use until then. Holders keeping it for longer use retain().
+
+        :return: the message itself
+        """
+        self.__references += 1
+        return self
+
     def release(self):
         """
-        Release this object back into the message pool
+        Removes a holder from this message, and releases this object back into the message pool once no holders are
+        left
         :return:
         """
+        self.__references -= 1
+        if self.__references > 0:
+            return
+        if self.__references < 0:
+            logger.warning("Message released more often than it was retained, ignoring release.")
+            self.__references = 0
+            return
+
+        # Don't keep the receive buffer alive while the message sits in the pool
+        self.data = self.__buffer
+        self.dataOffset = 0
+        self.__dropReceiveBuffer()
         MESSAGE_POOL.release(self)
 
+    def shareFrame(self) -> Tuple[bytearray, int]:
+        """
+        Assembles the bytestream of this message and shares the buffer holding it, so it can be sent repeatedly (e.g.
+        by pending reliable messages) without being copied. Adds a holder to the message, which is removed by
+        releaseFrame().
+
+        While the buffer is shared, the first write to the message continues on a copy of the buffer, the shared
+        bytestream stays as it is.
+
+        :return: the buffer holding the bytestream, and the number of bytes in the bytestream
+        """
+        bytestream, amount = self.createBytestream()
+        self.__references += 1
+        self.__frameReferences += 1
+        # Writes check whether data is the message's own buffer, and call detach() if not
+        self.data = memoryview(self.__buffer)
+        return self.__buffer, amount
+
+    def releaseFrame(self, buffer: bytearray):
+        """
+        Releases a buffer returned by shareFrame()
+
+        :param buffer: the shared buffer
+        :return:
+        """
+        if buffer is self.__buffer:
+            self.__frameReferences -= 1
+            if self.__frameReferences == 0:
+                self.data = self.__buffer
+        self.release()
+
+    def detach(self):
+        """
+        Copies a received message into the message's own buffer. Received messages read directly from the buffer they
+        were received in, so a handler that keeps a message after returning, or modifies it, needs it to own its
+        payload. Does nothing if the message already owns its payload.
+
+        If the buffer is shared (see shareFrame()), the message continues on a copy of it instead.
+        """
+        if self.data is self.__buffer:
+            return
+        if self.__frameReferences > 0:
+            # The holders of the shared buffer keep it, as it is
+            usedBytes = (self.dataOffset + self.writeBit + BITS_PER_BYTE - 1) // BITS_PER_BYTE
+            buffer = bytearray(_MAX_SIZE)
+            buffer[:usedBytes] = self.__buffer[:usedBytes]
+            self.__buffer = buffer
+            self.__frameReferences = 0
+        else:
+            # Header and payload are copied as they are, so the payload stays at the same position
+            self.__buffer[:len(self.data)] = self.data
+            self.__dropReceiveBuffer()
+        self.data = self.__buffer
+
+    def fromBytestream(self, bytestream: Union[bytes, bytearray, memoryview, List[int]], amount: int = -1,
+                       owner: Optional[SlabBuffer] = None):
+        """
+        Populate this message from the given Byte stream. The payload is not copied, the message reads it directly from
+        the given bytestream, which therefore must not be modified while the message is in use.
+
+        :param bytestream: Bytes containing the data to populate the message with
+        :param amount: Amount of bytes to populate the message with
+        :param owner: Transport buffer containing the bytestream. Held by the message until it no longer reads from
+            it, so the transport only reuses the buffer afterwards.
+        :return:
+        """
+        super(Message, self).fromBytestream(bytestream, amount)
+        if owner is not None:
+            self.__receiveBuffer = owner.retain()
+
+    def __dropReceiveBuffer(self):
+        """
+        Releases the transport buffer the message was received in, if any
+        """
+        if self.__receiveBuffer is not None:
+            self.__receiveBuffer.release()
+            self.__receiveBuffer = None
+
+    def createBytestream(self):
+        """
+        Assembles the bytes representing this message within the message's own buffer. The header space is reserved
+        when the message is created, so the first call only needs to move the payload to its final position behind the
+        header, while further calls (e.g. when sending the message to multiple clients) only fill in the header. The
+        returned view is only valid until the message is released.
+
+        :return: a view of the bytes representing this message, and their number
+        """
+        if self.data is not self.__buffer and (self.__frameReferences == 0 or
+                                               (self.header, self.msgID, self.dataOffset) != self.__layout):
+            # Filling in the header of a shared buffer is fine, as every holder fills in its own header before sending
+            self.detach()
+        if (self.header, self.msgID, self.dataOffset) != self.__layout:
+            if self.hasMessageID and self.msgID < 0:
+                return super(Message, self).createBytestream()
+
+            headerBits = self.headerBits
+            msgIDBytes = encodeVarULong(self.msgID) if self.hasMessageID else b""
+            payloadStart = headerBits + len(msgIDBytes) * BITS_PER_BYTE
+
+            if self.dataOffset != payloadStart:
+                if _MAX_BIT_COUNT - payloadStart < self.writeBit:
+                    return super(Message, self).createBytestream()
+                # Moved once, reading and writing continues relative to the new offset
+                payload = readBitsInt(self.data, self.writeBit, self.dataOffset)
+                writeBitsInt(payload, self.writeBit, self.data, payloadStart)
+                self.dataOffset = payloadStart
+
+            writeBits(msgIDBytes, len(msgIDBytes) * BITS_PER_BYTE, self.data, headerBits)
+            self.__layout = (self.header, self.msgID, self.dataOffset)
+
+        self.data[0] = (self.data[0] & ~HEADER_BITMASK & 0xff) | self.header
+        if self.header >= MessageHeader.Reliable:
+            writeBitsInt(self.seqID, 2 * BITS_PER_BYTE, self.data, HEADER_BITS)
+        elif self.header == MessageHeader.Notify:
+            writeBitsInt(self.notifyBits, 5 * BITS_PER_BYTE, self.data, HEADER_BITS)
+
+        bitCount = self.dataOffset + self.writeBit
+        byteCount = (bitCount + BITS_PER_BYTE - 1) // BITS_PER_BYTE
+        if bitCount % BITS_PER_BYTE != 0:
+            # the buffer is reused, don't send what previous messages left behind the payload
+            self.data[byteCount - 1] &= (1 << (bitCount % BITS_PER_BYTE)) - 1
+        return memoryview(self.data)[:byteCount], byteCount
+
     #region tools
 
     # def appendData(self, value: bytes):
@@ -131,10 +356,8 @@ class Message(MessageBase):
         Appends the given data to the message body
         :param value: data to append
         """
-        requiredLength = ceil(float(self.writeBit) / BITS_PER_BYTE) + (len(value))
-        if len(self.data) < requiredLength:
-            self.data.extend([0] * ((requiredLength) - len(self.data)))
-        self.data = bytesToBits(value, self.data, self.writeBit)
+        self.checkBitsAvailable(len(value) * BITS_PER_BYTE)
+        writeBits(value, len(value) * BITS_PER_BYTE, self.data, self.writeBit + self.dataOffset)
         self.writeBit += len(value) * BITS_PER_BYTE
 
     def replaceBits(self, value: bytes, bitpos: int):
@@ -144,12 +367,153 @@ class Message(MessageBase):
         :param value: bytes to write to the messages payload
         :param bitpos: position to write the data to
         """
-        requiredLength = ceil(bitpos / BITS_PER_BYTE) + (len(value))
-        if len(self.data) < requiredLength:
-            self.data.extend([0] * (requiredLength - len(self.data)))
-            self.writeBit = max(self.writeBit, requiredLength)
-        self.data = bytesToBits(value, self.data, bitpos)
+        if self.data is not self.__buffer:
+            self.detach()
+        bitpos += self.dataOffset
+        if _MAX_BIT_COUNT - bitpos < len(value) * BITS_PER_BYTE:
+            raise InsufficientCapacityException()
+        writeBits(value, len(value) * BITS_PER_BYTE, self.data, bitpos)
+
+    def putScalar(self, packer: Struct, value: Union[int, float], pos: int = -1) -> int:
+        """
+        Packs the given value with the given packer into the message body. If the target position is byte aligned, the
+        value is packed directly into the payload, otherwise it falls back to the bitwise copy.
+
+        :param packer: precompiled struct used to pack the value
+        :param value: value to pack
+        :param pos: in bits: overrides the data at the given position if >= 0, otherwise the data is appended
+        :return: the number of bits written to the messages payload
+        """
+        bitCount = packer.size * BITS_PER_BYTE
+        bitpos = (self.writeBit if pos < 0 else pos) + self.dataOffset
+        if self.data is not self.__buffer:
+            self.detach()
+        if _MAX_BIT_COUNT - bitpos < bitCount:
+            raise InsufficientCapacityException()
+
+        if bitpos % BITS_PER_BYTE == 0:
+            packer.pack_into(self.data, bitpos // BITS_PER_BYTE, value)
+        else:
+            # Same as writeBits, inlined as it is called for every value. The capacity check above guarantees the
+            # covering bytes are within the buffer.
+            start = bitpos // BITS_PER_BYTE
+            end = start + packer.size + 1
+            shift = bitpos % BITS_PER_BYTE
+            mask = ((1 << bitCount) - 1) << shift
+            current = int.from_bytes(self.data[start:end], "little") & ~mask
+            bits = int.from_bytes(packer.pack(value), "little") << shift
+            self.data[start:end] = (current | bits).to_bytes(packer.size + 1, "little")
+        if pos < 0:
+            self.writeBit += bitCount
+        return bitCount
+
+    def getScalar(self, packer: Struct, pos: int = -1) -> Union[int, float]:
+        """
+        Unpacks a value with the given packer from the message body. If the read position is byte aligned, the value is
+        unpacked directly from the payload, otherwise the bits are shifted into place first.
+
+        :param packer: precompiled struct used to unpack the value
+        :param pos: in bits: optional position of the value (if negative: read next value).
+        :return: the value at this position
+        """
+        bitCount = packer.size * BITS_PER_BYTE
+        bitpos = self.computeReadPointerBits(pos)
+        self.checkReadBitsAvailable(bitpos, bitCount)
+
+        self.readBit = bitpos + bitCount
+
+        bitpos += self.dataOffset
+        if bitpos % BITS_PER_BYTE == 0:
+            return packer.unpack_from(self.data, bitpos // BITS_PER_BYTE)[0]
+
+        # Same as readBits, inlined as received payloads start halfway into a byte, which makes this the common case
+        start = bitpos // BITS_PER_BYTE
+        bits = int.from_bytes(self.data[start:start + packer.size + 1], "little") >> (bitpos % BITS_PER_BYTE)
+        return packer.unpack((bits & ((1 << bitCount) - 1)).to_bytes(packer.size, "little"))[0]
+
+    def getScalarArray(self, packer: Struct, length: int = -1, pos: int = -1) -> list:
+        """
+        Unpacks an array of values with the given packer from the message body. The whole array is read in one go,
+        either directly from the payload if it is byte aligned, or from a single shifted copy otherwise.
 
+        :param packer: precompiled struct describing a single value of the array
+        :param length: length of the array to read (defaults to < 0 = Automatic)
+        :param pos: in bits: position within the message of the array to read (defaults to < 0 = Automatic)
+        :return: the Array at the given position within the message
+        """
+        length, bits_read = self.getVarULong(pos) if length < 0 else (length, 0)
+        bitpos = self.computeReadPointerBits(pos) + bits_read
+        bitCount = length * packer.size * BITS_PER_BYTE
+        self.checkReadBitsAvailable(bitpos, bitCount)
+
+        self.readBit = bitpos + bitCount
+
+        bitpos += self.dataOffset
+        arrayFormat = "{}{}{}".format(packer.format[0], length, packer.format[1:])
+        if bitpos % BITS_PER_BYTE == 0:
+            return list(unpack_from(arrayFormat, self.data, bitpos // BITS_PER_BYTE))
+        return list(unpack(arrayFormat, readBits(self.data, bitCount, bitpos)))
+
+    def putScalarArray(self, packer: Struct, value: Sequence[Union[int, float]], includeLength: bool = True,
+                       pos: int = -1) -> int:
+        """
+        Packs an array of values with the given packer into the message body. The whole array is packed in one go.
+
+        :param packer: precompiled struct describing a single value of the array
+        :param value: values to pack
+        :param includeLength: if True, include the length of the array into the message
+        :param pos: in bits: overrides the data at the given position if >= 0, otherwise the data is appended
+        :return: the number of bits written to the messages payload
+        """
+        bitsWritten = 0
+        if includeLength:
+            bitsWritten = self.putVarULong(len(value), pos)
+
+        arrayPacker = Struct("{}{}{}".format(packer.format[0], len(value), packer.format[1:]))
+        return bitsWritten + self.putStruct(arrayPacker, value, -1 if pos < 0 else pos + bitsWritten)
+
+    def putStruct(self, packer: Struct, values: Sequence[Union[int, float]], pos: int = -1) -> int:
+        """
+        Packs several values with the given packer into the message body, as one contiguous block of bits
+
+        :param packer: precompiled struct used to pack the values
+        :param values: values to pack
+        :param pos: in bits: overrides the data at the given position if >= 0, otherwise the data is appended
+        :return: the number of bits written to the messages payload
+        """
+        bitCount = packer.size * BITS_PER_BYTE
+        bitpos = (self.writeBit if pos < 0 else pos) + self.dataOffset
+        if self.data is not self.__buffer:
+            self.detach()
+        if _MAX_BIT_COUNT - bitpos < bitCount:
+            raise InsufficientCapacityException()
+
+        if bitpos % BITS_PER_BYTE == 0:
+            packer.pack_into(self.data, bitpos // BITS_PER_BYTE, *values)
+        else:
+            writeBits(packer.pack(*values), bitCount, self.data, bitpos)
+        if pos < 0:
+            self.writeBit += bitCount
+        return bitCount
+
+    def getStruct(self, packer: Struct, pos: int = -1) -> tuple:
+        """
+        Unpacks several values with the given packer from the message body
+
+        :param packer: precompiled struct used to unpack the values
+        :param pos: in bits: optional position of the values (if negative: read next values).
+        :return: the values at this position
+        """
+        bitCount = packer.size * BITS_PER_BYTE
+        bitpos = self.computeReadPointerBits(pos)
+        self.checkReadBitsAvailable(bitpos, bitCount)
+
+        self.readBit = bitpos + bitCount
+
+        bitpos += self.dataOffset
+        if bitpos % BITS_PER_BYTE == 0:
+            return packer.unpack_from(self.data, bitpos // BITS_PER_BYTE)
+        return packer.unpack(readBits(self.data, bitCount, bitpos))
 
     #endregion
 
@@ -172,6 +536,8 @@ class Message(MessageBase):
         :param required: the number of bytes required to be available
         :raises: InsufficientCapacityException if not enough bytes are available
         """
+        if self.data is not self.__buffer:
+            self.detach()
         if self.unwrittenBits < required:
             raise InsufficientCapacityException()
 
@@ -192,7 +558,7 @@ class Message(MessageBase):
         :param expectedBits: Number of bits expected available for reading
         :raises: NotEnoughBytesError if not enough bytes are available
         """
-        if ((len(self.data)) * BITS_PER_BYTE) - readpos < expectedBits:
+        if self.writeBit - readpos < expectedBits:
             raise NotEnoughBytesError()
 
 
@@ -226,20 +592,29 @@ class Message(MessageBase):
     #region Bits
 
     def putBits(self, bits: Union[int, bytes, bytearray, List[int]], amount: int, pos: int = -1):
-        if isinstance(bits, int):
-            bits = bits.to_bytes(ceil(amount/8), self.byte_order)
+        bitpos = pos
+        if pos < 0:
+            self.checkBitsAvailable(amount)
+            bitpos = self.writeBit
+        elif self.data is not self.__buffer:
+            self.detach()
+        bitpos += self.dataOffset
+
+        if isinstance(bits, int) and self.byte_order == BYTE_ORDER_LITTLE:
+            writeBitsInt(bits, amount, self.data, bitpos)
+        else:
+            if isinstance(bits, int):
+                bits = bits.to_bytes(ceil(amount/8), self.byte_order)
+            writeBits(bits, amount, self.data, bitpos)
 
         if pos < 0:
-            self.data = setBitsFromBytes(bits, amount, self.data, self.writeBit)
             self.writeBit += amount
-        else:
-            self.data = setBitsFromBytes(bits, amount, self.data, pos)
 
     def peekBits(self, amount: int, startBit: int=-1):
         if startBit < 0:
             startBit = self.readBit
 
-        return getBitsToBytes(self.data, amount, startBit)
+        return getBitsToBytes(self.data, amount, startBit + self.dataOffset)
 
     def getBits(self, amount: int, startBit: int = -1):
         if startBit < 0:
@@ -263,7 +638,7 @@ class Message(MessageBase):
         #    else:
         #        tmp_data.append(byte_val)
         #        break
-        return self.putBytes(toVarULong(value), pos)
+        return self.putBytes(encodeVarULong(value), pos)
 
     def getVarULong(self, pos: int):
         #shift = 0
@@ -277,7 +652,7 @@ class Message(MessageBase):
         #    if byte_val & 0b1000_0000 == 1:
         #       break
         pos = self.computeReadPointerBits(pos)
-        return fromVarULong(self.data, pos)
+        return decodeVarULong(self.data, pos + self.dataOffset)
 
     #endregion
 
@@ -315,7 +690,7 @@ class Message(MessageBase):
 
         self.readBit = pos + (length * BITS_PER_BYTE)
 
-        return bytesFromBits(self.data, length * BITS_PER_BYTE, pos)#self.data[pos: pos+length]
+        return readBits(self.data, length * BITS_PER_BYTE, pos + self.dataOffset)
 
     #endregion
 
@@ -333,10 +708,10 @@ class Message(MessageBase):
             value = 0
 
         if pos < 0:
-            setBits8(0x01 if value else 0x00, 1, self.data, self.writeBit)
+            setBits8(0x01 if value else 0x00, 1, self.data, self.writeBit + self.dataOffset)
             self.writeBit += 1
         else:
-            setBits8(0x01 if value else 0x00, 1, self.data, pos)
+            setBits8(0x01 if value else 0x00, 1, self.data, pos + self.dataOffset)
         return 1
 
     def getBool(self, pos: int = -1) -> bool:
@@ -347,11 +722,11 @@ class Message(MessageBase):
         :return: the value at this position
         """
         if pos < 0:
-            val = getBits(1, self.data, self.readBit) != 0
+            val = getBits(1, self.data, self.readBit + self.dataOffset) != 0
             self.readBit += 1
             return val
         else:
-            return getBits(1, self.data, pos) != 0
+            return getBits(1, self.data, pos + self.dataOffset) != 0
 
     def putBoolArray(self, value: List[bool], includeLength:bool = True, pos: int = -1):
         """
@@ -362,23 +737,36 @@ class Message(MessageBase):
         :param pos: overrides the data at the given position if >= 0, otherwise the data is appended
         :return: the number of bytes written to the messages payload
         """
-        bitfield = bytearray(ceil(len(value) / BITS_PER_BYTE))
+        bitfield = 0
         for i in range(len(value)):
             if value[i]:
-                byte = i // BITS_PER_BYTE
-                bit = i % BITS_PER_BYTE
-                bitfield[byte] |= 1 << bit
+                bitfield |= 1 << i
+        return self.__putBoolBits(bitfield, len(value), includeLength, pos)
+
+    def __putBoolBits(self, bitfield: int, length: int, includeLength: bool, pos: int) -> int:
+        """
+        Puts a bool array packed into a bitfield (element i in bit i) into the messages payload
+
+        :param bitfield: the packed array
+        :param length: number of elements of the array
+        :param includeLength: if True, include the length of the array into the message
+        :param pos: overrides the data at the given position if >= 0, otherwise the data is appended
+        :return: the number of bits written to the messages payload
+        """
         writePos = pos
         if pos < 0:
             writePos = self.writeBit
 
         bitsWritten = 0
         if includeLength:
-            bitsWritten = self.putVarULong(len(value), writePos)
+            bitsWritten = self.putVarULong(length, writePos)
 
-        setBitsFromBytes(bitfield, len(value), self.data, writePos+bitsWritten)
+        self.checkBitsAvailable(bitsWritten + length)
+        writeBitsInt(bitfield, length, self.data, writePos + bitsWritten + self.dataOffset)
+        if pos < 0:
+            self.writeBit += bitsWritten + length
 
-        return bitsWritten + len(value)
+        return bitsWritten + length
 
     def getBoolArray(self, length:int = -1, pos:int = -1) -> List[bool]:
         """
@@ -388,18 +776,24 @@ class Message(MessageBase):
         :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
         :return: the Array at the given psoition within the message
         """
+        bitfield, length = self.__getBoolBits(length, pos)
+        return [bitfield & (1 << i) != 0 for i in range(length)]
+
+    def __getBoolBits(self, length: int, pos: int) -> Tuple[int, int]:
+        """
+        Reads a bool array packed into a bitfield (element i in bit i)
+
+        :param length: length of the array to read (defaults to < 0 = Automatic)
+        :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
+        :return: the bitfield and the number of elements of the array
+        """
         bitpos = self.computeReadPointerBits(pos)
         length, bits_read = self.getVarULong(bitpos) if length < 0 else (length, 0)
-        self.checkReadBitsAvailable(bitpos, length)
-        result = []
-        bitfield = getBitsToBytes(self.data, length, bitpos+bits_read)
-        for i in range(length):
-            byte = i // BITS_PER_BYTE
-            bit = i % BITS_PER_BYTE
-            result.append(bitfield[byte] & (1 << bit) != 0)
+        self.checkReadBitsAvailable(bitpos + bits_read, length)
+        bitfield = readBitsInt(self.data, length, bitpos + bits_read + self.dataOffset)
         if pos < 0:
             self.readBit += bits_read + length
-        return result
+        return bitfield, length
 
     #endregion
 
@@ -415,10 +809,7 @@ class Message(MessageBase):
         self.checkBitsAvailable(BITS_PER_BYTE)
         if value is None:
             value = 0
-        if pos < 0:
-            self.appendBits(value.to_bytes(length=1, byteorder=self.byte_order, signed=True))
-        else:
-            self.replaceBits(value.to_bytes(length=1, byteorder=self.byte_order, signed=True), pos)
+        self.putScalar(INT8_STRUCT[self.byte_order], value, pos)
         return 1
 
     def getInt8(self, pos: int = -1) -> int:
@@ -428,7 +819,7 @@ class Message(MessageBase):
          defaults to the next value in the message
         :return: the value at this position
         """
-        return int.from_bytes(self.getBytes(1, pos), self.byte_order, signed=True)
+        return self.getScalar(INT8_STRUCT[self.byte_order], pos)
 
     def putInt8Array(self, value: Union[bytes, bytearray, List[int]], includeLength:bool = True, pos: int = -1):
         """
@@ -439,19 +830,7 @@ class Message(MessageBase):
         :param pos: overrides the data at the given position if >= 0, otherwise the data is appended
         :return: the number of bytes written to the messages payload
         """
-        bitsWritten = 0
-        if includeLength:
-            bitsWritten = self.putVarULong(len(value), pos)
-
-        self.checkBitsAvailable(len(value)*BITS_PER_BYTE)
-        for val in value:
-            if pos < 0:
-                self.appendBits(val.to_bytes(1, self.byte_order, signed=True))
-            else:
-                self.replaceBits(val.to_bytes(1, self.byte_order, signed=True), pos + bitsWritten)
-            bitsWritten += BITS_PER_BYTE
-
-        return bitsWritten
+        return self.putScalarArray(INT8_STRUCT[self.byte_order], value, includeLength, pos)
 
     def getInt8Array(self,  length:int = -1, pos:int = -1) -> List[int]:
         """
@@ -461,16 +840,7 @@ class Message(MessageBase):
         :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
         :return: the Array at the given psoition within the message
         """
-        length, bits_read = self.getVarULong(pos) if length < 0 else (length, 0)
-
-        self.checkReadBitsAvailable(self.readBit + bits_read, length * BITS_PER_BYTE)
-
-        self.readBit = self.computeReadPointerBits(pos) + bits_read
-        result = []
-        for _ in range(length):
-            result.append(self.getInt8())
-
-        return result
+        return self.getScalarArray(INT8_STRUCT[self.byte_order], length, pos)
 
     def putUInt8(self, value: int, pos: int = -1) -> int:
         """
@@ -482,10 +852,7 @@ class Message(MessageBase):
         self.checkBitsAvailable(BITS_PER_BYTE)
         if value is None:
             value = 0
-        if pos < 0:
-            self.appendBits(value.to_bytes(length=1, byteorder=self.byte_order, signed=False))
-        else:
-            self.replaceBits(value.to_bytes(length=1, byteorder=self.byte_order, signed=False), pos)
+        self.putScalar(UINT8_STRUCT[self.byte_order], value, pos)
         return 1
 
     def getUInt8(self, pos: int = -1) -> int:
@@ -495,7 +862,7 @@ class Message(MessageBase):
          defaults to the next value in the message
         :return: the value at this position
         """
-        return int.from_bytes(self.getBytes(1, pos), self.byte_order, signed=False)
+        return self.getScalar(UINT8_STRUCT[self.byte_order], pos)
 
     def putUInt8Array(self, value: List[int], includeLength:bool = True, pos: int = -1):
         """
@@ -510,12 +877,7 @@ class Message(MessageBase):
         if includeLength:
             bytesWritten = self.putVarULong(len(value), pos)
 
-        self.checkBitsAvailable(len(value)*BITS_PER_BYTE)
-        for val in value:
-            if pos < 0:
-                self.appendBits(val.to_bytes(length=1, byteorder=self.byte_order, signed=False))
-            else:
-                self.replaceBits(val.to_bytes(length=1, byteorder=self.byte_order, signed=False), pos + bytesWritten)
+        self.putScalarArray(UINT8_STRUCT[self.byte_order], value, False, -1 if pos < 0 else pos + bytesWritten)
 
         return bytesWritten + len(value)
 
@@ -527,16 +889,7 @@ class Message(MessageBase):
         :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
         :return: the Array at the given psoition within the message
         """
-        length, bits_read = self.getVarULong(pos) if length < 0 else (length, 0)
-
-        self.checkReadBitsAvailable(self.readBit + bits_read, length * BITS_PER_BYTE)
-
-        self.readBit = self.computeReadPointerBits(pos) + bits_read
-        result = []
-        for _ in range(length):
-            result.append(self.getUInt8())
-
-        return result
+        return self.getScalarArray(UINT8_STRUCT[self.byte_order], length, pos)
 
     #endregion
 
@@ -552,11 +905,7 @@ class Message(MessageBase):
         self.checkBitsAvailable(16)
         if value is None:
             value = 0
-        if pos < 0:
-            self.appendBits(value.to_bytes(length=2, byteorder=self.byte_order, signed=True))
-        else:
-            self.replaceBits(value.to_bytes(length=2, byteorder=self.byte_order, signed=True), pos)
-        return 2 * BITS_PER_BYTE
+        return self.putScalar(INT16_STRUCT[self.byte_order], value, pos)
 
     def getInt16(self, pos: int = -1) -> int:
         """
@@ -565,7 +914,7 @@ class Message(MessageBase):
          defaults to the next value in the message
         :return: the value at this position
         """
-        return int.from_bytes(self.getBytes(2, pos), self.byte_order, signed=True)
+        return self.getScalar(INT16_STRUCT[self.byte_order], pos)
 
     def putInt16Array(self, value: List[int], includeLength:bool = True, pos: int = -1):
         """
@@ -576,16 +925,7 @@ class Message(MessageBase):
         :param pos: overrides the data at the given position if >= 0, otherwise the data is appended
         :return: the number of bytes written to the messages payload
         """
-        bitsWritten = 0
-        if includeLength:
-            bitsWritten = self.putVarULong(len(value), pos)
-
-        self.checkBitsAvailable(len(value) * 16)
-
-        for val in value:
-            bitsWritten += self.putInt16(val, -1 if pos < 0 else pos+bitsWritten)
-
-        return bitsWritten
+        return self.putScalarArray(INT16_STRUCT[self.byte_order], value, includeLength, pos)
 
     def getInt16Array(self, length: int = -1, pos: int = -1) -> List[int]:
         """
@@ -595,16 +935,7 @@ class Message(MessageBase):
         :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
         :return: the Array at the given psoition within the message
         """
-        length, bits_read = self.getVarULong(pos) if length < 0 else (length, 0)
-
-        self.checkReadBitsAvailable(self.readBit + bits_read, length * BITS_PER_BYTE * 2)
-
-        self.readBit = self.computeReadPointerBits(pos) + bits_read
-        result = []
-        for _ in range(length):
-            result.append(self.getInt16())
-
-        return result
+        return self.getScalarArray(INT16_STRUCT[self.byte_order], length, pos)
 
     def putUInt16(self, value: int, pos: int = -1) -> int:
         """
@@ -616,11 +947,7 @@ class Message(MessageBase):
         self.checkBitsAvailable(16)
         if value is None:
             value = 0
-        if pos < 0:
-            self.appendBits(value.to_bytes(length=2, byteorder=self.byte_order, signed=False))
-        else:
-            self.replaceBits(value.to_bytes(length=2, byteorder=self.byte_order, signed=False), pos)
-        return 2 * BITS_PER_BYTE
+        return self.putScalar(UINT16_STRUCT[self.byte_order], value, pos)
 
     def getUInt16(self, pos: int = -1) -> int:
         """
@@ -629,8 +956,7 @@ class Message(MessageBase):
          defaults to the next value in the message
         :return: the value at this position
         """
-
-        return int.from_bytes(self.getBytes(2, pos), self.byte_order, signed=False)
+        return self.getScalar(UINT16_STRUCT[self.byte_order], pos)
 
     def putUInt16Array(self, value: List[int], includeLength:bool = True, pos: int = -1):
         """
@@ -641,16 +967,7 @@ class Message(MessageBase):
         :param pos: overrides the data at the given position if >= 0, otherwise the data is appended
         :return: the number of bytes written to the messages payload
         """
-        bitsWritten = 0
-        if includeLength:
-            bitsWritten = self.putVarULong(len(value), pos)
-
-        self.checkBitsAvailable(len(value) * 16)
-
-        for val in value:
-            bitsWritten += self.putUInt16(val, -1 if pos < 0 else pos+bitsWritten)
-
-        return bitsWritten
+        return self.putScalarArray(UINT16_STRUCT[self.byte_order], value, includeLength, pos)
 
     def getUInt16Array(self, length: int = -1, pos: int = -1) -> List[int]:
         """
@@ -660,16 +977,7 @@ class Message(MessageBase):
         :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
         :return: the Array at the given psoition within the message
         """
-        length, bits_read = self.getVarULong(pos) if length < 0 else (length, 0)
-
-        self.checkReadBitsAvailable(self.readBit + bits_read, length * BITS_PER_BYTE * 2)
-
-        self.readBit = self.computeReadPointerBits(pos) + bits_read
-        result = []
-        for _ in range(length):
-            result.append(self.getUInt16())
-
-        return result
+        return self.getScalarArray(UINT16_STRUCT[self.byte_order], length, pos)
 
     #endregion
 
@@ -685,11 +993,7 @@ class Message(MessageBase):
         self.checkBitsAvailable(32)
         if value is None:
             value = 0
-        if pos < 0:
-            self.appendBits(value.to_bytes(length=4, byteorder=self.byte_order, signed=True))
-        else:
-            self.replaceBits(value.to_bytes(length=4, byteorder=self.byte_order, signed=True), pos)
-        return 4 * BITS_PER_BYTE
+        return self.putScalar(INT32_STRUCT[self.byte_order], value, pos)
 
     def getInt32(self, pos: int = -1) -> int:
         """
@@ -698,7 +1002,7 @@ class Message(MessageBase):
          defaults to the next value in the message
         :return: the value at this position
         """
-        return int.from_bytes(self.getBytes(4, pos), self.byte_order, signed=True)
+        return self.getScalar(INT32_STRUCT[self.byte_order], pos)
 
     def getInt32Array(self, length: int = -1, pos: int = -1) -> List[int]:
         """
@@ -708,16 +1012,7 @@ class Message(MessageBase):
         :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
         :return: the Array at the given psoition within the message
         """
-        length, bits_read = self.getVarULong(pos) if length < 0 else (length, 0)
-
-        self.checkReadBitsAvailable(self.readBit + bits_read, length * BITS_PER_BYTE * 4)
-
-        self.readBit = self.computeReadPointerBits(pos) + bits_read
-        result = []
-        for _ in range(length):
-            result.append(self.getInt32())
-
-        return result
+        return self.getScalarArray(INT32_STRUCT[self.byte_order], length, pos)
 
     def putInt32Array(self, value: List[int], includeLength:bool = True, pos: int = -1):
         """
@@ -728,16 +1023,7 @@ class Message(MessageBase):
         :param pos: overrides the data at the given position if >= 0, otherwise the data is appended
         :return: the number of bytes written to the messages payload
         """
-        bitsWritten = 0
-        if includeLength:
-            bitsWritten = self.putVarULong(len(value), pos)
-
-        self.checkBitsAvailable(len(value) * 16)
-
-        for val in value:
-            bitsWritten += self.putInt32(val, -1 if pos < 0 else pos + bitsWritten)
-
-        return bitsWritten
+        return self.putScalarArray(INT32_STRUCT[self.byte_order], value, includeLength, pos)
 
     def putUInt32(self, value: int, pos: int = -1) -> int:
         """
@@ -749,11 +1035,7 @@ class Message(MessageBase):
         self.checkBitsAvailable(32)
         if value is None:
             value = 0
-        if pos < 0:
-            self.appendBits(value.to_bytes(length=4, byteorder=self.byte_order, signed=False))
-        else:
-            self.replaceBits(value.to_bytes(length=4, byteorder=self.byte_order, signed=False), pos)
-        return 4 * BITS_PER_BYTE
+        return self.putScalar(UINT32_STRUCT[self.byte_order], value, pos)
 
     def getUInt32(self, pos: int = -1) -> int:
         """
@@ -762,7 +1044,7 @@ class Message(MessageBase):
          defaults to the next value in the message
         :return: the value at this position
         """
-        return int.from_bytes(self.getBytes(4, pos), self.byte_order, signed=False)
+        return self.getScalar(UINT32_STRUCT[self.byte_order], pos)
 
     def putUInt32Array(self, value: List[int], includeLength:bool = True, pos: int = -1):
         """
@@ -773,16 +1055,7 @@ class Message(MessageBase):
         :param pos: overrides the data at the given position if >= 0, otherwise the data is appended
         :return: the number of bytes written to the messages payload
         """
-        bitsWritten = 0
-        if includeLength:
-            bitsWritten = self.putVarULong(len(value), pos)
-
-        self.checkBitsAvailable(len(value) * 32)
-
-        for val in value:
-            bitsWritten += self.putUInt32(val, -1 if pos < 0 else pos + bitsWritten)
-
-        return bitsWritten
+        return self.putScalarArray(UINT32_STRUCT[self.byte_order], value, includeLength, pos)
 
     def getUInt32Array(self, length: int = -1, pos: int = -1) -> List[int]:
         """
@@ -792,17 +1065,7 @@ class Message(MessageBase):
         :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
         :return: the Array at the given psoition within the message
         """
-        length, bits_read = self.getVarULong(pos) if length < 0 else (length, 0)
-
-        self.checkReadBitsAvailable(self.readBit + bits_read, length * BITS_PER_BYTE * 4)
-
-        self.readBit = self.computeReadPointerBits(pos) + bits_read
-        result = []
-        for _ in range(length):
-            result.append(self.getUInt32())
-
-        return result
-
+        return self.getScalarArray(UINT32_STRUCT[self.byte_order], length, pos)
 
     #endregion
 
@@ -818,11 +1081,7 @@ class Message(MessageBase):
         self.checkBitsAvailable(64)
         if value is None:
             value = 0
-        if pos < 0:
-            self.appendBits(value.to_bytes(length=8, byteorder=self.byte_order, signed=True))
-        else:
-            self.replaceBits(value.to_bytes(length=8, byteorder=self.byte_order, signed=True), pos)
-        return 8 * BITS_PER_BYTE
+        return self.putScalar(INT64_STRUCT[self.byte_order], value, pos)
 
     def getInt64(self, pos: int = -1) -> int:
         """
@@ -831,7 +1090,7 @@ class Message(MessageBase):
          defaults to the next value in the message
         :return: the value at this position
         """
-        return int.from_bytes(self.getBytes(8, pos), self.byte_order, signed=True)
+        return self.getScalar(INT64_STRUCT[self.byte_order], pos)
 
     def putInt64Array(self, value: List[int], includeLength:bool = True, pos: int = -1):
         """
@@ -842,16 +1101,7 @@ class Message(MessageBase):
         :param pos: overrides the data at the given position if >= 0, otherwise the data is appended
         :return: the number of bytes written to the messages payload
         """
-        bitsWritten = 0
-        if includeLength:
-            bitsWritten = self.putVarULong(len(value), pos)
-
-        self.checkBitsAvailable(len(value) * 64)
-
-        for val in value:
-            bitsWritten += self.putInt64(val, -1 if pos < 0 else pos + bitsWritten)
-
-        return bitsWritten
+        return self.putScalarArray(INT64_STRUCT[self.byte_order], value, includeLength, pos)
 
     def getInt64Array(self, length: int = -1, pos: int = -1) -> List[int]:
         """
@@ -861,16 +1111,7 @@ class Message(MessageBase):
         :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
         :return: the Array at the given psoition within the message
         """
-        length, bits_read = self.getVarULong(pos) if length < 0 else (length, 0)
-
-        self.checkReadBitsAvailable(self.readBit + bits_read, length * BITS_PER_BYTE * 8)
-
-        self.readBit = self.computeReadPointerBits(pos) + bits_read
-        result = []
-        for _ in range(length):
-            result.append(self.getInt64())
-
-        return result
+        return self.getScalarArray(INT64_STRUCT[self.byte_order], length, pos)
 
     def putUInt64(self, value: int, pos: int = -1) -> int:
         """
@@ -882,11 +1123,7 @@ class Message(MessageBase):
         self.checkBitsAvailable(64)
         if value is None:
             value = 0
-        if pos < 0:
-            self.appendBits(value.to_bytes(length=8, byteorder=self.byte_order, signed=False))
-        else:
-            self.replaceBits(value.to_bytes(length=8, byteorder=self.byte_order, signed=False), pos)
-        return 8 * BITS_PER_BYTE
+        return self.putScalar(UINT64_STRUCT[self.byte_order], value, pos)
 
     def getUInt64(self, pos: int = -1) -> int:
         """
@@ -895,7 +1132,7 @@ class Message(MessageBase):
          defaults to the next value in the message
         :return: the value at this position
         """
-        return int.from_bytes(self.getBytes(8, pos), self.byte_order, signed=False)
+        return self.getScalar(UINT64_STRUCT[self.byte_order], pos)
 
     def putUInt64Array(self, value: List[int], includeLength:bool = True, pos: int = -1):
         """
@@ -906,16 +1143,7 @@ class Message(MessageBase):
         :param pos: overrides the data at the given position if >= 0, otherwise the data is appended
         :return: the number of bytes written to the messages payload
         """
-        bitsWritten = 0
-        if includeLength:
-            bitsWritten = self.putVarULong(len(value), pos)
-
-        self.checkBitsAvailable(len(value) * 64)
-
-        for val in value:
-            bitsWritten += self.putUInt64(val, -1 if pos < 0 else pos+bitsWritten)
-
-        return bitsWritten
+        return self.putScalarArray(UINT64_STRUCT[self.byte_order], value, includeLength, pos)
 
     def getUInt64Array(self, length: int = -1, pos: int = -1) -> List[int]:
         """
@@ -925,16 +1153,7 @@ class Message(MessageBase):
         :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
         :return: the Array at the given psoition within the message
         """
-        length, bits_read = self.getVarULong(pos) if length < 0 else (length, 0)
-
-        self.checkReadBitsAvailable(self.readBit + bits_read, length * BITS_PER_BYTE * 8)
-
-        self.readBit = self.computeReadPointerBits(pos) + bits_read
-        result = []
-        for _ in range(length):
-            result.append(self.getUInt64())
-
-        return result
+        return self.getScalarArray(UINT64_STRUCT[self.byte_order], length, pos)
 
     #endregion
 
@@ -950,11 +1169,7 @@ class Message(MessageBase):
         self.checkBitsAvailable(32)
         if value is None:
             value = float("nan")
-        if pos < 0:
-            self.appendBits(fp32_to_bytes(value))
-        else:
-            self.replaceBits(fp32_to_bytes(value), pos)
-        return 4 * BITS_PER_BYTE
+        return self.putScalar(FLOAT_STRUCT, value, pos)
 
     def getFloat(self, pos: int = -1) -> float:
         """
@@ -963,7 +1178,7 @@ class Message(MessageBase):
          defaults to the next value in the message
         :return: the value at this position
         """
-        return bytes_to_fp32(self.getBytes(4, pos))
+        return self.getScalar(FLOAT_STRUCT, pos)
 
     def putFloatArray(self, value: List[float], includeLength:bool = True, pos: int = -1):
         """
@@ -974,16 +1189,7 @@ class Message(MessageBase):
         :param pos: overrides the data at the given position if >= 0, otherwise the data is appended
         :return: the number of bytes written to the messages payload
         """
-        bitsWritten = 0
-        if includeLength:
-            bitsWritten = self.putVarULong(len(value), pos)
-
-        self.checkBitsAvailable(len(value) * 32)
-
-        for val in value:
-            bitsWritten += self.putFloat(val, -1 if pos < 0 else pos + bitsWritten)
-
-        return bitsWritten
+        return self.putScalarArray(FLOAT_STRUCT, value, includeLength, pos)
 
     def getFloatArray(self, length: int = -1, pos: int = -1) -> List[float]:
         """
@@ -993,16 +1199,7 @@ class Message(MessageBase):
         :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
         :return: the Array at the given psoition within the message
         """
-        length, bits_read = self.getVarULong(pos) if length < 0 else (length, 0)
-
-        self.checkReadBitsAvailable(self.readBit + bits_read, length * BITS_PER_BYTE * 4)
-
-        self.readBit = self.computeReadPointerBits(pos) + bits_read
-        result = []
-        for _ in range(length):
-            result.append(self.getFloat())
-
-        return result
+        return self.getScalarArray(FLOAT_STRUCT, length, pos)
 
     #endregion
 
@@ -1018,11 +1215,7 @@ class Message(MessageBase):
         self.checkBitsAvailable(64)
         if value is None:
             value = float("nan")
-        if pos < 0:
-            self.appendBits(fp64_to_bytes(value))
-        else:
-            self.replaceBits(fp64_to_bytes(value), pos)
-        return 8*BITS_PER_BYTE
+        return self.putScalar(DOUBLE_STRUCT, value, pos)
 
     def getDouble(self, pos: int = -1) -> float:
         """
@@ -1031,7 +1224,7 @@ class Message(MessageBase):
          defaults to the next value in the message
         :return: the value at this position
         """
-        return bytes_to_fp64(self.getBytes(8, pos))
+        return self.getScalar(DOUBLE_STRUCT, pos)
 
     def putDoubleArray(self, value: List[float], includeLength:bool = True, pos: int = -1):
         """
@@ -1042,35 +1235,120 @@ class Message(MessageBase):
         :param pos: overrides the data at the given position if >= 0, otherwise the data is appended
         :return: the number of bytes written to the messages payload
         """
+        return self.putScalarArray(DOUBLE_STRUCT, value, includeLength, pos)
+
+    def getDoubleArray(self, length: int = -1, pos: int = -1) -> List[float]:
+        """
+        Reads the array of the given length from the given position
+
+        :param length: length of the array to read (defaults to < 0 = Automatic)
+        :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
+        :return: the Array at the given psoition within the message
+        """
+        return self.getScalarArray(DOUBLE_STRUCT, length, pos)
+
+    #endregion
+
+    #region NDArray
+
+    def __wireDtype(self, dtype) -> "np.dtype":
+        """
+        :param dtype: numpy dtype of the array elements
+        :return: the dtype with the byte order the elements are written with, matching the put*Array methods (integers
+            use the byte order of the message, floating point values are always little endian)
+        :raises: ValueError if the elements are neither bools, integers nor floating point values
+        """
+        if np is None:
+            raise ImportError("numpy is required to put or get NDArrays")
+        dtype = np.dtype(dtype)
+        if dtype.kind not in "biuf":
+            raise ValueError("NDArrays of dtype {} are not supported".format(dtype))
+        if dtype.kind in "iu" and self.byte_order == BYTE_ORDER_BIG:
+            return dtype.newbyteorder(">")
+        return dtype.newbyteorder("<")
+
+    def putNDArray(self, value: "np.ndarray", dtype=None, includeLength: bool = True, pos: int = -1) -> int:
+        """
+        Puts the given numpy array into the messages payload. The array is flattened and written with the same layout
+        as the put*Array method of the same element type, so it can be read by either. Bools are bit packed, as by
+        putBoolArray.
+
+        :param value: array to add to the messages payload
+        :param dtype: numpy dtype of the elements to write, defaults to the dtype of the given array
+        :param includeLength: if True, include the length of the array into the message
+        :param pos: in bits: overrides the data at the given position if >= 0, otherwise the data is appended
+        :return: the number of bits written to the messages payload
+        """
+        wireDtype = self.__wireDtype(value.dtype if dtype is None else dtype)
+        value = np.ascontiguousarray(value, dtype=wireDtype).reshape(-1)
+        if wireDtype.kind == "b":
+            bitfield = int.from_bytes(np.packbits(value, bitorder="little").tobytes(), "little")
+            return self.__putBoolBits(bitfield, value.size, includeLength, pos)
+
         bitsWritten = 0
         if includeLength:
-            bitsWritten = self.putVarULong(len(value), pos)
+            bitsWritten = self.putVarULong(value.size, pos)
 
-        self.checkBitsAvailable(len(value) * 64)
+        bitCount = value.nbytes * BITS_PER_BYTE
+        bitpos = (self.writeBit if pos < 0 else pos + bitsWritten) + self.dataOffset
+        if self.data is not self.__buffer:
+            self.detach()
+        if _MAX_BIT_COUNT - bitpos < bitCount:
+            raise InsufficientCapacityException()
 
-        for val in value:
-            bitsWritten += self.putDouble(val, -1 if pos < 0 else pos + bitsWritten)
+        start = bitpos // BITS_PER_BYTE
+        shift = bitpos % BITS_PER_BYTE
+        if shift == 0:
+            self.data[start:start + value.nbytes] = value.data.cast("B")
+        else:
+            # Shift the whole array at once: every byte is split across two bytes of the payload. The capacity check
+            # above guarantees the additional byte is within the buffer.
+            source = value.view(np.uint8)
+            shifted = np.zeros(value.nbytes + 1, dtype=np.uint8)
+            shifted[:-1] = source << shift
+            shifted[1:] |= source >> (BITS_PER_BYTE - shift)
+            keepMask = (1 << shift) - 1
+            shifted[0] |= self.data[start] & keepMask
+            shifted[-1] |= self.data[start + value.nbytes] & ~keepMask & 0xff
+            self.data[start:start + value.nbytes + 1] = shifted.data
 
-        return bitsWritten
+        if pos < 0:
+            self.writeBit += bitCount
+        return bitsWritten + bitCount
 
-    def getDoubleArray(self, length: int = -1, pos: int = -1) -> List[float]:
+    def getNDArray(self, dtype, length: int = -1, pos: int = -1) -> "np.ndarray":
         """
-        Reads the array of the given length from the given position
+        Reads the array of the given length from the given position into a numpy array. Reads arrays written by putNDArray
+        as well as by the put*Array method of the same element type.
 
+        :param dtype: numpy dtype of the elements to read
         :param length: length of the array to read (defaults to < 0 = Automatic)
-        :param pos: position within the message of the array to read (defaults to < 0 = Automatic)
-        :return: the Array at the given psoition within the message
+        :param pos: in bits: position within the message of the array to read (defaults to < 0 = Automatic)
+        :return: a new one dimensional array in native byte order holding the read elements
         """
-        length, bits_read = self.getVarULong(pos) if length < 0 else (length, 0)
+        wireDtype = self.__wireDtype(dtype)
+        if wireDtype.kind == "b":
+            bitfield, length = self.__getBoolBits(length, pos)
+            packed = np.frombuffer(bitfield.to_bytes((length + 7) // BITS_PER_BYTE, "little"), dtype=np.uint8)
+            return np.unpackbits(packed, count=length, bitorder="little").astype(np.bool_)
 
-        self.checkReadBitsAvailable(self.readBit + bits_read, length * BITS_PER_BYTE * 8)
+        length, bits_read = self.getVarULong(pos) if length < 0 else (length, 0)
+        bitpos = self.computeReadPointerBits(pos) + bits_read
+        byteCount = length * wireDtype.itemsize
+        self.checkReadBitsAvailable(bitpos, byteCount * BITS_PER_BYTE)
 
-        self.readBit = self.computeReadPointerBits(pos) + bits_read
-        result = []
-        for _ in range(length):
-            result.append(self.getDouble())
+        self.readBit = bitpos + byteCount * BITS_PER_BYTE
 
-        return result
+        bitpos += self.dataOffset
+        start = bitpos // BITS_PER_BYTE
+        shift = bitpos % BITS_PER_BYTE
+        if shift == 0:
+            result = np.frombuffer(self.data, dtype=wireDtype, count=length, offset=start)
+        else:
+            # The byte following the array is always present, as the array does not end on a byte boundary
+            source = np.frombuffer(self.data, dtype=np.uint8, count=byteCount + 1, offset=start)
+            result = ((source[:-1] >> shift) | (source[1:] << (BITS_PER_BYTE - shift))).view(wireDtype)
+        return result.astype(wireDtype.newbyteorder("="))
 
     #endregion
 
@@ -1085,7 +1363,8 @@ class Message(MessageBase):
         """
         encoded = value.encode("utf-8")
 
-        return self.putInt8Array(encoded, includeLength=True, pos=pos)
+        bitsWritten = self.putVarULong(len(encoded), pos)
+        return bitsWritten + self.putBytes(encoded, -1 if pos < 0 else pos + bitsWritten)
 
     def getString(self, pos: int = -1) -> str:
         """
@@ -1218,8 +1497,8 @@ def create(sendMode: Union[MessageSendMode, int], id: int):
     :return: the prepared message
     """
     msg = MESSAGE_POOL.acquire()
-    msg.init(sendMode)
     msg.msgID = id
+    msg.init(sendMode)
     return msg
 
 
@@ -1235,16 +1514,18 @@ def createInternal(header: Union[MessageHeader, int] = None):
     return msg
 
 
-def createFromBytes(data: Union[bytes, bytearray, List[int]], amount: int = -1):
+def createFromBytes(data: Union[bytes, bytearray, memoryview, List[int]], amount: int = -1,
+                    owner: Optional[SlabBuffer] = None):
     """
     Creates a new message from raw bytes
     :param data: raw bytes to interpret as message
     :param amount: Number of bytes to interpret as message
+    :param owner: Transport buffer containing data, held until the message no longer reads from it
     :return: the message created from the given bytes
     """
     message = MESSAGE_POOL.acquire()
     message.init()
-    message.fromBytestream(data, amount=amount)
+    message.fromBytestream(data, amount=amount, owner=owner)
 
     return message
 #endregion
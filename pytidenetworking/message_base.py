@@ -3,8 +3,9 @@
 from enum import IntEnum
 from math import ceil
 from typing import Union, List, Tuple
-from .utils.converter import BITS_PER_BYTE, BITS_PER_SEGMENT, ushortToBits, setBits64, toVarULong, ensureSpaceAvailable, \
-    setBitsFromBytes, ushortFromBits, getBits, fromVarULong, bytesFromBits
+from .utils.converter import BITS_PER_BYTE, BITS_PER_SEGMENT, writeBits, writeBitsInt, ushortFromBits, \
+    readBits
+from .utils.varint import encodeVarULong, decodeVarULong
 
 try:
     from typing import Literal
@@ -56,6 +57,10 @@ class MessageHeader(IntEnum):
     ClientDisconnected: int = 10
     """An internal reliable client disconnected message"""
 
+    Coalesced: int = 15
+    """Several messages packed into one datagram. Pytide extension, only sent to peers which negotiated it (see
+    coalescing.py)"""
+
 class MessageSendMode(IntEnum):
     Unreliable = MessageHeader.Unreliable
     """Unreliable send mode"""
@@ -97,10 +102,15 @@ class MessageBase:
         Bit sequence of the notify bits
         """
 
-        self.data: bytearray = bytearray()
+        self.data: Union[bytearray, memoryview] = bytearray()
         """
         Payload of the message
         """
+        self.dataOffset: int = 0
+        """
+        Bit position of the first payload bit within data. Only non-zero while a received message reads directly from
+        the buffer it was received in.
+        """
 
         self.readBit = 0
         self.writeBit = 0
@@ -110,7 +120,7 @@ class MessageBase:
         """
         :return: the number of bytes still available within the message
         """
-        return _MAX_SIZE - len(self.data)
+        return self.unwrittenBits // BITS_PER_BYTE
 
     @property
     def readBits(self):
@@ -126,7 +136,7 @@ class MessageBase:
 
     @property
     def unwrittenBits(self):
-        return _MAX_BIT_COUNT - self.writeBit
+        return _MAX_BIT_COUNT - self.dataOffset - self.writeBit
 
     @property
     def bytesInUse(self):
@@ -140,82 +150,58 @@ class MessageBase:
         Assembles the bytes representing this message
         :return: the bytes representing this message
         """
-        bytestream: bytearray = bytearray()
+        headerBits = self.headerBits
+        msgIDBytes = encodeVarULong(self.msgID) if self.hasMessageID else b""
+        bitpos = headerBits + len(msgIDBytes) * BITS_PER_BYTE
+        bytestream: bytearray = bytearray(ceil((bitpos + self.writeBit) / BITS_PER_BYTE))
 
         if self.header < MessageHeader.Notify:
-            # Unreliable
-            bytestream, bitpos = self.__makeHeaderUnreliable(bytestream)
+            self.__makeHeaderUnreliable(bytestream)
         elif self.header < MessageHeader.Reliable:
-            # Notify
-            bytestream, bitpos = self.__makeHeaderNotify(bytestream)
+            self.__makeHeaderNotify(bytestream)
         else:
-            #Reliable
-            bytestream, bitpos = self.__makeHeaderReliable(bytestream)
+            self.__makeHeaderReliable(bytestream)
 
-        if self.hasMessageID:
-            msgIDBytes = toVarULong(self.msgID)
-            bytestream = ensureSpaceAvailable(bytestream, bitpos, len(msgIDBytes) * BITS_PER_BYTE)
-            bytestream = setBitsFromBytes(msgIDBytes, len(msgIDBytes) * BITS_PER_BYTE, bytestream, bitpos)
-            bitpos += len(msgIDBytes) * BITS_PER_BYTE
-
-        bytestream = setBitsFromBytes(self.data, self.writeBit, bytestream, bitpos)
+        writeBits(msgIDBytes, len(msgIDBytes) * BITS_PER_BYTE, bytestream, headerBits)
+        writeBits(self.payload, self.writeBit, bytestream, bitpos)
         return bytestream, len(bytestream)
 
-    def __makeHeaderUnreliable(self, bytestream: Union[bytearray, List[int]]) -> Tuple[Union[bytearray, List[int]], int]:
-        bytes_missing = 1 - len(bytestream)
-        if bytes_missing > 0:
-            bytestream.extend([0] * bytes_missing)
+    def __makeHeaderUnreliable(self, bytestream: bytearray):
         bytestream[0] = self.header
 
-        return bytestream, 4
-
-    def __makeHeaderReliable(self, bytestream: Union[bytearray, List[int]]) -> Tuple[Union[bytearray, List[int]], int]:
-        bytes_missing = 3 - len(bytestream)
-        if bytes_missing > 0:
-            bytestream.extend([0] * bytes_missing)
-
+    def __makeHeaderReliable(self, bytestream: bytearray):
         bytestream[0] = self.header
-        bytestream = ushortToBits(self.seqID, bytestream, 4)
-
-        return bytestream, 20
-
-    def __makeHeaderNotify(self, bytestream: Union[bytearray, List[int]]) -> Tuple[Union[bytearray, List[int]], int]:
-        bytes_missing = 6 - len(bytestream)
-        if bytes_missing > 0:
-            bytestream.extend([0] * bytes_missing)
+        writeBitsInt(self.seqID, 2 * BITS_PER_BYTE, bytestream, HEADER_BITS)
 
+    def __makeHeaderNotify(self, bytestream: bytearray):
         bytestream[0] = self.header
-        bytestream = setBits64(self.notifyBits, 40, bytestream, 4)
+        writeBitsInt(self.notifyBits, 5 * BITS_PER_BYTE, bytestream, HEADER_BITS)
 
-        return bytestream, 44
     def createConnectBytes(self):
         """
         Assemble the bytes representing this message sans Header
         :return: the bytes representing this message sans header
         """
-        bytestream: bytearray = bytearray()
-
-        bitpos = 0
-        if self.hasMessageID:
-            msgIDBytes = toVarULong(self.msgID)
-            bytestream = ensureSpaceAvailable(bytestream, 0, len(msgIDBytes) * BITS_PER_BYTE)
-            bytestream = setBitsFromBytes(msgIDBytes, len(msgIDBytes) * BITS_PER_BYTE, bytestream, 0)
-            bitpos = len(msgIDBytes) * BITS_PER_BYTE
+        msgIDBytes = encodeVarULong(self.msgID) if self.hasMessageID else b""
+        bitpos = len(msgIDBytes) * BITS_PER_BYTE
+        bytestream: bytearray = bytearray(ceil((bitpos + self.writeBit) / BITS_PER_BYTE))
 
-        bytestream = setBitsFromBytes(self.data, self.writeBit, bytestream, bitpos)
+        writeBits(msgIDBytes, bitpos, bytestream, 0)
+        writeBits(self.payload, self.writeBit, bytestream, bitpos)
 
         return bytestream, len(bytestream)
 
     def fromBytestream(self, bytestream: Union[bytes, bytearray, List[int]], amount: int = -1):
         """
-        Populate this message from the given Byte stream
+        Populate this message from the given Byte stream. The payload is not copied, the message reads it directly from
+        the given bytestream, which therefore must not be modified while the message is in use.
 
         :param bytestream: Bytes containing the data to populate the message with
         :param amount: Amount of bytes to populate the message with
         :return:
         """
-        #if amount > 0:
-            #bytestream = bytestream[: amount]
+        if isinstance(bytestream, list):
+            bytestream = bytes(bytestream)
 
         self.header = bytestream[0] & HEADER_BITMASK
         if self.header < MessageHeader.Notify:
@@ -229,20 +215,23 @@ class MessageBase:
             bitpos = self.__readHeaderReliable(bytestream)
 
         if self.hasMessageID: # only user generated messages
-            self.msgID, readbits = fromVarULong(bytestream, bitpos)
+            self.msgID, readbits = decodeVarULong(bytestream, bitpos)
             bitpos += readbits
 
-        self.data = bytesFromBits(bytestream, (len(bytestream) * BITS_PER_BYTE) - bitpos, bitpos)
+        if amount < 0:
+            amount = len(bytestream)
 
+        self.data = memoryview(bytestream)[:amount]
+        self.dataOffset = bitpos
         self.readBit = 0
-        self.writeBit = 0
+        self.writeBit = (amount * BITS_PER_BYTE) - bitpos
 
     def __str__(self):
         return '\n'.join([
             "Header: {}".format(self.header),
             "ReadPos: {}".format(self.readBit),
             "WritePos: {}".format(self.writeBit),
-            "Payload: {}".format(self.data)
+            "Payload: {}".format(bytes(self.payload[:self.bytesInUse]))
         ])
 
     def __readHeaderUnreliable(self, bytestream: Union[bytearray, List[int]]) -> int:
@@ -254,8 +243,29 @@ class MessageBase:
         return 20
 
     def __readHeaderNotify(self, bytestream: Union[bytearray, List[int]]) -> int:
-        self.notifyBits = getBits(40, bytestream, 4)
-        return 44
+        # Read from the header bytes only, the frame may end right after them
+        self.notifyBits = (int.from_bytes(bytestream[:MIN_NOTIFY_BYTES], "little") >> HEADER_BITS) & 0xff_ffff_ffff
+        return NOTIFY_HEADER_BITS
+
+    @property
+    def payload(self) -> Union[bytes, bytearray, memoryview]:
+        """
+        :return: the payload of this message, starting at bit 0. Only the first bytesInUse bytes are valid.
+        """
+        if self.dataOffset == 0:
+            return self.data
+        return readBits(self.data, self.writeBit, self.dataOffset)
+
+    @property
+    def headerBits(self) -> int:
+        """
+        :return: the number of bits taken up by the header of this message type, excluding the message ID
+        """
+        if self.header < MessageHeader.Notify:
+            return UNRELIABLE_HEADER_BITS
+        elif self.header < MessageHeader.Reliable:
+            return NOTIFY_HEADER_BITS
+        return RELIABLE_HEADER_BITS
 
     @property
     def hasSequenceID(self):
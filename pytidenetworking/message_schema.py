@@ -0,0 +1,288 @@
+from struct import Struct
+from typing import Dict, Tuple, Callable, Optional, Union, Any
+
+from .message import Message, create as createMessage
+from .message_base import MessageSendMode, BYTE_ORDER_LITTLE, BYTE_ORDER_BIG
+
+#region Field Types
+
+FIELD_SCALAR = 0
+FIELD_BOOL = 1
+FIELD_VARULONG = 2
+FIELD_STRING = 3
+FIELD_SCALAR_ARRAY = 4
+FIELD_BOOL_ARRAY = 5
+FIELD_STRING_ARRAY = 6
+
+
+class SchemaField:
+    """
+    Type of a field within a MessageSchema
+    """
+    def __init__(self, name: str, kind: int, structFormat: str = "", byteOrdered: bool = True):
+        """
+        Constructor
+
+        :param name: Name of the field type
+        :param kind: How the field is written to a message (one of the FIELD_* constants)
+        :param structFormat: struct format character of a single value, if the field is (an array of) fixed size values
+        :param byteOrdered: if False, the value is always written little endian, regardless of the message's byte order
+        """
+        self.name: str = name
+        self.kind: int = kind
+        self.structFormat: str = structFormat
+        self.byteOrdered: bool = byteOrdered
+
+    def structPrefix(self, byteOrder: str) -> str:
+        """
+        :param byteOrder: byte order of the message the field is written to
+        :return: the struct byte order prefix used to write this field
+        """
+        if self.byteOrdered and byteOrder == BYTE_ORDER_BIG:
+            return ">"
+        return "<"
+
+    def __repr__(self):
+        return self.name
+
+
+Int8 = SchemaField("Int8", FIELD_SCALAR, "b")
+UInt8 = SchemaField("UInt8", FIELD_SCALAR, "B")
+Int16 = SchemaField("Int16", FIELD_SCALAR, "h")
+UInt16 = SchemaField("UInt16", FIELD_SCALAR, "H")
+Int32 = SchemaField("Int32", FIELD_SCALAR, "i")
+UInt32 = SchemaField("UInt32", FIELD_SCALAR, "I")
+Int64 = SchemaField("Int64", FIELD_SCALAR, "q")
+UInt64 = SchemaField("UInt64", FIELD_SCALAR, "Q")
+Float = SchemaField("Float", FIELD_SCALAR, "f", byteOrdered=False)
+Double = SchemaField("Double", FIELD_SCALAR, "d", byteOrdered=False)
+Bool = SchemaField("Bool", FIELD_BOOL)
+VarULong = SchemaField("VarULong", FIELD_VARULONG)
+String = SchemaField("String", FIELD_STRING)
+
+Int8Array = SchemaField("Int8Array", FIELD_SCALAR_ARRAY, "b")
+UInt8Array = SchemaField("UInt8Array", FIELD_SCALAR_ARRAY, "B")
+Int16Array = SchemaField("Int16Array", FIELD_SCALAR_ARRAY, "h")
+UInt16Array = SchemaField("UInt16Array", FIELD_SCALAR_ARRAY, "H")
+Int32Array = SchemaField("Int32Array", FIELD_SCALAR_ARRAY, "i")
+UInt32Array = SchemaField("UInt32Array", FIELD_SCALAR_ARRAY, "I")
+Int64Array = SchemaField("Int64Array", FIELD_SCALAR_ARRAY, "q")
+UInt64Array = SchemaField("UInt64Array", FIELD_SCALAR_ARRAY, "Q")
+FloatArray = SchemaField("FloatArray", FIELD_SCALAR_ARRAY, "f", byteOrdered=False)
+DoubleArray = SchemaField("DoubleArray", FIELD_SCALAR_ARRAY, "d", byteOrdered=False)
+BoolArray = SchemaField("BoolArray", FIELD_BOOL_ARRAY)
+StringArray = SchemaField("StringArray", FIELD_STRING_ARRAY)
+
+#endregion
+
+#region Code generation
+
+def _compileSchema(schemaName: str, fields: Dict[str, SchemaField], byteOrder: str) -> Tuple[Callable, Callable, Callable]:
+    """
+    Generates the functions writing and reading the given fields, in the same order and with the same bit layout as the
+    corresponding put* / get* calls on a Message. Consecutive fixed size values are packed with a single struct, and
+    consecutive booleans with a single bit write (little endian only, as big endian messages write bits bytewise).
+
+    :param schemaName: name of the schema, used for tracebacks
+    :param fields: the fields of the schema, in wire order
+    :param byteOrder: byte order of the messages the generated functions are used for
+    :return: the write function, the read function returning an instance and the read function returning a tuple
+    """
+    namespace: Dict[str, Any] = {}
+    writeLines = ["def write(self, message):"]
+    readLines = ["def read(cls, message):"]
+
+    items = list(fields.items())
+    variables = ["_{}".format(i) for i in range(len(items))]
+
+    i = 0
+    while i < len(items):
+        name, field = items[i]
+        end = i + 1
+
+        if field.kind == FIELD_SCALAR:
+            prefix = field.structPrefix(byteOrder)
+            while end < len(items) and items[end][1].kind == FIELD_SCALAR \
+                    and items[end][1].structPrefix(byteOrder) == prefix:
+                end += 1
+            packer = "_packer{}".format(i)
+            namespace[packer] = Struct(prefix + "".join(f.structFormat for _, f in items[i:end]))
+            if end - i == 1:
+                writeLines.append("    message.putScalar({}, self.{})".format(packer, name))
+                readLines.append("    {} = message.getScalar({})".format(variables[i], packer))
+            else:
+                writeLines.append("    message.putStruct({}, ({},))".format(
+                    packer, ", ".join("self." + n for n, _ in items[i:end])))
+                readLines.append("    {}, = message.getStruct({})".format(", ".join(variables[i:end]), packer))
+
+        elif field.kind == FIELD_BOOL:
+            if byteOrder == BYTE_ORDER_LITTLE:
+                while end < len(items) and items[end][1].kind == FIELD_BOOL:
+                    end += 1
+            if end - i == 1:
+                writeLines.append("    message.putBool(self.{})".format(name))
+                readLines.append("    {} = message.getBool()".format(variables[i]))
+            else:
+                writeLines.append("    message.putBits({}, {})".format(
+                    " | ".join("({} if self.{} else 0)".format(1 << bit, n) for bit, (n, _) in enumerate(items[i:end])),
+                    end - i))
+                readLines.append("    _bits = int.from_bytes(message.getBits({}), 'little')".format(end - i))
+                for bit in range(end - i):
+                    readLines.append("    {} = _bits & {} != 0".format(variables[i + bit], 1 << bit))
+
+        elif field.kind == FIELD_VARULONG:
+            writeLines.append("    message.putVarULong(self.{})".format(name))
+            readLines.append("    {}, _bitCount = message.getVarULong(-1)".format(variables[i]))
+            readLines.append("    message.readBit += _bitCount")
+
+        elif field.kind == FIELD_STRING:
+            writeLines.append("    message.putString(self.{})".format(name))
+            readLines.append("    {} = message.getString()".format(variables[i]))
+
+        elif field.kind == FIELD_SCALAR_ARRAY:
+            packer = "_packer{}".format(i)
+            namespace[packer] = Struct(field.structPrefix(byteOrder) + field.structFormat)
+            writeLines.append("    message.putScalarArray({}, self.{})".format(packer, name))
+            readLines.append("    {} = message.getScalarArray({})".format(variables[i], packer))
+
+        elif field.kind == FIELD_BOOL_ARRAY:
+            writeLines.append("    message.putBoolArray(self.{})".format(name))
+            readLines.append("    {} = message.getBoolArray()".format(variables[i]))
+
+        elif field.kind == FIELD_STRING_ARRAY:
+            writeLines.append("    message.putStringArray(self.{})".format(name))
+            readLines.append("    {} = message.getStringArray()".format(variables[i]))
+
+        i = end
+
+    writeLines.append("    return message")
+    tupleLines = ["def readTuple(message):"] + readLines[1:]
+    readLines.append("    return cls({})".format(", ".join(variables)))
+    tupleLines.append("    return ({}{})".format(", ".join(variables), "," if len(variables) == 1 else ""))
+
+    source = "\n".join(writeLines + [""] + readLines + [""] + tupleLines) + "\n"
+    exec(compile(source, "<schema {} ({})>".format(schemaName, byteOrder), "exec"), namespace)
+    return namespace["write"], namespace["read"], namespace["readTuple"]
+
+
+def _compileInit(schemaName: str, fields: Dict[str, SchemaField]) -> Callable:
+    """
+    Generates the constructor of a schema, taking the field values in wire order
+
+    :param schemaName: name of the schema, used for tracebacks
+    :param fields: the fields of the schema, in wire order
+    :return: the constructor
+    """
+    lines = ["def __init__(self{}):".format("".join(", " + name for name in fields))]
+    lines.extend("    self.{0} = {0}".format(name) for name in fields)
+    if len(fields) == 0:
+        lines.append("    pass")
+
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(lines) + "\n", "<schema {}>".format(schemaName), "exec"), namespace)
+    return namespace["__init__"]
+
+#endregion
+
+
+class MessageSchema:
+    """
+    Base class for declarative message layouts. Fields are declared as class attributes, in wire order:
+
+        class PlayerMoved(MessageSchema, messageID=3, sendMode=MessageSendMode.Unreliable):
+            playerID = UInt16
+            position = FloatArray
+            grounded = Bool
+
+    When the class is defined, functions writing and reading the whole layout at once are generated. The layout is
+    identical to the one written by the corresponding put* calls, so schemas interoperate with peers reading the
+    message value by value.
+    """
+
+    schemaFields: Dict[str, SchemaField] = {}
+    """
+    Fields of the schema, in wire order
+    """
+    messageID: Optional[int] = None
+    """
+    Default message ID used by createMessage
+    """
+    sendMode: Union[MessageSendMode, int] = MessageSendMode.Reliable
+    """
+    Default send mode used by createMessage
+    """
+
+    def __init_subclass__(cls, messageID: Optional[int] = None, sendMode: Union[MessageSendMode, int, None] = None,
+                          **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        fields: Dict[str, SchemaField] = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if isinstance(value, SchemaField):
+                    fields[name] = value
+        cls.schemaFields = fields
+
+        if messageID is not None:
+            cls.messageID = messageID
+        if sendMode is not None:
+            cls.sendMode = sendMode
+
+        cls.__init__ = _compileInit(cls.__name__, fields)
+        compiled = {byteOrder: _compileSchema(cls.__name__, fields, byteOrder)
+                    for byteOrder in (BYTE_ORDER_LITTLE, BYTE_ORDER_BIG)}
+        cls._writers = {byteOrder: functions[0] for byteOrder, functions in compiled.items()}
+        cls._readers = {byteOrder: functions[1] for byteOrder, functions in compiled.items()}
+        cls._tupleReaders = {byteOrder: functions[2] for byteOrder, functions in compiled.items()}
+
+    def write(self, message: Message) -> Message:
+        """
+        Writes all fields of this schema to the given message
+
+        :param message: message to write to
+        :return: the message written to
+        """
+        return self._writers[message.byte_order](self, message)
+
+    def createMessage(self, sendMode: Union[MessageSendMode, int, None] = None, id: Optional[int] = None) -> Message:
+        """
+        Creates a new message containing all fields of this schema
+
+        :param sendMode: Send mode of the message, defaults to the schema's send mode
+        :param id: ID of the message, defaults to the schema's message ID
+        :return: the prepared message
+        """
+        if id is None:
+            id = self.messageID
+        if id is None:
+            raise ValueError("No message ID given for schema {}".format(type(self).__name__))
+        return self.write(createMessage(self.sendMode if sendMode is None else sendMode, id))
+
+    @classmethod
+    def read(cls, message: Message) -> "MessageSchema":
+        """
+        Reads all fields of this schema from the given message
+
+        :param message: message to read from
+        :return: a new instance of the schema holding the read values
+        """
+        return cls._readers[message.byte_order](cls, message)
+
+    @classmethod
+    def readTuple(cls, message: Message) -> tuple:
+        """
+        Reads all fields of this schema from the given message
+
+        :param message: message to read from
+        :return: the read values, in wire order
+        """
+        return cls._tupleReaders[message.byte_order](message)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.schemaFields)
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__,
+                               ", ".join("{}={!r}".format(name, getattr(self, name)) for name in self.schemaFields))
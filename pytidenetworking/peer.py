@@ -1,21 +1,35 @@
 # Updated to 2.1.0
 
 from enum import IntEnum
-from queue import PriorityQueue
-from time import time
-from typing import List, TYPE_CHECKING, Union
+from time import time, perf_counter
+from typing import List, TYPE_CHECKING, Union, Dict, Optional, Callable
 
+from pytidenetworking.coalescing import splitFrames
 from pytidenetworking.utils.delayed_events import DelayedEvent
+from pytidenetworking.utils.message_queue import MessageQueue
+from pytidenetworking.utils.outbound_buffer import OUTBOUND_SLOT_SIZE, OUTBOUND_SLOTS_PER_SLAB
+from pytidenetworking.utils.slab_allocator import SlabAllocator, SlabBuffer
+from pytidenetworking.utils.timing_wheel import TimingWheel, TimerHandle
 from .message import Message, createFromBytes as createRawMessage
-from .message_base import MessageHeader, MIN_NOTIFY_BYTES, MIN_RELIABLE_BYTES, HEADER_BITMASK
+from .message_base import MessageHeader, MessageSendMode, MIN_NOTIFY_BYTES, MIN_RELIABLE_BYTES, HEADER_BITMASK
 
 from .constants import *
 
 if TYPE_CHECKING:
+    from socket import socket
 
     from pytidenetworking.connection import Connection
+    from pytidenetworking.utils.congestion import CongestionController
 
+DEFAULT_MAX_QUEUED_MESSAGES = 4096
+"""
+Default number of received messages a peer queues for handling before it starts dropping messages
+"""
 
+DEFAULT_MAX_ACK_DELAY = 10
+"""
+Default time in milliseconds a peer delays acks at most, if delayed acks are enabled
+"""
 
 class RejectReason(IntEnum):
     """
@@ -120,15 +134,23 @@ def disconnectReasonToString(disconnectReason: Union[DisconnectReason, int]) ->
     return UNKNOWN_REASON
 
 
-# internal read-only
-class MessageToHandle:
+class QueueDropPolicy(IntEnum):
     """
-    Struct for handling messages
+    What a peer does with a received user message while its message queue is full
     """
-    def __init__(self, message: Message, header: Union["MessageHeader", int], fromConnection: "Connection"):
-        self.message: Message = message
-        self.header: Union["MessageHeader", int] = header
-        self.fromConnection: "Connection" = fromConnection
+    DropNewest: int = 0
+    """
+    The received message is dropped
+    """
+    DropOldest: int = 1
+    """
+    The oldest queued message of the same send mode is dropped
+    """
+    Never: int = 2
+    """
+    The received message is queued regardless of the limit
+    """
+
 
 class HeartbeatEvent(DelayedEvent):
     """
@@ -162,8 +184,80 @@ class Peer:
         self.current_time = 0
         self.__startTime = time()
 
-        self.messageQueue: List[MessageToHandle] = []
-        self.eventQueue: PriorityQueue = PriorityQueue(0)
+        self.messageQueue: MessageQueue = MessageQueue()
+        """
+        Received messages waiting to be handled, oldest first
+        """
+        self.maxQueuedMessages: int = DEFAULT_MAX_QUEUED_MESSAGES
+        """
+        Number of queued messages above which received user messages are dropped according to queueDropPolicy.
+        0 = unbounded. Internal messages are always queued.
+        """
+        self.queueDropPolicy: Dict[int, QueueDropPolicy] = {
+            MessageSendMode.Unreliable: QueueDropPolicy.DropOldest,
+            MessageSendMode.Reliable: QueueDropPolicy.Never
+        }
+        """
+        What to do with received user messages of each send mode while the queue is full. Unreliable messages are
+        dropped first: unless their policy is Never, a queued unreliable message makes room for any other message.
+        Reliable messages were already acknowledged when they are queued, so dropping them loses them for good.
+        """
+        self.maxMessagesPerUpdate: int = 0
+        """
+        Number of queued messages handled per update at most, 0 = unlimited. Remaining messages are handled in the
+        next update.
+        """
+        self.updateTimeBudget: float = 0
+        """
+        Time in milliseconds after which an update stops handling queued messages, 0 = unlimited. Remaining messages
+        are handled in the next update.
+        """
+        self.delayAcks: bool = False
+        """
+        If True, the acks for reliable messages received during an update are coalesced, and a single ack per
+        connection is sent once the update received all data. Otherwise every reliable message is acknowledged on
+        its own.
+        """
+        self.maxAckDelay: int = DEFAULT_MAX_ACK_DELAY
+        """
+        Time in milliseconds after which delayed acks are sent right away, even if the update is still receiving
+        """
+        self.__delayedAcks: Dict["Connection", None] = {}
+        """
+        Connections with a delayed ack, in the order the acks were delayed
+        """
+        self.__delayedAcksSince: float = 0
+        self.coalescePackets: bool = False
+        """
+        If True, offers packet coalescing to the remote peers when connecting: messages sent during an update are
+        packed into as few datagrams as possible, and sent at the end of the update. Only used for connections whose
+        remote peer supports it as well. Coalesced datagrams are always received.
+        """
+        self.__coalescingConnections: Dict["Connection", None] = {}
+        """
+        Connections with queued or coalesced messages waiting to be sent
+        """
+        self.deferSends: bool = False
+        """
+        If True, messages sent on connections without packet coalescing are queued, and sent in one go per connection
+        at the end of the update, instead of interleaving the sends with handling received messages. Over TCP, the
+        queued messages are written with a single call per staging buffer. Off by default, as messages sent outside of
+        an update are held back until the next one, and over UDP every message still is a datagram of its own (use
+        coalescePackets to batch messages into fewer datagrams).
+        """
+        self.outboundSlabs: SlabAllocator = SlabAllocator(OUTBOUND_SLOT_SIZE, OUTBOUND_SLOTS_PER_SLAB)
+        """
+        Buffers the messages queued on the connections (see deferSends) are staged in
+        """
+        self.congestionControl: Optional[Callable[[], "CongestionController"]] = None
+        """
+        Creates the congestion controller of each new connection (e.g. AIMDController), which paces the messages sent
+        on it. None = messages are sent right away.
+        """
+        self.eventQueue: TimingWheel = TimingWheel()
+        """
+        Delayed events, by the time (in milliseconds) they are due
+        """
 
 
     @property
@@ -187,7 +281,9 @@ class Peer:
         :return:
         """
         self.current_time = 0
-        self.eventQueue.queue.clear()
+        self.eventQueue.clear()
+        self.__delayedAcks.clear()
+        self.__coalescingConnections.clear()
 
     def heartbeat(self):
         """
@@ -202,57 +298,251 @@ class Peer:
         Handles any received messages and invokes any delayed events which need to be invoked.
         :return:
         """
-        self.current_time = int((time() - self.__startTime) * 1000)
+        self._updateTime()
+
+        self.eventQueue.advance(self.current_time)
 
-        while len(self.eventQueue.queue) > 0 and self.eventQueue.queue[0].priority < self.current_time:
-            event = self.eventQueue.get()
-            event()
+    def _updateTime(self):
+        """
+        Updates current_time to the time passed since startTime() was called
+        :return:
+        """
+        self.current_time = int((time() - self.__startTime) * 1000)
 
-    def executeLater(self, delay: int, event: DelayedEvent):
+    def executeLater(self, delay: int, event: DelayedEvent) -> TimerHandle:
         """
         Sets up a delayed event to be executed after the given time has passed
 
         :param delay: How long from now to execute the delayed event, in milliseconds.
         :param event: The delayed event to execute later
-        :return:
+        :return: a handle which can be used to cancel the event
         """
         event.priority = delay + self.current_time
-        self.eventQueue.put(event)
+        return self.eventQueue.schedule(event.priority, event)
+
+    def timeUntilNextEvent(self) -> Optional[float]:
+        """
+        :return: time in seconds until update() has a delayed event to execute, 0 if one is due already or messages
+        are waiting to be sent, None if no event is scheduled
+        """
+        if len(self.__coalescingConnections) > 0:
+            return 0.0
+        deadline = self.eventQueue.nextDeadline()
+        if deadline is None:
+            return None
+        # Events are executed once their time has passed
+        return max(0.0, (deadline + 1) / 1000 - (time() - self.__startTime))
+
+    def sockets(self) -> List["socket"]:
+        """
+        :return: the sockets of the transport, which update() receives from
+        """
+        # Not implemented here
+        return []
 
     def _handleMessages(self):
         """
-        Handles all queued messages
+        Handles the queued messages, in the order they were received, until the queue is empty or the budget of this
+        update (maxMessagesPerUpdate, updateTimeBudget) is used up
+        :return:
+        """
+        queue = self.messageQueue
+        count = len(queue)
+        if 0 < self.maxMessagesPerUpdate < count:
+            count = self.maxMessagesPerUpdate
+        deadline = perf_counter() + self.updateTimeBudget / 1000 if self.updateTimeBudget > 0 else 0
+
+        while count > 0 and len(queue) > 0:
+            message, header, connection = queue.popleft()
+            self.handle(message=message, header=header, connection=connection)
+            count -= 1
+            if deadline and perf_counter() >= deadline:
+                break
+
+    def _delayAck(self, connection: "Connection"):
+        """
+        Called by connections which delayed an ack, flushes all delayed acks once the oldest one is older than
+        maxAckDelay
+
+        :param connection: the connection with the delayed ack
         :return:
         """
-        while len(self.messageQueue) > 0:
-            msgHandle: MessageToHandle = self.messageQueue.pop()
-            self.handle(message=msgHandle.message, header=msgHandle.header, connection=msgHandle.fromConnection)
+        if len(self.__delayedAcks) == 0:
+            self.__delayedAcksSince = perf_counter()
+        self.__delayedAcks[connection] = None
+        if (perf_counter() - self.__delayedAcksSince) * 1000 >= self.maxAckDelay:
+            self._flushAcks()
 
-    def _handleData(self, data: Union[bytes, bytearray, List[int]], amount: int, connection: "Connection"):
+    def _flushAcks(self):
+        """
+        Sends the delayed acks, one per connection
+        :return:
+        """
+        if len(self.__delayedAcks) == 0:
+            return
+        connections = self.__delayedAcks
+        self.__delayedAcks = {}
+        for connection in connections:
+            connection.flushAck()
+
+    def _framesPending(self, connection: "Connection"):
+        """
+        Called by connections once they hold queued or coalesced messages, which are sent by _flushFrames()
+
+        :param connection: the connection holding messages
+        :return:
+        """
+        self.__coalescingConnections[connection] = None
+
+    def _flushFrames(self):
+        """
+        Sends the queued and coalesced messages of all connections
+        :return:
+        """
+        if len(self.__coalescingConnections) == 0:
+            return
+        connections = self.__coalescingConnections
+        self.__coalescingConnections = {}
+        for connection in connections:
+            connection.flushFrames()
+
+    def _handleBatches(self):
+        """
+        Calls the batch message handlers with the messages received during this update
+        :return:
+        """
+        # Not implemented here
+        pass
+
+    def _endOfUpdate(self):
+        """
+        Finishes an update once the received data was taken from the transport: sends the delayed acks, handles the
+        received messages and sends the messages queued or coalesced meanwhile. Shared by everything driving the peer,
+        i.e. update() and the event loop scheduler.
+        :return:
+        """
+        self._flushAcks()
+        self._handleMessages()
+        self._handleBatches()
+        self._flushFrames()
+
+    def _queueMessage(self, message: Message, header: Union["MessageHeader", int], connection: "Connection"):
+        """
+        Queues a received message for handling. If the queue is full, drops a message according to queueDropPolicy.
+
+        :param message: The received message
+        :param header: The message's header type
+        :param connection: The connection which the message was received on
+        :return:
+        """
+        queue = self.messageQueue
+        if header in (MessageHeader.Unreliable, MessageHeader.Reliable) and 0 < self.maxQueuedMessages <= len(queue) \
+                and not self.__makeRoom(header):
+            self.__dropMessage(message, header, connection)
+            return
+
+        queue.append(message, header, connection)
+
+    def __makeRoom(self, header: Union["MessageHeader", int]) -> bool:
+        """
+        Drops a queued message if the policy allows to, to make room for a message with the given header
+
+        :param header: header of the received user message
+        :return: True if the received message should be queued, False if it should be dropped
+        """
+        unreliablePolicy = self.queueDropPolicy.get(MessageSendMode.Unreliable, QueueDropPolicy.Never)
+        if header != MessageHeader.Unreliable and unreliablePolicy != QueueDropPolicy.Never \
+                and self.__dropOldest(MessageHeader.Unreliable):
+            return True
+
+        policy = self.queueDropPolicy.get(header, QueueDropPolicy.Never)
+        if policy == QueueDropPolicy.DropOldest:
+            return self.__dropOldest(header)
+        return policy == QueueDropPolicy.Never
+
+    def __dropOldest(self, header: Union["MessageHeader", int]) -> bool:
+        """
+        Drops the oldest queued message with the given header
+
+        :param header: header of the message to drop
+        :return: True if a message was dropped
+        """
+        queued = self.messageQueue.popOldest(header)
+        if queued is None:
+            return False
+        message, _, connection = queued
+        self.__dropMessage(message, header, connection)
+        return True
+
+    def __dropMessage(self, message: Message, header: Union["MessageHeader", int], connection: "Connection"):
+        """
+        Drops a received message instead of handling it
+
+        :param message: The dropped message
+        :param header: The message's header type
+        :param connection: The connection which the message was received on
+        :return:
+        """
+        if header == MessageHeader.Unreliable:
+            connection.metrics.incrementUnreliableDiscarded()
+        else:
+            connection.metrics.incrementReliableDiscarded()
+        message.release()
+
+    def _handleData(self, data: Union[bytes, bytearray, List[int], SlabBuffer], amount: int, connection: "Connection"):
         """
         Handles data received by the transport
 
-        :param data:raw data to interpret as message
+        :param data:raw data to interpret as message, or the transport buffer containing it
+        :param amount: amount of bytes to read in data
+        :param connection: connection the data was received from
+        :return:
+        """
+        owner = None
+        if isinstance(data, SlabBuffer):
+            # Messages read from the transport's buffer, which is reused once they are released
+            owner = data
+            data = owner.view[:amount]
+
+        if data[0] & HEADER_BITMASK == MessageHeader.Coalesced:
+            if isinstance(data, list):
+                data = bytes(data)
+            view = memoryview(data)
+            for start, length in splitFrames(data, amount):
+                self.__handleFrame(view[start:start + length], length, connection, owner)
+        else:
+            self.__handleFrame(data, amount, connection, owner)
+
+    def __handleFrame(self, data: Union[bytes, bytearray, memoryview, List[int]], amount: int, connection: "Connection",
+                      owner: Optional[SlabBuffer]):
+        """
+        Handles a single received message
+
+        :param data: raw data to interpret as message
         :param amount: amount of bytes to read in data
         :param connection: connection the data was received from
+        :param owner: the transport buffer containing data, if any
         :return:
         """
         header = data[0] & HEADER_BITMASK
-        message = createRawMessage(data)
+        message = createRawMessage(data, amount, owner)
         if message.sendMode == MessageHeader.Notify:
             if amount < MIN_NOTIFY_BYTES:
+                message.release()
                 return
             connection.processNotify(data, len(data), message)
         elif message.sendMode == MessageHeader.Unreliable:
-            self.messageQueue.append(MessageToHandle(message, header, connection))
             connection.metrics.receivedUnreliable(len(data))
+            self._queueMessage(message, header, connection)
         else:
             if amount < MIN_RELIABLE_BYTES:
+                message.release()
                 return
             if connection.shouldHandle(message.seqID):
-                self.messageQueue.append(MessageToHandle(message, header, connection))
+                self._queueMessage(message, header, connection)
             else:
                 connection.metrics.incrementReliableDiscarded()
+                message.release()
 
     def handle(self, message: Message, header: Union["MessageHeader", int], connection: "Connection"):
         """
@@ -1,36 +1,26 @@
 # Updated to 2.1.0
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from pytidenetworking.message_base import MessageBase
+from pytidenetworking.message_base import MessageBase, HEADER_BITS
 from pytidenetworking.peer import DisconnectReason
-from pytidenetworking.utils.delayed_events import DelayedEvent
+from pytidenetworking.utils.converter import BITS_PER_BYTE, writeBitsInt
 from pytidenetworking.utils.logengine import getLogger
 from pytidenetworking.utils.object_pool import ObjectPool
 
 if TYPE_CHECKING:
     from pytidenetworking.connection import Connection
+    from pytidenetworking.message import Message
 
 PENDING_MESSAGE_POOL_SIZE = 10
-PENDING_MESSAGE_POOL = ObjectPool(PENDING_MESSAGE_POOL_SIZE)
+PENDING_MESSAGE_POOL_MAX_SIZE = 256
+PENDING_MESSAGE_POOL = ObjectPool(PENDING_MESSAGE_POOL_SIZE, PENDING_MESSAGE_POOL_MAX_SIZE)
 
 RETRY_TIME_MULTIPLIER = 1.2
 MAX_SEND_ATTEMPTS = 15
 
 logger = getLogger("pytide.PendingMessage")
 
-class PendingMessageResendEvent(DelayedEvent):
-    """
-    Resends a PendingMessage when invoked.
-    """
-    def __init__(self, priority, message):
-        super(PendingMessageResendEvent, self).__init__(priority)
-        self.message = message
-
-    def __call__(self, *args, **kwargs):
-        if self.priority == self.message.lastSendTime: # check if message was already resent
-            self.message.retrySend()
-
 class PendingMessage(MessageBase):
     """
     Represents a currently pending reliably sent message whose delivery has not been acknowledged yet.
@@ -59,6 +49,51 @@ class PendingMessage(MessageBase):
         """
         Whether the pending message has been cleared or not.
         """
+        self.message: Optional["Message"] = None
+        """
+        The message being sent. Holds a reference to the message, whose buffer contains the bytestream.
+        """
+        self.__frame: Optional[bytearray] = None
+        """
+        Buffer shared with the message, containing the bytestream
+        """
+        self.__frameSize: int = 0
+        """
+        Number of bytes in the bytestream
+        """
+        self.resendTime: int = 0
+        """
+        The time of the next resend attempt, see Connection.resendOverdue()
+        """
+
+    def init(self, connection: "Connection", message: "Message", frame: bytearray, frameSize: int):
+        """
+        Prepares the pending message for reuse
+
+        :param connection: Connection used to send & resend the pending message
+        :param message: The message being sent, holding a reference for this pending message
+        :param frame: The buffer shared with the message, see Message.shareFrame()
+        :param frameSize: The number of bytes in the bytestream
+        :return:
+        """
+        self.connection = connection
+        self.message = message
+        self.__frame = frame
+        self.__frameSize = frameSize
+        self.__lastSendTime = 0
+        self.__sendAttempts = 0
+        self.__wasCleared = False
+        self.resendTime = 0
+
+    @property
+    def bytestream(self) -> memoryview:
+        """
+        The bytes representing the message. The buffer holding them is shared with other pending messages of the same
+        message, so the view is only valid until the sequence ID of another one is filled in.
+        """
+        # The header nibble and message ID are shared, only the sequence ID differs
+        writeBitsInt(self.seqID, 2 * BITS_PER_BYTE, self.__frame, HEADER_BITS)
+        return memoryview(self.__frame)[:self.__frameSize]
 
     @property
     def lastSendTime(self):
@@ -67,11 +102,22 @@ class PendingMessage(MessageBase):
         """
         return self.__lastSendTime
 
+    @property
+    def wasCleared(self) -> bool:
+        """
+        Whether the pending message has been cleared (and released) or not.
+        """
+        return self.__wasCleared
+
     def release(self):
         """
         Releases the message back into the pool
         :return:
         """
+        if self.message is not None:
+            self.message.releaseFrame(self.__frame)
+            self.message = None
+            self.__frame = None
         PENDING_MESSAGE_POOL.release(self)
 
     def retrySend(self):
@@ -84,9 +130,7 @@ class PendingMessage(MessageBase):
             if self.__lastSendTime + (25 if self.connection.smoothRTT < 0 else self.connection.smoothRTT / 2) <= peerTime:
                 self.trySend()
             else:
-                delay = 50 if self.connection.smoothRTT < 0 else max(10,
-                                                            int(self.connection.smoothRTT * RETRY_TIME_MULTIPLIER))
-                self.connection.peer.executeLater(delay, PendingMessageResendEvent(priority=delay, message=self))
+                self.__scheduleResend()
 
     def trySend(self):
         """
@@ -97,15 +141,24 @@ class PendingMessage(MessageBase):
             self.clear()
             self.connection.peer.disconnect(connection=self.connection, reason=DisconnectReason.PoorConnection)
             return
-        bytestream, amount = self.createBytestream()
-        self.connection.send(bytestream, amount)
-        self.connection.metrics.sentReliable(amount)
+        if self.__sendAttempts > 0:
+            self.connection.onReliableResend(self.seqID)
+        self.connection.sendFrame(self.bytestream, self.__frameSize)
+        self.connection.metrics.sentReliable(self.__frameSize)
         self.__lastSendTime = self.connection.peer.current_time
         self.__sendAttempts += 1
 
+        self.__scheduleResend()
+
+    def __scheduleResend(self):
+        """
+        Sets the time of the next resend attempt, and makes sure the connection's resend timer fires by then
+        :return:
+        """
         delay = 50 if self.connection.smoothRTT < 0 else max(10,
                                                                int(self.connection.smoothRTT * RETRY_TIME_MULTIPLIER))
-        self.connection.peer.executeLater(delay, PendingMessageResendEvent(priority=delay, message=self))
+        self.resendTime = self.connection.peer.current_time + delay
+        self.connection.scheduleResend(self.resendTime)
 
     def clear(self):
         """
@@ -114,11 +167,13 @@ class PendingMessage(MessageBase):
         :param shouldRemoveFromDictionary: Whether or not to remove the message from the connection's pending messages
         :return:
         """
+        if self.__wasCleared:
+            return
         self.__wasCleared = True
         self.release()
 
 
-def createPending(sequenceID: int, message: MessageBase, connection: "Connection"):
+def createPending(sequenceID: int, message: "Message", connection: "Connection"):
     """
     Retrieves a PendingMessage instance, initializes it and then sends it.
 
@@ -127,20 +182,18 @@ def createPending(sequenceID: int, message: MessageBase, connection: "Connection
     :param connection: The Connection to use to send (and resend) the pending message.
     :return: the pending message set up
     """
+    message.seqID = sequenceID
+    # Shared instead of copied, the pending message holds a reference to the message until it is cleared
+    frame, frameSize = message.shareFrame()
+
     pendingMessage: PendingMessage = PENDING_MESSAGE_POOL.acquire()
-    pendingMessage.connection = connection
+    pendingMessage.init(connection, message, frame, frameSize)
 
     pendingMessage.header = message.header
     pendingMessage.seqID = sequenceID
     pendingMessage.msgID = message.msgID
-    pendingMessage.data = message.data
-
-    pendingMessage.readBit = message.readBit
     pendingMessage.writeBit = message.writeBit
 
-    pendingMessage.__sendAttempts = 0
-    pendingMessage.__wasCleared = False
-
     return pendingMessage
 
 def createPendingMessage():
@@ -1,11 +1,14 @@
 # Updated to 2.1.0
 
-from typing import List, Dict, Callable, Union, Tuple, Optional
+from socket import socket
+from typing import List, Dict, Callable, Union, Tuple, Optional, Type, Iterable
 
+from pytidenetworking.coalescing import stripCoalescingFlag
 from pytidenetworking.connection import Connection
 from pytidenetworking.constants import decreaseActiveCount, increaseActiveCount
 from pytidenetworking.message import Message, createInternal as createMessage
 from pytidenetworking.message_base import MessageHeader
+from pytidenetworking.message_schema import MessageSchema
 from pytidenetworking.peer import Peer, DisconnectReason, RejectReason, rejectReasonToString, HeartbeatEvent, \
     disconnectReasonToString
 from pytidenetworking.transports.iserver import IServer
@@ -89,6 +92,16 @@ class Server(Peer):
         Methods used to handle messages, accessible by their corresponding message IDs
         """
 
+        self.__batchHandlers: Dict[int, Callable[[List[Tuple[int, Message]]], None]] = {}
+        """
+        Methods used to handle all messages of an ID received during an update at once, accessible by their message IDs
+        """
+
+        self.__batches: Dict[int, List[Tuple[int, Message]]] = {}
+        """
+        Messages received during the current update for each batch handler, with the IDs of the clients they came from
+        """
+
         self.__availableClientIDs: List[int] = []
         """
         All currently unused client IDs
@@ -143,15 +156,23 @@ class Server(Peer):
 
     #region Message Handlers
 
-    def registerMessageHandler(self, messageID: int, callback: Callable[[int, Message], None]):
+    def registerMessageHandler(self, messageID: int, callback: Callable[[int, Union[Message, MessageSchema]], None],
+                               schema: Optional[Type[MessageSchema]] = None):
         """
         Registers a handler for messages with the given ID
 
         :param messageID: Message ID handled by the handler
         :param callback: MessageHandler for messages with the given ID
+        :param schema: if given, the handler receives an instance of this schema read from the message, instead of the
+            message itself
         :return:
         """
-        self.__messageHandlers[messageID] = callback
+        if schema is not None:
+            def readSchema(fromClientID: int, message: Message):
+                callback(fromClientID, schema.read(message))
+            self.__messageHandlers[messageID] = readSchema
+        else:
+            self.__messageHandlers[messageID] = callback
 
     def removeMessageHandler(self, messageID: int):
         """
@@ -162,6 +183,50 @@ class Server(Peer):
         """
         del self.__messageHandlers[messageID]
 
+    def registerBatchMessageHandler(self, messageID: int, callback: Callable[[List[Tuple[int, Message]]], None]):
+        """
+        Registers a handler receiving all messages with the given ID at once: at the end of each update, the handler is
+        called with the messages received during that update, as a list of (fromClientID, message), in the order they
+        were received. Takes precedence over a handler registered with registerMessageHandler.
+
+        The messages are only valid until the handler returned, as they are released afterwards. Handlers keeping a
+        message call message.retain(), which copies it out of the buffer it was received in.
+
+        :param messageID: Message ID handled by the handler
+        :param callback: handler for lists of messages with the given ID
+        :return:
+        """
+        self.__batchHandlers[messageID] = callback
+        self.__batches.setdefault(messageID, [])
+
+    def removeBatchMessageHandler(self, messageID: int):
+        """
+        Removes the batch handler for messages with the given ID. Messages received for it during the current update are
+        dropped.
+
+        :param messageID: Message ID of handler to remove
+        :return:
+        """
+        del self.__batchHandlers[messageID]
+        for _, message in self.__batches.pop(messageID, ()):
+            message.release()
+
+    def _handleBatches(self):
+        """
+        Calls the batch handlers with the messages received during this update
+        :return:
+        """
+        # Handlers may register or remove batch handlers
+        for messageID, batch in list(self.__batches.items()):
+            if len(batch) == 0 or self.__batches.get(messageID) is not batch:
+                continue
+            self.__batches[messageID] = []
+            try:
+                self.__batchHandlers[messageID](batch)
+            finally:
+                for _, message in batch:
+                    message.release()
+
     #endregion
 
     def changeTransport(self, newTransport: IServer):
@@ -240,6 +305,8 @@ class Server(Peer):
         :return:
         """
         connection.setPending()
+        if stripCoalescingFlag(connectMessage) and self.coalescePackets:
+            connection.enableCoalescing()
 
         if self.handleConnection is None:
             self.acceptConnection(connection)
@@ -363,7 +430,13 @@ class Server(Peer):
         """
         super(Server, self).update()
         self.__transport.poll()
-        self._handleMessages()
+        self._endOfUpdate()
+
+    def sockets(self) -> List[socket]:
+        """
+        :return: the sockets of the transport, which update() receives from
+        """
+        return self.__transport.sockets()
 
     def handle(self, message: Message, header: Union[MessageHeader, int], connection: Connection):
         """
@@ -409,6 +482,39 @@ class Server(Peer):
 
         return toClient.sendMessage(message, shouldRelease)
 
+    def sendMany(self, messages: Iterable[Tuple[Message, Union[int, Connection]]], shouldRelease: bool = True) \
+            -> List[int]:
+        """
+        Sends messages to the given clients in one go, the messages to each client are sent as a batch (see
+        Connection.sendBatch)
+
+        :param messages: The messages to send, each with either the numeric ID of or the connection to the client to
+        send it to
+        :param shouldRelease: Whether or not to return the messages to the pool after they are sent. Defaults to True.
+        A message sent to several clients is released once.
+        :return: the sequence IDs of the messages, in the given order. 0 for messages to non-existing clients
+        """
+        messages = list(messages)
+        # Indices of the messages to send, by client
+        batches: Dict[Connection, List[int]] = {}
+        for index, (message, toClient) in enumerate(messages):
+            if isinstance(toClient, int):
+                if toClient not in self.__clients:
+                    logger.debug("Attempted to send to non-existing client: '{}'".format(toClient))
+                    continue
+                toClient = self.__clients[toClient]
+            batches.setdefault(toClient, []).append(index)
+
+        sequenceIDs = [0] * len(messages)
+        for client, indices in batches.items():
+            for index, sequenceID in zip(indices, client.sendBatch([messages[index][0] for index in indices], False)):
+                sequenceIDs[index] = sequenceID
+
+        if shouldRelease:
+            for message in {id(message): message for message, _ in messages}.values():
+                message.release()
+        return sequenceIDs
+
     def sendToAll(self, message: Message, exceptToClientId: int = -1, shouldRelease: bool = True):
         """
         Sends a message to all connected clients
@@ -418,11 +524,13 @@ class Server(Peer):
         :param shouldRelease: Whether or not to return the message to the pool after it is sent. Defaults to True
         :return:
         """
+        # The message keeps its assembled bytes between sends, so it is only encoded once, and reliable sends share them
+        # (holding a reference to the message each). Iterates over a copy, as sending can disconnect a client.
         if exceptToClientId < 0:
-            for client in self.__clients.values():
+            for client in tuple(self.__clients.values()):
                 client.sendMessage(message, False)
         else:
-            for client in self.__clients.values():
+            for client in tuple(self.__clients.values()):
                 if client.id != exceptToClientId:
                     client.sendMessage(message, False)
 
@@ -478,6 +586,7 @@ class Server(Peer):
         if client.peer != self:
             logger.warning("Attempted to disconnect Client from server {}, but client belongs to server {}".format(self, client.peer))
             return # Client does not belong to this server
+        client.flushFrames()
         self.__transport.close(client)
 
         if client.id in self.__clients:
@@ -506,9 +615,11 @@ class Server(Peer):
             return
 
         self.__pendingConnections.clear()
-        disconnectBytes = [MessageHeader.Disconnect, DisconnectReason.ServerStopped]
+        disconnectBytes = bytes([MessageHeader.Disconnect, DisconnectReason.ServerStopped])
         for client in self.__clients.values():
+            client.flushFrames()
             client.send(disconnectBytes, len(disconnectBytes))
+            client.localDisconnect()
         self.__clients.clear()
 
         self.__transport.shutdown()
@@ -610,12 +721,16 @@ class Server(Peer):
         """
         messageID = message.msgID
         if self.messageRelayFilter is not None and self.messageRelayFilter.shouldRelay(messageID):
-            self.sendToAll(message, connection.id)
+            self.sendToAll(message, connection.id, shouldRelease=False) # released by handle()
             return
 
         self.MessageReceived(connection, messageID, message)
 
-        if messageID in self.__messageHandlers:
+        batch = self.__batches.get(messageID)
+        if batch is not None:
+            # Kept until the end of the update, released by _handleBatches()
+            batch.append((connection.id, message.hold()))
+        elif messageID in self.__messageHandlers:
             self.__messageHandlers[messageID](connection.id, message)
         else:
             logger.warning("No message handler method found for message ID {}!".format(messageID))
@@ -0,0 +1,151 @@
+import selectors
+from socket import socket, socketpair
+from threading import Thread, Lock
+from typing import Dict, List, Set
+
+from pytidenetworking.peer import Peer
+
+DEFAULT_MAX_WAIT = 0.1
+"""
+Default time in seconds the reactor waits at most before looking for new sockets and delayed events
+"""
+
+
+class Reactor(Thread):
+    """
+    Utility class updating any number of Servers and Clients from a single thread. Instead of updating in a fixed
+    interval, the reactor waits until a socket of a peer is readable or the next delayed event of a peer is due, and
+    updates the peers concerned right away.
+
+    Sockets opened and events scheduled from other threads are noticed once the reactor wakes up, after maxWait at the
+    latest. Call wakeup() to have them noticed right away.
+    """
+
+    def __init__(self, maxWait: float = DEFAULT_MAX_WAIT):
+        """
+        Utility class updating any number of peers
+
+        :param maxWait: Time in seconds to wait at most before looking for new sockets and delayed events
+        """
+        super(Reactor, self).__init__()
+        self.shouldFinish = False
+        self.maxWait: float = maxWait
+
+        self.__peers: List[Peer] = []
+        self.__lock: Lock = Lock()
+        self.__selector: selectors.BaseSelector = selectors.DefaultSelector()
+        self.__registered: Dict[socket, Peer] = {}
+        """
+        Sockets registered with the selector, and the peer they belong to
+        """
+        self.__wakeupReceiver, self.__wakeupSender = socketpair()
+        self.__wakeupReceiver.setblocking(False)
+        self.__wakeupSender.setblocking(False)
+        self.__selector.register(self.__wakeupReceiver, selectors.EVENT_READ, None)
+
+    def register(self, peer: Peer):
+        """
+        Starts updating the given peer
+
+        :param peer: Server or Client to update
+        :return:
+        """
+        with self.__lock:
+            if peer not in self.__peers:
+                self.__peers.append(peer)
+        self.wakeup()
+
+    def unregister(self, peer: Peer):
+        """
+        Stops updating the given peer
+
+        :param peer: Server or Client to stop updating
+        :return:
+        """
+        with self.__lock:
+            if peer in self.__peers:
+                self.__peers.remove(peer)
+        self.wakeup()
+
+    def wakeup(self):
+        """
+        Wakes the reactor up, to notice sockets opened and events scheduled from other threads
+
+        :return:
+        """
+        try:
+            self.__wakeupSender.send(b"\0")
+        except OSError:
+            # Already woken up
+            pass
+
+    def run(self) -> None:
+        try:
+            while not self.shouldFinish:
+                with self.__lock:
+                    peers = list(self.__peers)
+                self.__updateSockets(peers)
+
+                timeout = self.maxWait
+                for peer in peers:
+                    wait = peer.timeUntilNextEvent()
+                    if wait is not None and wait < timeout:
+                        timeout = wait
+
+                ready: Set[Peer] = set()
+                for key, _ in self.__selector.select(timeout):
+                    if key.data is None:
+                        self.__drainWakeup()
+                    else:
+                        ready.add(key.data)
+
+                for peer in peers:
+                    if peer in ready or peer.timeUntilNextEvent() == 0:
+                        peer.update()
+        finally:
+            self.__selector.close()
+            self.__registered.clear()
+            self.__wakeupReceiver.close()
+            self.__wakeupSender.close()
+
+    def __updateSockets(self, peers: List[Peer]):
+        """
+        Registers the current sockets of the given peers with the selector, and unregisters the ones that are gone
+
+        :param peers: the peers to update
+        :return:
+        """
+        current: Dict[socket, Peer] = {}
+        for peer in peers:
+            for peerSocket in peer.sockets():
+                if peerSocket.fileno() >= 0:
+                    current[peerSocket] = peer
+
+        for peerSocket in [peerSocket for peerSocket in self.__registered if peerSocket not in current or
+                           peerSocket.fileno() < 0]:
+            self.__selector.unregister(peerSocket)
+            del self.__registered[peerSocket]
+
+        for peerSocket, peer in current.items():
+            if peerSocket not in self.__registered:
+                self.__selector.register(peerSocket, selectors.EVENT_READ, peer)
+                self.__registered[peerSocket] = peer
+
+    def __drainWakeup(self):
+        """
+        Empties the wakeup socket
+        """
+        try:
+            while self.__wakeupReceiver.recv(4096):
+                pass
+        except OSError:
+            pass
+
+    def requestClose(self):
+        """
+        Request this thread to finish executing
+
+        :return:
+        """
+        self.shouldFinish = True
+        self.wakeup()
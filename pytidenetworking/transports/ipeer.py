@@ -1,5 +1,8 @@
 # Updated to 2.1.0
 
+from socket import socket
+from typing import List
+
 from pytidenetworking.utils.eventhandler import EventHandler
 
 class IPeer:
@@ -16,4 +19,11 @@ class IPeer:
 
     def poll(self):
         """Initiates handling of any received messages"""
-        pass
\ No newline at end of file
+        pass
+
+    def sockets(self) -> List[socket]:
+        """
+        :return: the sockets the transport receives on, for waiting until poll() has data to handle. Empty if the
+        transport is not running or its sockets are served elsewhere.
+        """
+        return []
\ No newline at end of file
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Tuple
+
+from socket import SOL_SOCKET, SO_SNDBUF, SO_RCVBUF
+
+from pytidenetworking.connection import Connection
+from pytidenetworking.transports.tcp.async_tcp_connection import AsyncTCPConnection, StreamProtocol
+from pytidenetworking.transports.tcp.tcp_client import TCPClient
+from pytidenetworking.transports.tcp.tcp_peer import DEFAULT_SOCKET_BUFFER_SIZE
+
+
+class AsyncTCPClient(TCPClient):
+    """
+    A client which can connect to a TcpServer, served by an asyncio event loop. Used by AsyncClient.
+    """
+    def __init__(self, socketBufferSize: int = DEFAULT_SOCKET_BUFFER_SIZE):
+        """
+        A client which can connect to a TcpServer
+
+        :param socketBufferSize: Buffer size for the underlying socket
+        """
+        super(AsyncTCPClient, self).__init__(socketBufferSize=socketBufferSize)
+
+    async def open(self, hostAddress: str, port: int):
+        """
+        Opens a stream to the given host on the running event loop
+
+        :param hostAddress: host address to connect to
+        :param port: host port to connect to
+        :return:
+        """
+        transport, _ = await asyncio.get_event_loop().create_connection(lambda: StreamProtocol(self), hostAddress,
+                                                                        port)
+        self.socket = transport.get_extra_info("socket")
+        self.socket.setsockopt(SOL_SOCKET, SO_SNDBUF, self.socketBufferSize)
+        self.socket.setsockopt(SOL_SOCKET, SO_RCVBUF, self.socketBufferSize)
+
+    def onConnectionMade(self, connection: AsyncTCPConnection):
+        """
+        Called once the stream opened by open() is established
+
+        :param connection: the connection to the server
+        :return:
+        """
+        self.tcpConnection = connection
+
+    def connect(self, host: str, port: int) -> Tuple[bool, Connection, str]:
+        """
+        Connect this client to a remote host. Called by Client.connect(), the stream was already opened by open()
+
+        :param host: host address to connect to
+        :param port: host port to connect to
+        :return: True if the connection was successfully created, the connection created and an error string if the
+        connection attempt failed
+        """
+        if self.tcpConnection is None:
+            return False, None, "The transport must be opened before connecting"
+        self.onConnected()
+        return True, self.tcpConnection, ""
+
+    def poll(self):
+        # Messages are handled as they arrive
+        pass
+
+    def disconnect(self):
+        """
+        Disconnects this client and closes the connection
+        :return:
+        """
+        if self.tcpConnection is not None:
+            self.tcpConnection.close()
+        self.tcpConnection = None
+        self.socket = None
@@ -0,0 +1,146 @@
+import asyncio
+from typing import Tuple, List, Union, Optional, TYPE_CHECKING
+
+from pytidenetworking.peer import DisconnectReason
+from pytidenetworking.transports.tcp.tcp_connection import TCPConnection, MESSAGE_LENGTH_STRUCT
+from pytidenetworking.transports.tcp.tcp_peer import TCPPeer, MESSAGE_LENGTH_BYTES
+from pytidenetworking.utils.exceptions import ArgumentOutOfRangeException
+from pytidenetworking.utils.logengine import getLogger
+from pytidenetworking.utils.outbound_buffer import OutboundBuffer
+
+if TYPE_CHECKING:
+    from pytidenetworking.transports.tcp.async_tcp_server import AsyncTCPServer
+    from pytidenetworking.transports.tcp.async_tcp_client import AsyncTCPClient
+
+logger = getLogger("pytide.AsyncTCPConnection")
+
+
+class StreamProtocol(asyncio.Protocol):
+    """
+    Connects an asyncio stream to an AsyncTCPConnection of the given peer
+    """
+
+    def __init__(self, peer: Union["AsyncTCPServer", "AsyncTCPClient"]):
+        self.__peer: Union["AsyncTCPServer", "AsyncTCPClient"] = peer
+        self.connection: Optional[AsyncTCPConnection] = None
+
+    def connection_made(self, transport: asyncio.Transport):
+        remoteEndpoint = transport.get_extra_info("peername")
+        self.connection = AsyncTCPConnection(transport, (remoteEndpoint[0], remoteEndpoint[1]), self.__peer)
+        self.__peer.onConnectionMade(self.connection)
+
+    def data_received(self, data: bytes):
+        self.connection.dataReceived(data)
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self.connection.connectionLost(exc)
+
+
+class AsyncTCPConnection(TCPConnection):
+    """
+    TCP Connection served by an asyncio stream: received messages are handled as soon as they are complete, instead of
+    being polled.
+    """
+
+    def __init__(self, transport: asyncio.Transport, remoteEndpoint: Tuple[str, int], peer: TCPPeer):
+        """
+        Initializes the connection
+
+        :param transport: the stream of the connection
+        :param remoteEndpoint: the remote address
+        :param peer: the local peer associated with this connection
+        """
+        super(AsyncTCPConnection, self).__init__(None, remoteEndpoint, peer)
+        self.streamTransport: Optional[asyncio.Transport] = transport
+        """
+        The stream of the connection, None once closed
+        """
+        self.__peer: TCPPeer = peer
+        self.__received: bytearray = bytearray()
+        """
+        Received bytes not forming a complete message yet
+        """
+
+    def send(self, dataBuffer: Union[bytes, bytearray, memoryview, List[int]], amount: int):
+        """
+        Sends data
+
+        :param dataBuffer: data to send
+        :param amount: number of bytes to send
+        """
+        if len(dataBuffer) <= 0:
+            raise ArgumentOutOfRangeException()
+        if self.streamTransport is None:
+            return
+
+        realAmount = min(len(dataBuffer), amount)
+        # Copied, as the stream keeps what it can't send right away, while the data buffer is reused
+        self.streamTransport.write(MESSAGE_LENGTH_STRUCT[self.byte_order].pack(realAmount) + bytes(dataBuffer[:realAmount]))
+
+    def sendFrames(self, frames: OutboundBuffer):
+        """
+        Sends the queued messages, staged with their length prefixes, with a single write to the stream
+
+        :param frames: the messages to send, in order
+        """
+        if self.streamTransport is None:
+            return
+        # Joined, as the transport may keep the buffer beyond the write while the staging buffers are reused
+        self.streamTransport.write(b"".join(frames.chunks()))
+
+    def receive(self):
+        # Messages are handled as they arrive
+        pass
+
+    def dataReceived(self, data: bytes):
+        """
+        Handles bytes received by the stream, passing every completed message on to the peer
+
+        :param data: the received bytes
+        :return:
+        """
+        received = self.__received
+        received += data
+        lengthStruct = MESSAGE_LENGTH_STRUCT[self.byte_order]
+
+        offset = 0
+        while len(received) - offset >= MESSAGE_LENGTH_BYTES and self.streamTransport is not None:
+            messageSize = lengthStruct.unpack_from(received, offset)[0]
+            end = offset + MESSAGE_LENGTH_BYTES + max(0, messageSize)
+            if end > len(received):
+                break
+            if messageSize > 0:
+                receiveBuffer = self.__peer.slabs.allocate(messageSize)
+                receiveBuffer.view[:messageSize] = received[offset + MESSAGE_LENGTH_BYTES:end]
+                self.__peer.receiveBuffer = receiveBuffer
+                self.__peer.onDataReceived(messageSize, self)
+                self.__peer.receiveBuffer = None
+                # Reused once the messages created from it are released
+                receiveBuffer.release()
+            offset = end
+        del received[:offset]
+
+    def connectionLost(self, exc: Optional[Exception]):
+        """
+        Called once the stream is closed
+
+        :param exc: the error which closed the stream, None if closed regularly
+        :return:
+        """
+        if self.streamTransport is None:
+            # Closed locally
+            return
+        self.streamTransport = None
+        self.__received.clear()
+        self.__peer.onDisconnected(self, DisconnectReason.Disconected if exc is None else DisconnectReason.TransportError)
+
+    def close(self):
+        """
+        Closes the connection
+        """
+        logger.debug("Close Stream")
+        if self.streamTransport is not None:
+            transport = self.streamTransport
+            self.streamTransport = None
+            transport.close()
+        self.__received.clear()
@@ -0,0 +1,103 @@
+import asyncio
+from socket import socket
+from typing import List, Optional
+
+from pytidenetworking.transports.tcp.async_tcp_connection import AsyncTCPConnection, StreamProtocol
+from pytidenetworking.transports.tcp.tcp_peer import DEFAULT_SOCKET_BUFFER_SIZE
+from pytidenetworking.transports.tcp.tcp_server import TCPServer
+from pytidenetworking.utils.logengine import getLogger
+
+logger = getLogger("pytide.AsyncTCPServer")
+
+
+class AsyncTCPServer(TCPServer):
+    """
+    A server which can accept connections from TCP Clients, served by an asyncio event loop. Used by AsyncServer.
+    """
+    def __init__(self, socketBufferSize: int = DEFAULT_SOCKET_BUFFER_SIZE, listenAddress=""):
+        """
+        Initializes the TCP Server
+
+        :param socketBufferSize: Buffer size for the underlying socket
+        :param listenAddress: The listen address of the server, defaults to any
+        """
+        super(AsyncTCPServer, self).__init__(socketBufferSize=socketBufferSize, listenAddress=listenAddress)
+        self.server: Optional[asyncio.AbstractServer] = None
+        """
+        The event loop's server accepting connections on the listening socket, None while not listening
+        """
+
+    async def open(self, port: int):
+        """
+        Starts listening for connections on the running event loop
+
+        :param port: Port to listen on
+        :return:
+        """
+        super(AsyncTCPServer, self).start(port)
+        self.server = await asyncio.get_event_loop().create_server(lambda: StreamProtocol(self), sock=self.socket)
+
+    def start(self, port: int):
+        """
+        Called by Server.start(), the transport was already started by open()
+
+        :param port: Port to listen on
+        :return:
+        """
+        if self.server is None or port != self.port:
+            raise RuntimeError("The transport must be opened on port {} before starting".format(port))
+
+    def poll(self):
+        # Connections are accepted and messages handled as they arrive
+        pass
+
+    def sockets(self) -> List[socket]:
+        # Served by the event loop
+        return []
+
+    def onConnectionMade(self, connection: AsyncTCPConnection):
+        """
+        Registers a connection accepted by the event loop's server
+
+        :param connection: the accepted connection
+        :return:
+        """
+        if connection.remoteEndpoint in self.connections:
+            connection.close()
+            return
+        self.connections[connection.remoteEndpoint] = connection
+        self.onConnected(connection=connection)
+
+    def close(self, connection):
+        """
+        Closes an active connection
+
+        :param connection: the connection to close
+        :return:
+        """
+        if isinstance(connection, AsyncTCPConnection):
+            if self.connections.get(connection.remoteEndpoint) is connection:
+                del self.connections[connection.remoteEndpoint]
+            connection.close()
+            logger.debug("Connection Closed")
+
+    def stopListening(self):
+        """
+        Stop listening for connections
+
+        :return:
+        """
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+        super(AsyncTCPServer, self).stopListening()
+
+    def shutdown(self):
+        """
+        Stop Listening and close all existing connections
+        :return:
+        """
+        self.stopListening()
+        for connection in list(self.connections.values()):
+            connection.close()
+        self.connections.clear()
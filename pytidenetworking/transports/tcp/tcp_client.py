@@ -1,4 +1,5 @@
 # Updated to 2.1.0
+from typing import List
 
 from pytidenetworking.connection import Connection
 from pytidenetworking.transports.iclient import IClient
@@ -65,6 +66,11 @@ class TCPClient(TCPPeer, IClient):
         if self.tcpConnection is not None:
             self.tcpConnection.receive()
 
+    def sockets(self) -> List[socket]:
+        if self.tcpConnection is None or self.tcpConnection.socket is None:
+            return []
+        return [self.tcpConnection.socket]
+
     def disconnect(self):
         """
         Disconnects this client and closes the connection
@@ -1,6 +1,7 @@
 # Updated to 2.1.0
 
-from typing import Tuple, List, Union
+from struct import Struct
+from typing import Tuple, List, Union, Optional
 try:
     from typing import Literal
 except ImportError:
@@ -8,24 +9,29 @@ except ImportError:
 
 from pytidenetworking.connection import Connection
 from pytidenetworking.peer import DisconnectReason
-from pytidenetworking.transports.tcp.tcp_peer import TCPPeer
+from pytidenetworking.transports.tcp.tcp_peer import TCPPeer, MESSAGE_LENGTH_BYTES
 
 from socket import socket, error
 
 from pytidenetworking.utils.exceptions import ArgumentOutOfRangeException
 from pytidenetworking.utils.logengine import getLogger
+from pytidenetworking.utils.outbound_buffer import OutboundBuffer
+from pytidenetworking.utils.slab_allocator import SlabBuffer
 
 logger = getLogger("TCPConnection")
 
 BYTE_ORDER_LITTLE: Literal['big', 'little'] = "little"
 BYTE_ORDER_BIG: Literal['big', 'little'] = "big"
 
-MESSAGE_LENGTH_BYTES = 4 # int
+#todo: double check: why signed ?
+MESSAGE_LENGTH_STRUCT = {BYTE_ORDER_LITTLE: Struct("<i"), BYTE_ORDER_BIG: Struct(">i")}
 
 class TCPConnection(Connection):
     """
     TCP Connection to either a TCP Server or TCP Client
     """
+    FRAME_PREFIX_SIZE: int = MESSAGE_LENGTH_BYTES
+
     def __init__(self, socket: socket, remoteEndpoint: Tuple[str, int], peer: TCPPeer):
         """
         Initializes the connection
@@ -44,8 +50,13 @@ class TCPConnection(Connection):
 
         self.__tcpPeer = peer
 
-        self.sizeBytes: bytes = bytes()
-        self.messageBytes: bytes = bytes()
+        self.sizeBytes: bytearray = bytearray(MESSAGE_LENGTH_BYTES)
+        self.__sizeBytesReceived: int = 0
+        self.messageBuffer: Optional[SlabBuffer] = None
+        """
+        Buffer the message currently being received is written to
+        """
+        self.__messageBytesReceived: int = 0
         self.nextMessageSize = 0
 
     def __hash__(self):
@@ -68,24 +79,51 @@ class TCPConnection(Connection):
     def __ne__(self, other):
         return not self.__eq__(other)
 
-    def send(self, dataBuffer: Union[bytes, bytearray, List[int]], amount: int):
+    def send(self, dataBuffer: Union[bytes, bytearray, memoryview, List[int]], amount: int):
         """
         Sends data
 
         :param dataBuffer: data to send
         :param amount: number of bytes to send
         """
-        #TODO: clip dataBuffer to amount ?
         if len(dataBuffer) <= 0:
             raise ArgumentOutOfRangeException()
 
         realAmount = min(len(dataBuffer), amount)
 
         try:
-            self.__tcpPeer.sendBuffer = bytearray(realAmount.to_bytes(length=MESSAGE_LENGTH_BYTES, byteorder=self.byte_order, signed=True))
-            #todo: double check: why signed ?
-            self.__tcpPeer.sendBuffer.extend(dataBuffer[:realAmount+1])
-            self.socket.sendall(self.__tcpPeer.sendBuffer)
+            sendBuffer = self.__tcpPeer.sendBuffer
+            if len(sendBuffer) < realAmount + MESSAGE_LENGTH_BYTES:
+                sendBuffer = self.__tcpPeer.slabs.allocate(realAmount + MESSAGE_LENGTH_BYTES)
+            MESSAGE_LENGTH_STRUCT[self.byte_order].pack_into(sendBuffer.view, 0, realAmount)
+            sendBuffer.view[MESSAGE_LENGTH_BYTES:MESSAGE_LENGTH_BYTES + realAmount] = \
+                dataBuffer[:realAmount] if not isinstance(dataBuffer, list) else bytes(dataBuffer[:realAmount])
+            self.socket.sendall(sendBuffer.view[:MESSAGE_LENGTH_BYTES + realAmount])
+            if sendBuffer is not self.__tcpPeer.sendBuffer:
+                sendBuffer.release()
+        except error as ex:
+            logger.debug(ex)
+
+    def writeFramePrefix(self, view: memoryview, position: int, amount: int):
+        """
+        Writes the length prefix of a queued message
+
+        :param view: The staging buffer
+        :param position: The position of the prefix
+        :param amount: The size of the message in bytes
+        """
+        MESSAGE_LENGTH_STRUCT[self.byte_order].pack_into(view, position, amount)
+
+    def sendFrames(self, frames: OutboundBuffer):
+        """
+        Sends the queued messages, staged with their length prefixes, with a single call to the socket per staging
+        buffer
+
+        :param frames: the messages to send, in order
+        """
+        try:
+            for chunk in frames.chunks():
+                self.socket.sendall(chunk)
         except error as ex:
             logger.debug(ex)
 
@@ -99,16 +137,18 @@ class TCPConnection(Connection):
                 if self.nextMessageSize > 0:
                     tryReceiveMore, byteCount = self.tryReceiveMessage()
                 else:
-                    while len(self.sizeBytes) < MESSAGE_LENGTH_BYTES:
-                        receivedBytes = self.socket.recv(MESSAGE_LENGTH_BYTES - len(self.sizeBytes))
-                        self.sizeBytes += receivedBytes
-                        if len(receivedBytes) == 0:
+                    while self.__sizeBytesReceived < MESSAGE_LENGTH_BYTES:
+                        receivedCount = self.socket.recv_into(memoryview(self.sizeBytes)[self.__sizeBytesReceived:])
+                        self.__sizeBytesReceived += receivedCount
+                        if receivedCount == 0:
                             tryReceiveMore = False
                             break # No new bytes received
 
-                    self.nextMessageSize = int.from_bytes(self.sizeBytes, self.byte_order, signed=True)
-                    if self.nextMessageSize > 0:
-                        tryReceiveMore, byteCount = self.tryReceiveMessage()
+                    if self.__sizeBytesReceived == MESSAGE_LENGTH_BYTES:
+                        self.__sizeBytesReceived = 0
+                        self.nextMessageSize = MESSAGE_LENGTH_STRUCT[self.byte_order].unpack(self.sizeBytes)[0]
+                        if self.nextMessageSize > 0:
+                            tryReceiveMore, byteCount = self.tryReceiveMessage()
 
             except BlockingIOError:
                 tryReceiveMore = False # No more data available
@@ -135,24 +175,31 @@ class TCPConnection(Connection):
                 logger.error("Unhandled TCP Exception: {}".format(ex))
 
             if byteCount > 0:
-                self.__tcpPeer.receiveBuffer = self.messageBytes
+                receiveBuffer = self.messageBuffer
+                self.messageBuffer = None
+                self.__tcpPeer.receiveBuffer = receiveBuffer
                 self.__tcpPeer.onDataReceived(byteCount, self)
-                self.messageBytes = bytes()
+                self.__tcpPeer.receiveBuffer = None
+                # Reused once the messages created from it are released
+                receiveBuffer.release()
 
     def tryReceiveMessage(self) -> Tuple[bool, int]:
         """
         Attempts to receive a message, returns True and the length of the message, if full message was received, false otherwise
         :return: True and the length of the message, if a full message was received, false otherwise
         """
+        if self.messageBuffer is None:
+            self.messageBuffer = self.__tcpPeer.slabs.allocate(self.nextMessageSize)
+            self.__messageBytesReceived = 0
         try:
-            while len(self.messageBytes) < self.nextMessageSize:
-                recievedBytes = self.socket.recv(self.nextMessageSize - len(self.messageBytes))
-                self.messageBytes += recievedBytes
-                if len(recievedBytes) == 0:
+            while self.__messageBytesReceived < self.nextMessageSize:
+                receivedCount = self.socket.recv_into(
+                    self.messageBuffer.view[self.__messageBytesReceived:self.nextMessageSize])
+                self.__messageBytesReceived += receivedCount
+                if receivedCount == 0:
                     return False, 0  # No new bytes received
-            self.sizeBytes = bytes()
             self.nextMessageSize = 0
-            return True, len(self.messageBytes)
+            return True, self.__messageBytesReceived
         except BlockingIOError:
             return False, 0
 
@@ -162,3 +209,6 @@ class TCPConnection(Connection):
         """
         logger.debug("Close Socket")
         self.socket.close()
+        if self.messageBuffer is not None:
+            self.messageBuffer.release()
+            self.messageBuffer = None
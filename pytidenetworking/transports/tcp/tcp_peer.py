@@ -7,6 +7,8 @@ from socket import socket
 from pytidenetworking.transports.ipeer import IPeer
 from pytidenetworking.utils.eventhandler import EventHandler
 from pytidenetworking.utils.exceptions import ArgumentOutOfRangeException
+from pytidenetworking.utils.slab_allocator import SlabAllocator, SlabBuffer, MTU
+from ...message_base import _MAX_SIZE
 from ...connection import Connection
 from ...peer import DisconnectReason
 
@@ -15,6 +17,7 @@ if TYPE_CHECKING:
 
 DEFAULT_SOCKET_BUFFER_SIZE = 1024**2
 MINIMUM_SOCKET_BUFFER_SIZE = 256*1024
+MESSAGE_LENGTH_BYTES = 4 # int
 
 class TCPPeer(IPeer):
     """
@@ -33,8 +36,18 @@ class TCPPeer(IPeer):
 
         self.socketBufferSize = socketBufferSize
 
-        self.receiveBuffer: bytearray = bytearray(self.socketBufferSize)
-        self.sendBuffer: bytearray = bytearray(self.socketBufferSize + 4)
+        self.slabs: SlabAllocator = SlabAllocator(max(MTU, _MAX_SIZE + MESSAGE_LENGTH_BYTES))
+        """
+        Buffers messages are received into and sent from
+        """
+        self.receiveBuffer: Optional[SlabBuffer] = None
+        """
+        Buffer containing the message currently being handled
+        """
+        self.sendBuffer: SlabBuffer = self.slabs.allocate()
+        """
+        Buffer outgoing messages are staged in, together with their length
+        """
 
         self.socket: Optional[socket] = None
 
@@ -130,6 +130,15 @@ class TCPServer(TCPPeer, IServer):
         except BlockingIOError:
             pass
 
+    def sockets(self) -> List[socket]:
+        """
+        :return: the listening socket and the sockets of all open connections
+        """
+        if not self.__isRunning:
+            return []
+        return [self.socket] + [connection.socket for connection in self.connections.values()
+                                if connection.remoteEndpoint not in self.closedConnections]
+
     def stopListening(self):
         """
         Stop listening for connections
@@ -0,0 +1,42 @@
+from typing import Tuple
+
+from pytidenetworking.connection import Connection
+from pytidenetworking.transports.udp.async_udp_peer import AsyncUDPPeer
+from pytidenetworking.transports.udp.udp_client import UDPClient
+from pytidenetworking.transports.udp.udp_connection import UDPConnection
+from pytidenetworking.transports.udp.udp_peer import SocketMode, _DEFAULT_SOCKET_BUFFER_SIZE
+
+
+class AsyncUDPClient(AsyncUDPPeer, UDPClient):
+    """
+    A client which can connect to a UdpServer, served by an asyncio event loop. Used by AsyncClient.
+    """
+
+    def __init__(self, mode: SocketMode = SocketMode.Both, socketBufferSize: int = _DEFAULT_SOCKET_BUFFER_SIZE,
+                 listenAddress: str = ''):
+        super(AsyncUDPClient, self).__init__(mode, socketBufferSize, listenAddress)
+
+    async def open(self, hostAddress: str, port: int):
+        """
+        Opens the socket and starts receiving on the running event loop
+
+        :param hostAddress: host address to connect to
+        :param port: host port to connect to
+        :return:
+        """
+        await self.openEndpoint()
+
+    def connect(self, hostAddress: str, port: int) -> Tuple[bool, Connection, str]:
+        """
+        Connect this client to a remote host. Called by Client.connect(), the socket was already opened by open()
+
+        :param hostAddress: host address to connect to
+        :param port: host port to connect to
+        :return: True if the connection was successfully created, the connection created and an error string if the
+        connection attempt failed
+        """
+        if self.datagramTransport is None:
+            return False, None, "The transport must be opened before connecting"
+        self.udpConnection = UDPConnection((hostAddress, port), self)
+        self.onConnected()
+        return True, self.udpConnection, ""
@@ -0,0 +1,78 @@
+import asyncio
+from socket import socket
+from typing import Optional, Tuple, Union, List
+
+from pytidenetworking.transports.udp.udp_peer import UDPPeer, SocketMode
+from pytidenetworking.utils.logengine import getLogger
+
+logger = getLogger("pytide.AsyncUDPPeer")
+
+
+class DatagramProtocol(asyncio.DatagramProtocol):
+    """
+    Hands datagrams received by an asyncio datagram endpoint to its peer
+    """
+
+    def __init__(self, peer: "AsyncUDPPeer"):
+        self.__peer: AsyncUDPPeer = peer
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]):
+        self.__peer.onDataReceived(data, len(data), addr)
+
+    def error_received(self, exc: Exception):
+        logger.debug("Error on UDP endpoint: {}".format(exc))
+
+
+class AsyncUDPPeer(UDPPeer):
+    """
+    UDP transport whose socket is served by an asyncio datagram endpoint: received datagrams are handled as soon as
+    they arrive, instead of being polled.
+    """
+
+    def __init__(self, mode: SocketMode, socketBufferSize: int, listenAddress: str = ""):
+        """
+        Initializes the transport
+
+        :param mode: Whether to create an IPv4 only, IPv6 only, or dual-mode socket
+        :param socketBufferSize: How big the socket's send and receive buffers should be
+        :param listenAddress: Address to listen on, empty string means any
+        """
+        super(AsyncUDPPeer, self).__init__(mode, socketBufferSize, listenAddress)
+        self.datagramTransport: Optional[asyncio.DatagramTransport] = None
+        """
+        The endpoint serving the socket, None while the socket is closed
+        """
+
+    async def openEndpoint(self, port: int = 0):
+        """
+        Opens the socket and serves it with a datagram endpoint of the running event loop
+
+        :param port: Port to bind to, 0 = any
+        :return:
+        """
+        self.openSocket(port=port)
+        self.datagramTransport, _ = await asyncio.get_event_loop().create_datagram_endpoint(
+            lambda: DatagramProtocol(self), sock=self.socket)
+
+    def poll(self):
+        # Datagrams are handled as they arrive
+        pass
+
+    def sockets(self) -> List[socket]:
+        # Served by the event loop
+        return []
+
+    def closeSocket(self):
+        if self.datagramTransport is not None:
+            self.datagramTransport.close()
+            self.datagramTransport = None
+        super(AsyncUDPPeer, self).closeSocket()
+
+    def send(self, dataBuffer: Union[bytes, bytearray, memoryview, List[int]], amount: int, toEndPoint: Tuple[str, int]):
+        if self.datagramTransport is None:
+            super(AsyncUDPPeer, self).send(dataBuffer, amount, toEndPoint)
+            return
+        if isinstance(dataBuffer, list):
+            dataBuffer = bytes(dataBuffer)
+        # Copied by the endpoint if it can't be sent right away
+        self.datagramTransport.sendto(dataBuffer if len(dataBuffer) == amount else dataBuffer[:amount], toEndPoint)
@@ -0,0 +1,37 @@
+from pytidenetworking.transports.udp.async_udp_peer import AsyncUDPPeer
+from pytidenetworking.transports.udp.udp_peer import SocketMode, _DEFAULT_SOCKET_BUFFER_SIZE
+from pytidenetworking.transports.udp.udp_server import UDPServer
+
+
+class AsyncUDPServer(AsyncUDPPeer, UDPServer):
+    """
+    A server which can accept connections from UdpClients, served by an asyncio event loop. Used by AsyncServer.
+
+    :param mode: Whether to create an IPv4 only, IPv6 only, or dual-mode socket
+    :param socketBufferSize: How big the socket's send and receive buffers should be
+    :param listenAddress: Address to listen on, empty string means any
+    """
+    def __init__(self, mode: SocketMode = SocketMode.Both, socketBufferSize: int = _DEFAULT_SOCKET_BUFFER_SIZE,
+                 listenAddress: str = ''):
+        super(AsyncUDPServer, self).__init__(mode, socketBufferSize, listenAddress)
+
+    async def open(self, port: int):
+        """
+        Opens the socket and starts receiving on the running event loop
+
+        :param port: Port to listen on
+        :return:
+        """
+        self._port = port
+        self.connections.clear()
+        await self.openEndpoint(port)
+
+    def start(self, port: int):
+        """
+        Called by Server.start(), the transport was already started by open()
+
+        :param port: Port to listen on
+        :return:
+        """
+        if self.datagramTransport is None or port != self._port:
+            raise RuntimeError("The transport must be opened on port {} before starting".format(port))
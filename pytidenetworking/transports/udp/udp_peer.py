@@ -6,10 +6,12 @@ from socket import socket
 from typing import Tuple, List, Union
 
 from pytidenetworking.connection import Connection
+from pytidenetworking.message_base import _MAX_SIZE
 from pytidenetworking.peer import DisconnectReason
 from pytidenetworking.transports.ipeer import IPeer
 from pytidenetworking.utils.exceptions import ArgumentOutOfRangeException
 from pytidenetworking.utils.logengine import getLogger
+from pytidenetworking.utils.slab_allocator import SlabAllocator, SlabBuffer, MTU
 
 logger = getLogger("UDPConnection")
 
@@ -41,7 +43,10 @@ class UDPPeer(IPeer):
         self.mode: SocketMode = mode
         self.socketBufferSize: int = socketBufferSize
 
-        self.receivedData = bytearray()
+        self.slabs: SlabAllocator = SlabAllocator(max(MTU, _MAX_SIZE))
+        """
+        Buffers datagrams are received into. Received messages read from them until released.
+        """
         self.socket: socket = None
         self.__isRunning = False
 
@@ -52,6 +57,11 @@ class UDPPeer(IPeer):
     def poll(self):
         self.receive()
 
+    def sockets(self) -> List[socket]:
+        if not self.__isRunning:
+            return []
+        return [self.socket]
+
     def openSocket(self, listenAddress=None, port: int = 0):
         if listenAddress is None:
             listenAddress = self.listen_address
@@ -98,9 +108,9 @@ class UDPPeer(IPeer):
         tryReceiveMore: bool = True
         while tryReceiveMore:
             byteCount: int = 0
+            receiveBuffer: SlabBuffer = self.slabs.allocate()
             try:
-                self.receivedData, self.remoteEndpoint = self.socket.recvfrom(self.socketBufferSize)
-                byteCount = len(self.receivedData)
+                byteCount, self.remoteEndpoint = self.socket.recvfrom_into(receiveBuffer.view)
             except BlockingIOError:
                 tryReceiveMore = False  # No more data available
             except TimeoutError:
@@ -120,20 +130,23 @@ class UDPPeer(IPeer):
                 logger.error("Unhandled UDP Exception: {}".format(ex))
 
             if byteCount > 0:
-                self.onDataReceived(self.receivedData, byteCount, self.remoteEndpoint)
+                self.onDataReceived(receiveBuffer, byteCount, self.remoteEndpoint)
+            # Reused once the messages created from it are released
+            receiveBuffer.release()
 
-    def send(self, dataBuffer: Union[bytes, bytearray, List[int]], amount: int, toEndPoint: Tuple[str, int]):
+    def send(self, dataBuffer: Union[bytes, bytearray, memoryview, List[int]], amount: int, toEndPoint: Tuple[str, int]):
         try:
             if self.__isRunning:
-                self.socket.sendto(dataBuffer[:amount], toEndPoint)
+                self.socket.sendto(dataBuffer if len(dataBuffer) == amount else dataBuffer[:amount], toEndPoint)
         except Exception as ex:
             logger.debug("Exception occured while sending UDP packet: {}".format(ex))
 
-    def onDataReceived(self, dataBuffer: Union[bytes, bytearray, List[int]], amount: int, fromEndPoint: Tuple[str, int]):
+    def onDataReceived(self, dataBuffer: Union[bytes, bytearray, List[int], SlabBuffer], amount: int,
+                       fromEndPoint: Tuple[str, int]):
         """
         Handles received data
 
-        :param dataBuffer: A byte array containing the received data
+        :param dataBuffer: A byte array (or the transport buffer) containing the received data
         :param amount: the number of bytes received
         :param fromEndpoint: the endpoint the bytes were received from
         :return:
@@ -0,0 +1,169 @@
+DEFAULT_INITIAL_RATE = 64 * 1024
+"""
+Initial send rate of a connection in bytes per second
+"""
+DEFAULT_MIN_RATE = 4 * 1024
+"""
+Send rate in bytes per second a congestion controller never drops below
+"""
+DEFAULT_MAX_RATE = 16 * 1024 * 1024
+"""
+Send rate in bytes per second a congestion controller never exceeds
+"""
+DEFAULT_RATE_INCREASE = 8 * 1024
+"""
+Increase of the send rate in bytes per second, per round trip without loss
+"""
+DEFAULT_RATE_DECREASE = 0.5
+"""
+Factor applied to the send rate when a loss is detected
+"""
+DEFAULT_DELAY_THRESHOLD = 1.5
+"""
+Ratio of the smoothed round trip time to the lowest one seen, above which the delay based controller backs off
+"""
+DEFAULT_RTT = 50
+"""
+Round trip time in milliseconds assumed until the connection measured it
+"""
+
+
+class CongestionController:
+    """
+    Decides how many bytes per second a connection may send. Notified by the connection whenever a reliable message
+    is acknowledged, and whenever a message is considered lost: a reliable message is resent, or a notify message is
+    reported lost.
+
+    Subclass to implement another algorithm, and set Peer.congestionControl to create it for each connection.
+    """
+
+    def __init__(self, initialRate: float = DEFAULT_INITIAL_RATE, minRate: float = DEFAULT_MIN_RATE,
+                 maxRate: float = DEFAULT_MAX_RATE):
+        """
+        Constructor
+
+        :param initialRate: send rate in bytes per second to start with
+        :param minRate: send rate in bytes per second to never drop below
+        :param maxRate: send rate in bytes per second to never exceed
+        """
+        self.minRate: float = minRate
+        self.maxRate: float = maxRate
+        self._rate: float = min(maxRate, max(minRate, initialRate))
+
+    @property
+    def rate(self) -> float:
+        """
+        :return: the current send rate in bytes per second
+        """
+        return self._rate
+
+    def onAcknowledged(self, now: int, rtt: int):
+        """
+        Called when a reliable message was acknowledged
+
+        :param now: current time of the peer in milliseconds
+        :param rtt: smoothed round trip time of the connection in milliseconds, -1 if not measured yet
+        :return:
+        """
+        pass
+
+    def onLoss(self, now: int, rtt: int):
+        """
+        Called when a reliable message is resent, or a notify message was lost
+
+        :param now: current time of the peer in milliseconds
+        :param rtt: smoothed round trip time of the connection in milliseconds, -1 if not measured yet
+        :return:
+        """
+        pass
+
+    def _setRate(self, rate: float):
+        self._rate = min(self.maxRate, max(self.minRate, rate))
+
+
+class AIMDController(CongestionController):
+    """
+    Additive increase, multiplicative decrease: the send rate doubles every round trip until the first loss (slow
+    start), then grows by rateIncrease every round trip with acknowledged messages, and is multiplied by rateDecrease
+    on loss. Losses within one round trip of the last decrease count as the same congestion event.
+    """
+
+    def __init__(self, initialRate: float = DEFAULT_INITIAL_RATE, minRate: float = DEFAULT_MIN_RATE,
+                 maxRate: float = DEFAULT_MAX_RATE, rateIncrease: float = DEFAULT_RATE_INCREASE,
+                 rateDecrease: float = DEFAULT_RATE_DECREASE):
+        """
+        Constructor
+
+        :param initialRate: send rate in bytes per second to start with
+        :param minRate: send rate in bytes per second to never drop below
+        :param maxRate: send rate in bytes per second to never exceed
+        :param rateIncrease: increase of the send rate in bytes per second, per round trip without loss
+        :param rateDecrease: factor applied to the send rate on loss
+        """
+        super(AIMDController, self).__init__(initialRate, minRate, maxRate)
+        self.rateIncrease: float = rateIncrease
+        self.rateDecrease: float = rateDecrease
+        self.__slowStart: bool = True
+        self.__lastIncrease: int = -1
+        self.__lastDecrease: int = -1
+
+    @property
+    def slowStart(self) -> bool:
+        """
+        :return: True until the first loss, while the send rate doubles every round trip
+        """
+        return self.__slowStart
+
+    def onAcknowledged(self, now: int, rtt: int):
+        if rtt < 0:
+            rtt = DEFAULT_RTT
+        if self.__lastIncrease >= 0 and now - self.__lastIncrease < rtt:
+            return
+        if self.__lastIncrease >= 0:
+            self._setRate(self._rate * 2 if self.__slowStart else self._rate + self.rateIncrease)
+        self.__lastIncrease = now
+
+    def onLoss(self, now: int, rtt: int):
+        if rtt < 0:
+            rtt = DEFAULT_RTT
+        if self.__lastDecrease >= 0 and now - self.__lastDecrease < rtt:
+            return
+        self.__slowStart = False
+        self._setRate(self._rate * self.rateDecrease)
+        self.__lastDecrease = now
+        # The next increase needs a full round trip without loss
+        self.__lastIncrease = now
+
+
+class DelayBasedController(AIMDController):
+    """
+    AIMD controller additionally backing off once queues build up along the path, before packets are lost: an
+    acknowledgement arriving while the smoothed round trip time exceeds delayThreshold times the lowest one seen
+    counts as a loss.
+    """
+
+    def __init__(self, initialRate: float = DEFAULT_INITIAL_RATE, minRate: float = DEFAULT_MIN_RATE,
+                 maxRate: float = DEFAULT_MAX_RATE, rateIncrease: float = DEFAULT_RATE_INCREASE,
+                 rateDecrease: float = DEFAULT_RATE_DECREASE, delayThreshold: float = DEFAULT_DELAY_THRESHOLD):
+        """
+        Constructor
+
+        :param initialRate: send rate in bytes per second to start with
+        :param minRate: send rate in bytes per second to never drop below
+        :param maxRate: send rate in bytes per second to never exceed
+        :param rateIncrease: increase of the send rate in bytes per second, per round trip without loss
+        :param rateDecrease: factor applied to the send rate on loss
+        :param delayThreshold: ratio of the smoothed to the lowest round trip time above which to back off
+        """
+        super(DelayBasedController, self).__init__(initialRate, minRate, maxRate, rateIncrease, rateDecrease)
+        self.delayThreshold: float = delayThreshold
+        self.__minRtt: int = -1
+
+    def onAcknowledged(self, now: int, rtt: int):
+        if rtt > 0:
+            if self.__minRtt < 0 or rtt < self.__minRtt:
+                self.__minRtt = rtt
+            elif rtt > self.__minRtt * self.delayThreshold:
+                self.onLoss(now, rtt)
+                return
+        super(DelayBasedController, self).onAcknowledged(now, rtt)
@@ -10,6 +10,7 @@ class ConnectionMetrics:
         self.__unreliableBytesOut: int = 0
         self.__unreliableIn: int = 0
         self.__unreliableOut: int = 0
+        self.__unreliableDiscarded: int = 0
 
         self.__notifyBytesIn: int = 0
         self.__notifyBytesOut: int = 0
@@ -28,6 +29,8 @@ class ConnectionMetrics:
         self.__reliableDiscarded: int = 0
         self.__reliableUniques: int = 0
 
+        self.__pacedDiscarded: int = 0
+
         self.rollingReliableSends: RollingStat = RollingStat(64)
 
         self.__notifyLossTracker: int = 0
@@ -38,6 +41,7 @@ class ConnectionMetrics:
         self.__unreliableBytesOut: int = 0
         self.__unreliableIn: int = 0
         self.__unreliableOut: int = 0
+        self.__unreliableDiscarded: int = 0
 
         self.__notifyBytesIn: int = 0
         self.__notifyBytesOut: int = 0
@@ -54,6 +58,8 @@ class ConnectionMetrics:
         self.__reliableDiscarded: int = 0
         self.__reliableUniques: int = 0
 
+        self.__pacedDiscarded: int = 0
+
     @property
     def bytesIn(self) -> int:
         return self.__unreliableBytesIn + self.__reliableBytesIn + self.__notifyBytesIn
@@ -86,6 +92,10 @@ class ConnectionMetrics:
     def unreliableOut(self) -> int:
         return self.__unreliableOut
 
+    @property
+    def unreliableDiscarded(self) -> int:
+        return self.__unreliableDiscarded
+
     @property
     def notifyBytesIn(self) -> int:
         return self.__notifyBytesIn
@@ -150,6 +160,10 @@ class ConnectionMetrics:
     def reliableUniques(self) -> int:
         return self.__reliableUniques
 
+    @property
+    def pacedDiscarded(self) -> int:
+        return self.__pacedDiscarded
+
     def receivedUnreliable(self, byteCount: int):
         self.__unreliableBytesIn += byteCount
         self.__unreliableIn += 1
@@ -198,8 +212,14 @@ class ConnectionMetrics:
     def incrementReliableUniques(self):
         self.__reliableUniques += 1
 
+    def incrementUnreliableDiscarded(self):
+        self.__unreliableDiscarded += 1
+
     def incrementNotifyDiscarded(self):
         self.__notifyDiscarded += 1
 
     def incrementReliableDiscarded(self):
         self.__reliableDiscarded += 1
+
+    def incrementPacedDiscarded(self):
+        self.__pacedDiscarded += 1
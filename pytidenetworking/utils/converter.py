@@ -9,6 +9,8 @@ try:
 except ImportError:
     from typing_extensions import Literal
 
+from .varint import encodeVarULong, decodeVarULong
+
 READABLE_ARRAY = Union[bytes, bytearray, List[int]]
 WRITEABLE_ARRAY = Union[bytearray, List[int]]
 
@@ -22,6 +24,26 @@ BITS_PER_BYTE = 8
 BITS_PER_SEGMENT = 8 * BITS_PER_BYTE
 
 
+#region Struct packers
+
+# Precompiled packers for the fixed width primitives, keyed by byte order. Used by the byte aligned fast path of
+# Message, which packs values straight into the payload via pack_into / unpack_from.
+INT8_STRUCT = {"little": struct.Struct("<b"), "big": struct.Struct(">b")}
+UINT8_STRUCT = {"little": struct.Struct("<B"), "big": struct.Struct(">B")}
+INT16_STRUCT = {"little": struct.Struct("<h"), "big": struct.Struct(">h")}
+UINT16_STRUCT = {"little": struct.Struct("<H"), "big": struct.Struct(">H")}
+INT32_STRUCT = {"little": struct.Struct("<i"), "big": struct.Struct(">i")}
+UINT32_STRUCT = {"little": struct.Struct("<I"), "big": struct.Struct(">I")}
+INT64_STRUCT = {"little": struct.Struct("<q"), "big": struct.Struct(">q")}
+UINT64_STRUCT = {"little": struct.Struct("<Q"), "big": struct.Struct(">Q")}
+
+# Floating point values are always little endian, see fp32_to_bytes / fp64_to_bytes
+FLOAT_STRUCT = struct.Struct(FLOAT_LITTLE)
+DOUBLE_STRUCT = struct.Struct(DOUBLE_LITTLE)
+
+#endregion
+
+
 #region ZigZag Encoding
 
 def zigzagEncode(value: int, bitcount: int):
@@ -182,31 +204,64 @@ def setBits64(bitfield: int, amount: int, array: WRITEABLE_ARRAY, startBit: int)
 
 
 def setBitsFromBytes(bitfield: READABLE_ARRAY, amount: int, array: WRITEABLE_ARRAY, startBit: int):
+    return writeBits(bitfield, amount, array, startBit)
+
+
+def writeBits(value: READABLE_ARRAY, amount: int, array: WRITEABLE_ARRAY, startBit: int):
+    """
+    Writes the first amount bits of value into array, starting at startBit. Bits of array outside the written range are
+    preserved.
+
+    The whole field is shifted into place as a single int and merged into the covering bytes with one slice assignment,
+    so the Python level work does not depend on the size of the field.
+
+    :param value: bytes containing the bits to write
+    :param amount: number of bits to write
+    :param array: array to write the bits to
+    :param startBit: position of the first bit to write in array
+    :return: the array written to
+    """
+    if amount <= 0:
+        return array
+
     pos: int = startBit // BITS_PER_BYTE
     bitoffset: int = startBit % BITS_PER_BYTE
-    byte_count = amount // BITS_PER_BYTE
-    bits_remaining = amount % BITS_PER_BYTE
+    byteCount = (bitoffset + amount + BITS_PER_BYTE - 1) // BITS_PER_BYTE
 
     ensureSpaceAvailable(array, startBit, amount)
 
-    if bitoffset == 0:
-        for i in range(byte_count):
-            array[pos + i] = (bitfield[i]) & 0xff
-    else:
-        for i in range(byte_count):
-            array[pos + i] = ((array[pos + i] & (0xff >> (8 - bitoffset))) | (bitfield[i] << bitoffset)) & 0xff
-            array[pos + i + 1] = ((array[pos + i + 1] & (0xff << bitoffset)) | (bitfield[i] >> (8 - bitoffset))) & 0xff
+    if bitoffset == 0 and amount % BITS_PER_BYTE == 0 and len(value) >= byteCount:
+        array[pos:pos + byteCount] = value[:byteCount]
+        return array
 
-    if bits_remaining != 0:
-        bmask = (1 << bits_remaining) - 1
+    bits = int.from_bytes(value[:(amount + BITS_PER_BYTE - 1) // BITS_PER_BYTE], "little")
+    return writeBitsInt(bits, amount, array, startBit)
 
-        if bits_remaining + bitoffset <= 8:
-            amask = ((0xff >> (8 - bitoffset)) | (0xff << (bitoffset + bits_remaining))) & 0xff
-            array[pos + byte_count] = ((array[pos + byte_count] & amask) | ((bitfield[byte_count] & bmask) << bitoffset)) & 0xff
-        else:
-            array[pos + byte_count] = ((array[pos + byte_count] & (0xff >> (8 - bitoffset))) | ((bitfield[byte_count] & bmask) << bitoffset)) & 0xff
-            array[pos + byte_count + 1] = ((array[pos + byte_count + 1] & (0xff << ((bitoffset + bits_remaining) - 8))) | ((bitfield[byte_count] & bmask) >> (8 - bitoffset))) & 0xff
 
+def writeBitsInt(value: int, amount: int, array: WRITEABLE_ARRAY, startBit: int):
+    """
+    Writes the lowest amount bits of the given int into array, starting at startBit. Bits of array outside the written
+    range are preserved.
+
+    :param value: int containing the bits to write
+    :param amount: number of bits to write
+    :param array: array to write the bits to
+    :param startBit: position of the first bit to write in array
+    :return: the array written to
+    """
+    if amount <= 0:
+        return array
+
+    pos: int = startBit // BITS_PER_BYTE
+    bitoffset: int = startBit % BITS_PER_BYTE
+    byteCount = (bitoffset + amount + BITS_PER_BYTE - 1) // BITS_PER_BYTE
+
+    ensureSpaceAvailable(array, startBit, amount)
+
+    mask = ((1 << amount) - 1) << bitoffset
+    current = int.from_bytes(array[pos:pos + byteCount], "little")
+    merged = (current & ~mask) | ((value << bitoffset) & mask)
+    array[pos:pos + byteCount] = merged.to_bytes(byteCount, "little")
     return array
 
 
@@ -248,16 +303,52 @@ def getBits(amount: int, array: READABLE_ARRAY, startBit: int) -> int:
 
 
 def getBitsToBytes(array: READABLE_ARRAY, count: int, startBit: int) -> READABLE_ARRAY:
+    """
+    :param array: array to read bits from
+    :param count: bit count IN BITS
+    :param startBit: Start bit in BITS
+    :return: the requested bits, shifted to start at bit 0
+    """
+    return readBits(array, count, startBit)
+
+
+def readBits(array: READABLE_ARRAY, amount: int, startBit: int) -> bytes:
+    """
+    Reads amount bits from array, starting at startBit. The covering bytes are read as a single int and shifted into
+    place at once, so the Python level work does not depend on the size of the field.
+
+    Bits past amount in the last returned byte are not cleared.
+
+    :param array: array to read bits from
+    :param amount: number of bits to read
+    :param startBit: position of the first bit to read in array
+    :return: ceil(amount / 8) bytes containing the requested bits
+    """
     pos: int = startBit // BITS_PER_BYTE
     bit: int = startBit % BITS_PER_BYTE
+    byteCount = (amount + BITS_PER_BYTE - 1) // BITS_PER_BYTE
 
     if bit == 0:
-        return array[pos:pos+count]
-    else:
-        val = []
-        for i in range(count):
-            val.append(((array[i] >> bit) | (array[i+1] << (8 - bit)))&0xff)
-        return bytes(val)
+        return bytes(array[pos:pos + byteCount])
+
+    bits = int.from_bytes(array[pos:pos + byteCount + 1], "little") >> bit
+    return (bits & ((1 << (byteCount * BITS_PER_BYTE)) - 1)).to_bytes(byteCount, "little")
+
+
+def readBitsInt(array: READABLE_ARRAY, amount: int, startBit: int) -> int:
+    """
+    Reads amount bits from array, starting at startBit
+
+    :param array: array to read bits from
+    :param amount: number of bits to read
+    :param startBit: position of the first bit to read in array
+    :return: the requested bits as int
+    """
+    pos: int = startBit // BITS_PER_BYTE
+    bit: int = startBit % BITS_PER_BYTE
+    byteCount = (bit + amount + BITS_PER_BYTE - 1) // BITS_PER_BYTE
+
+    return (int.from_bytes(array[pos:pos + byteCount], "little") >> bit) & ((1 << amount) - 1)
 #endregion
 
 
@@ -283,7 +374,9 @@ def byteFromBits(array: READABLE_ARRAY, startBit: int, byteorder: Literal['big',
         return val
 
     val >>= bit
-    return val | array[pos+1] << (8 - bit)
+    if pos + 1 < len(array):
+        val |= (array[pos + 1] << (8 - bit)) & 0xff
+    return val
 
 #endregion
 
@@ -395,26 +488,7 @@ def ulongFromBits(array: READABLE_ARRAY, startBit: int):
 
 #region bytes
 def bytesToBits(value: READABLE_ARRAY, array: WRITEABLE_ARRAY, startBit: int):
-    pos: int = startBit // BITS_PER_BYTE
-    bitoffset: int = startBit % BITS_PER_BYTE
-    byte_count = len(value)
-
-    if bitoffset == 0:
-        for i in range(byte_count):
-            array[pos + i] = (value[i]) & 0xff
-    else:
-        for i in range(byte_count):
-            array[pos + i] = ((array[pos + i] & (0xff >> (8 - bitoffset))) | (value[i] << bitoffset)) & 0xff
-            array[pos + i + 1] = ((array[pos + i + 1] & (0xff << bitoffset)) | (value[i] >> (8 - bitoffset))) & 0xff
-
-    #if bit == 0:
-    #    for i in range(bcount):
-    #        array[pos + i] = (value[i]) & 0xff
-    #else:
-    #    for i in range(bcount):
-    #        array[pos + i] = (((value[i] << bit) & (0xff << bit)) | (array[pos + i] & (0xff  >> (8 - bit)))) & 0xff
-    #        array[pos + i + 1] = (((value[i] >> (8 - bit)) & (0xff >> (8 - bit))) | (array[pos + i + 1] & (0xff << bit))) & 0xff
-    return array
+    return writeBits(value, len(value) * BITS_PER_BYTE, array, startBit)
 
 
 def bytesFromBits(array: READABLE_ARRAY, count: int, startBit: int) -> READABLE_ARRAY:
@@ -423,29 +497,14 @@ def bytesFromBits(array: READABLE_ARRAY, count: int, startBit: int) -> READABLE_
     :param count: bit count IN BITS
     :param startBit: Start bit in BITS
     """
-    pos: int = startBit // BITS_PER_BYTE
-    bit: int = startBit % BITS_PER_BYTE
-    byteCount = int(ceil(float(count) / BITS_PER_BYTE))
-
-    if bit == 0:
-        return array[pos:pos+byteCount]
-    else:
-        val = []
-        for i in range(byteCount - 1):
-            val.append((array[pos + i] >> bit) | (array[pos + i + 1] << (8 - bit)) & 0xff)
-        if len(array) > pos + byteCount:
-            val.append((array[pos + byteCount - 1] >> bit) | (array[pos + byteCount] << (8 - bit)) & 0xff)
-        else:
-            val.append((array[pos + byteCount - 1] >> bit) & 0xff)
-
-        return bytes(val)
+    return readBits(array, count, startBit)
 #endregion
 
 #endregion
 
 #region VarLen
 
-def toVarLong(value: int) -> WRITEABLE_ARRAY:
+def toVarLong(value: int) -> bytes:
     return toVarULong(zigzagEncode64(value))
 
 
@@ -454,38 +513,25 @@ def fromVarLong(data: READABLE_ARRAY, pos: int = 0):
     return zigzagDecode(r), c
 
 
-def toVarULong(value: int) -> WRITEABLE_ARRAY:
-    if value < 0:
-        raise Exception("Value MUST be positive. Use ZigZag encoding for negative values")
-
-    tmp_data = []
+def toVarULong(value: int) -> bytes:
+    """
+    Encodes the given value as varint, see varint.encodeVarULong
 
-    while True:
-        byte_val = value & 0b_0111_1111
-        value >>= 7
-        if value != 0:
-            byte_val |= 0b1000_0000
-            tmp_data.append(byte_val)
-        else:
-            tmp_data.append(byte_val)
-            break
-    return tmp_data
+    :param value: Value to encode, must not be negative
+    :return: the encoded bytes
+    """
+    return encodeVarULong(value)
 
 
 def fromVarULong(data: READABLE_ARRAY, pos: int = 0):
-    shift = 0
-    val = 0
-    bytes_read = 0
-    while True:
-
-        byte_val = byteFromBits(data, pos + (bytes_read * BITS_PER_BYTE))
-        val |= (byte_val & 0b0111_1111) << shift
-        bytes_read += 1
-        shift += 7
-
-        if (byte_val & 0b1000_0000) == 0:
-            break
-    return val, bytes_read*BITS_PER_BYTE
+    """
+    Decodes the varint at the given bit position, see varint.decodeVarULong
+
+    :param data: array to read from
+    :param pos: in bits: position of the varint within data
+    :return: the decoded value and the number of bits read
+    """
+    return decodeVarULong(data, pos)
 
 #endregion
 
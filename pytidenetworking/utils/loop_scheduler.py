@@ -0,0 +1,120 @@
+import asyncio
+from typing import Callable, Optional, Set, TYPE_CHECKING
+
+from pytidenetworking.utils.delayed_events import DelayedEvent
+from pytidenetworking.utils.timing_wheel import TimerHandle
+
+if TYPE_CHECKING:
+    from pytidenetworking.peer import Peer
+
+
+class LoopTimerHandle(TimerHandle):
+    """
+    Handle of a delayed event scheduled on an asyncio event loop
+    """
+
+    def __init__(self, deadline: int, callback: Callable[[], None], timers: Set["LoopTimerHandle"]):
+        """
+        Constructor
+
+        :param deadline: peer time (in milliseconds) at which the event is due
+        :param callback: the event
+        :param timers: the scheduled timers of the peer, the handle removes itself once cancelled
+        """
+        super(LoopTimerHandle, self).__init__(deadline, callback)
+        self.loopHandle: Optional[asyncio.TimerHandle] = None
+        """
+        The handle of the event loop's timer
+        """
+        self.__timers: Set[LoopTimerHandle] = timers
+
+    def cancel(self):
+        """
+        Cancels the timer. Does nothing if it already fired or was cancelled.
+        """
+        if self.loopHandle is not None:
+            self.loopHandle.cancel()
+            self.loopHandle = None
+        self.__timers.discard(self)
+        super(LoopTimerHandle, self).cancel()
+
+
+class LoopScheduler:
+    """
+    Drives a peer from an asyncio event loop instead of update() calls: delayed events are scheduled as timers of the
+    loop, and received messages are handled as soon as the loop is idle, so all messages received within the same
+    iteration of the loop are handled (and batched) together.
+
+    Must be used from within the event loop's thread.
+    """
+
+    def __init__(self, peer: "Peer"):
+        """
+        Constructor
+
+        :param peer: the peer to drive
+        """
+        self.__peer: "Peer" = peer
+        self.__timers: Set[LoopTimerHandle] = set()
+        self.__updateHandle: Optional[asyncio.Handle] = None
+
+    def executeLater(self, delay: int, event: DelayedEvent) -> TimerHandle:
+        """
+        Schedules a delayed event on the running event loop
+
+        :param delay: How long from now to execute the delayed event, in milliseconds.
+        :param event: The delayed event to execute later
+        :return: a handle which can be used to cancel the event
+        """
+        event.priority = delay + self.__peer.current_time
+        timer = LoopTimerHandle(event.priority, event, self.__timers)
+        # One millisecond later, as the peer runs events once their time has passed
+        timer.loopHandle = asyncio.get_event_loop().call_later((delay + 1) / 1000, self.__fire, timer)
+        self.__timers.add(timer)
+        return timer
+
+    def __fire(self, timer: LoopTimerHandle):
+        """
+        Executes the event of a timer
+        """
+        self.__timers.discard(timer)
+        event = timer.callback
+        timer.callback = None
+        timer.loopHandle = None
+        if event is not None:
+            self.__peer._updateTime()
+            event()
+
+    def scheduleUpdate(self):
+        """
+        Makes sure the received messages are handled once the event loop is idle
+        :return:
+        """
+        if self.__updateHandle is None:
+            self.__updateHandle = asyncio.get_event_loop().call_soon(self.__update)
+
+    def __update(self):
+        """
+        Handles the received messages
+        """
+        self.__updateHandle = None
+        peer = self.__peer
+        peer._updateTime()
+        peer._endOfUpdate()
+        if len(peer.messageQueue) > 0:
+            # Budget of this update used up (see Peer.maxMessagesPerUpdate), continue in the next iteration
+            self.scheduleUpdate()
+
+    def cancelAll(self):
+        """
+        Cancels all scheduled events and the pending update
+        :return:
+        """
+        for timer in list(self.__timers):
+            timer.cancel()
+        if self.__updateHandle is not None:
+            self.__updateHandle.cancel()
+            self.__updateHandle = None
+
+    def __len__(self):
+        return len(self.__timers)
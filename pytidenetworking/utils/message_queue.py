@@ -0,0 +1,107 @@
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Optional, Tuple, Union
+
+from pytidenetworking.message_base import MessageHeader
+
+if TYPE_CHECKING:
+    from pytidenetworking.connection import Connection
+    from pytidenetworking.message import Message
+
+QueuedMessage = Tuple["Message", Union[MessageHeader, int], "Connection"]
+
+
+class MessageQueue:
+    """
+    Queue of received messages waiting to be handled. Unreliable, reliable and internal messages are kept in a deque
+    each, and every message is tagged with its arrival index, so the queue hands out messages in the order they were
+    received while the oldest message of a given kind can be dropped in constant time.
+    """
+
+    def __init__(self):
+        self.__internal: Deque[Tuple[int, QueuedMessage]] = deque()
+        self.__queues: Dict[int, Deque[Tuple[int, QueuedMessage]]] = {
+            MessageHeader.Unreliable: deque(),
+            MessageHeader.Reliable: deque()
+        }
+        """
+        Queued user messages for each header, all other headers are queued in __internal
+        """
+        self.__nextIndex: int = 0
+        self.__length: int = 0
+
+    def __len__(self):
+        return self.__length
+
+    def __queueFor(self, header: Union[MessageHeader, int]) -> Deque[Tuple[int, QueuedMessage]]:
+        return self.__queues.get(header, self.__internal)
+
+    def count(self, header: Union[MessageHeader, int]) -> int:
+        """
+        :param header: header of a user message, any other header counts all queued internal messages
+        :return: the number of queued messages with the given header
+        """
+        return len(self.__queueFor(header))
+
+    def append(self, message: "Message", header: Union[MessageHeader, int], connection: "Connection"):
+        """
+        Queues a received message
+
+        :param message: The received message
+        :param header: The message's header type
+        :param connection: The connection which the message was received on
+        """
+        self.__queueFor(header).append((self.__nextIndex, (message, header, connection)))
+        self.__nextIndex += 1
+        self.__length += 1
+
+    def popleft(self) -> QueuedMessage:
+        """
+        Removes the oldest queued message
+
+        :return: the message, its header and the connection it was received on
+        """
+        oldest: Optional[Deque[Tuple[int, QueuedMessage]]] = None
+        for queue in (self.__internal, self.__queues[MessageHeader.Unreliable], self.__queues[MessageHeader.Reliable]):
+            if len(queue) > 0 and (oldest is None or queue[0][0] < oldest[0][0]):
+                oldest = queue
+        if oldest is None:
+            raise IndexError("pop from an empty queue")
+        self.__length -= 1
+        return oldest.popleft()[1]
+
+    def pop(self) -> QueuedMessage:
+        """
+        Removes the latest queued message
+
+        :return: the message, its header and the connection it was received on
+        """
+        latest: Optional[Deque[Tuple[int, QueuedMessage]]] = None
+        for queue in (self.__internal, self.__queues[MessageHeader.Unreliable], self.__queues[MessageHeader.Reliable]):
+            if len(queue) > 0 and (latest is None or queue[-1][0] > latest[-1][0]):
+                latest = queue
+        if latest is None:
+            raise IndexError("pop from an empty queue")
+        self.__length -= 1
+        return latest.pop()[1]
+
+    def popOldest(self, header: Union[MessageHeader, int]) -> Optional[QueuedMessage]:
+        """
+        Removes the oldest queued message with the given header
+
+        :param header: header of a user message, any other header removes the oldest internal message
+        :return: the message, its header and the connection it was received on, None if no such message is queued
+        """
+        queue = self.__queueFor(header)
+        if len(queue) == 0:
+            return None
+        self.__length -= 1
+        return queue.popleft()[1]
+
+    def clear(self):
+        """
+        Removes all queued messages, without releasing them
+        """
+        self.__internal.clear()
+        for queue in self.__queues.values():
+            queue.clear()
+        self.__length = 0
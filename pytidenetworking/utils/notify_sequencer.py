@@ -18,7 +18,7 @@ class NotifySequencer(Sequencer):
 
     def insertHeader(self, message: MessageBase) -> int:
         sequenceID = self.nextSequenceID
-        notify_bits = self._lastReceivedSeqId | (self.receivedSeqIds.first8 << (2 * BITS_PER_BYTE)) | (sequenceID << (3 * BITS_PER_BYTE))
+        notify_bits = self.lastReceivedSeqId | (self.receivedSeqIds.first8 << (2 * BITS_PER_BYTE)) | (sequenceID << (3 * BITS_PER_BYTE))
         message.setNotifyBits(notify_bits)
         return sequenceID
 
@@ -26,8 +26,8 @@ class NotifySequencer(Sequencer):
         sequenceGap = getSequenceGap(sequenceID, self.lastReceivedSeqId)
 
         if sequenceGap > 0:
-            self.receivedSeqIds <<= sequenceGap
-            self._lastReceivedSeqId = sequenceID
+            self.receivedSeqIds.shift(sequenceGap)
+            self.lastReceivedSeqId = sequenceID
 
             if self.receivedSeqIds.isSet(sequenceGap):
                 return False
@@ -37,26 +37,26 @@ class NotifySequencer(Sequencer):
         return False
 
     def updateReceivedAcks(self, remoteLastReceivedSeqId: int, remoteReceivedSeqIds: int):
-        sequenceGap = getSequenceGap(remoteLastReceivedSeqId, self._lastReceivedSeqId)
+        sequenceGap = getSequenceGap(remoteLastReceivedSeqId, self.lastAckedSeqId)
 
         if sequenceGap > 0:
             if sequenceGap > 1:
                 # handle messages in the gap
                 while sequenceGap > 9:
-                    self.lastAckedSeqId += 1
+                    self.lastAckedSeqId = (self.lastAckedSeqId + 1) & 0xffff
                     sequenceGap -= 1
-                    self.connection.notifyLost(self.lastAckedSeqId)
+                    self.connection.onNotifyLost(self.lastAckedSeqId)
 
                 bitCount = sequenceGap -1
                 bit = 1 << bitCount
 
                 for i in range(bitCount):
-                    self.lastAckedSeqId += 1
+                    self.lastAckedSeqId = (self.lastAckedSeqId + 1) & 0xffff
                     bit >>= 1
                     if remoteReceivedSeqIds & bit == 0:
                         self.connection.onNotifyLost(self.lastAckedSeqId)
                     else:
                         self.connection.onNotifyDelivered(self.lastAckedSeqId)
 
-            self._lastAckedSeqId = remoteLastReceivedSeqId
-            self.connection.onNotifyDelivered(self._lastAckedSeqId)
+            self.lastAckedSeqId = remoteLastReceivedSeqId
+            self.connection.onNotifyDelivered(self.lastAckedSeqId)
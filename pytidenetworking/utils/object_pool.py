@@ -1,19 +1,121 @@
-from typing import TypeVar, Generic, List
+from collections import deque
+from threading import Lock, local
+from time import monotonic
+from typing import TypeVar, Generic, List, Deque
+from weakref import finalize
 
 T = TypeVar('T')
 
+DEFAULT_MAX_SIZE = 1024
+"""
+Default ceiling the capacity of a pool may grow to
+"""
+DEFAULT_IDLE_TIME = 10.0
+"""
+Default time in seconds after which a pool shrinks back to the number of objects it actually needed
+"""
+DEFAULT_LOCAL_SIZE = 16
+"""
+Default capacity of the per-thread free lists
+"""
+IDLE_CHECK_INTERVAL = 64
+"""
+Number of releases between checks whether the pool has been idle for long enough to shrink
+"""
+
+
+class PoolCounters:
+    """
+    Usage counters of an object pool (or of one thread of a thread-local object pool)
+    """
+
+    def __init__(self):
+        self.hits: int = 0
+        """
+        Number of acquired objects taken from the pool
+        """
+        self.misses: int = 0
+        """
+        Number of acquired objects which had to be created
+        """
+        self.acquired: int = 0
+        """
+        Number of objects acquired
+        """
+        self.released: int = 0
+        """
+        Number of objects released
+        """
+        self.discarded: int = 0
+        """
+        Number of released objects dropped because the pool was full
+        """
+        self.objects: List = []
+        """
+        Free objects held for reuse
+        """
+
+
+class _ThreadOwner:
+    """
+    Kept in the local storage of a thread using a thread-local pool, collected once the thread exits
+    """
+    __slots__ = ("__weakref__",)
+
+
 class ObjectPool(Generic[T]):
     """
     Generic Object Pool
+
+    The capacity of the pool grows with the number of objects in use at the same time, up to maxSize, and shrinks back
+    (but not below the initial size) once fewer objects were needed for idleTime seconds.
+
+    All operations are thread safe. If threadLocal is set, each thread additionally keeps a small free list of its own,
+    which is used without locking, so objects can be created and released off the update thread without contention.
+    The counters and free list of a thread are merged into the shared ones once the thread exits.
     """
 
-    def __init__(self, size: int):
+    def __init__(self, size: int, maxSize: int = DEFAULT_MAX_SIZE, idleTime: float = DEFAULT_IDLE_TIME,
+                 threadLocal: bool = False, localSize: int = DEFAULT_LOCAL_SIZE):
         """
         Initializes the object pool
-        :param size: Size of the pool
+        :param size: Initial (and minimal) size of the pool
+        :param maxSize: Maximal size the pool may grow to
+        :param idleTime: Time in seconds after which the pool shrinks to the number of objects used in that time
+        :param threadLocal: if True, use a free list per thread in front of the shared pool
+        :param localSize: Size of the per-thread free lists
         """
+        self.minSize: int = size
+        self.maxSize: int = max(size, maxSize)
         self.size: int = size
-        self.data: List[T] = []
+        """
+        Current capacity of the pool
+        """
+        self.idleTime: float = idleTime
+        self.threadLocal: bool = threadLocal
+        """
+        If True, each thread keeps a free list of up to localSize objects, which is used without locking. May be
+        changed at any time.
+        """
+        self.localSize: int = localSize
+
+        self.__shared: PoolCounters = PoolCounters()
+        self.data: List[T] = self.__shared.objects
+
+        self.highWaterMark: int = 0
+        """
+        Maximal number of objects in use at the same time, since the pool last shrunk
+        """
+        self.__periodStart: float = monotonic()
+        self.__releasesUntilCheck: int = IDLE_CHECK_INTERVAL
+
+        self.__lock: Lock = Lock()
+        self.__local: local = local()
+        self.__threadCounters: List[PoolCounters] = []
+        self.__retiredCounters: Deque[PoolCounters] = deque()
+        """
+        Counters of exited threads, merged into the shared counters on the next locked operation
+        """
 
     def createObject(self) -> T:
         """
@@ -28,10 +130,36 @@ class ObjectPool(Generic[T]):
 
         :return: the object available for use
         """
-        if len(self.data) > 0:
-            return self.data.pop()
+        if self.threadLocal:
+            counters = self.__localCounters()
+            counters.acquired += 1
+            if counters.objects:
+                try:
+                    obj = counters.objects.pop()
+                    counters.hits += 1
+                    return obj
+                except IndexError:
+                    # cleared by another thread
+                    pass
         else:
-            return self.createObject()
+            counters = self.__shared
+
+        with self.__lock:
+            if self.__retiredCounters:
+                self.__mergeRetired()
+            if counters is self.__shared:
+                counters.acquired += 1
+            inUse = self.__countInUse()
+            if inUse > self.highWaterMark:
+                self.highWaterMark = inUse
+                if inUse > self.size:
+                    self.size = min(self.maxSize, inUse)
+
+            if self.data:
+                counters.hits += 1
+                return self.data.pop()
+            counters.misses += 1
+        return self.createObject()
 
     def release(self, object: T):
         """
@@ -39,15 +167,154 @@ class ObjectPool(Generic[T]):
         :param object: Object to return
         :return:
         """
-        if len(self.data) < self.size:
-            self.data.append(object)
+        if self.threadLocal:
+            counters = self.__localCounters()
+            counters.released += 1
+            if len(counters.objects) < self.localSize:
+                counters.objects.append(object)
+                return
         else:
-            del object
+            counters = self.__shared
+
+        with self.__lock:
+            if self.__retiredCounters:
+                self.__mergeRetired()
+            if counters is self.__shared:
+                counters.released += 1
+
+            self.__releasesUntilCheck -= 1
+            if self.__releasesUntilCheck <= 0:
+                # Looking at the clock on every release is noticeably slower than the release itself
+                self.__releasesUntilCheck = IDLE_CHECK_INTERVAL
+                now = monotonic()
+                if now - self.__periodStart >= self.idleTime:
+                    self.__shrink(now)
+
+            if len(self.data) < self.size:
+                self.data.append(object)
+            else:
+                counters.discarded += 1
+
+    def trim(self):
+        """
+        Shrinks the pool to the number of objects needed since it last shrunk, and starts a new idle period
+        :return:
+        """
+        with self.__lock:
+            if self.__retiredCounters:
+                self.__mergeRetired()
+            self.__shrink(monotonic())
+
+    def __shrink(self, now: float):
+        """
+        Shrinks the pool to its high water mark. Must be called with the lock held.
+
+        :param now: current time
+        """
+        self.size = max(self.minSize, min(self.maxSize, self.highWaterMark))
+        del self.data[self.size:]
+        self.highWaterMark = self.__countInUse()
+        self.__periodStart = now
+
+    def __countInUse(self) -> int:
+        """
+        Counts the objects acquired and not yet released, on all threads. Must be called with the lock held.
+
+        :return: the number of objects in use
+        """
+        shared = self.__shared
+        inUse = shared.acquired - shared.released
+        for counters in self.__threadCounters:
+            inUse += counters.acquired - counters.released
+        return inUse
+
+    def __localCounters(self) -> PoolCounters:
+        """
+        :return: the counters and free list of the current thread
+        """
+        counters = getattr(self.__local, "counters", None)
+        if counters is None:
+            counters = PoolCounters()
+            owner = _ThreadOwner()
+            self.__local.counters = counters
+            self.__local.owner = owner
+            # The local storage is dropped once the thread exits. Merging right away could run while another thread
+            # holds the lock, so the counters are only queued here.
+            finalize(owner, self.__retiredCounters.append, counters)
+            with self.__lock:
+                self.__threadCounters.append(counters)
+        return counters
+
+    def __mergeRetired(self):
+        """
+        Merges the counters of exited threads into the shared counters, and takes over their free objects as far as
+        there is room. Must be called with the lock held.
+        """
+        shared = self.__shared
+        while self.__retiredCounters:
+            counters = self.__retiredCounters.popleft()
+            self.__threadCounters.remove(counters)
+            shared.hits += counters.hits
+            shared.misses += counters.misses
+            shared.acquired += counters.acquired
+            shared.released += counters.released
+            shared.discarded += counters.discarded
+            for obj in counters.objects:
+                if len(self.data) < self.size:
+                    self.data.append(obj)
+                else:
+                    shared.discarded += 1
+            counters.objects.clear()
+
+    def __allCounters(self) -> List[PoolCounters]:
+        with self.__lock:
+            if self.__retiredCounters:
+                self.__mergeRetired()
+            return [self.__shared] + self.__threadCounters
+
+    @property
+    def hits(self) -> int:
+        """
+        :return: the number of acquired objects taken from the pool
+        """
+        return sum(counters.hits for counters in self.__allCounters())
+
+    @property
+    def misses(self) -> int:
+        """
+        :return: the number of acquired objects which had to be created
+        """
+        return sum(counters.misses for counters in self.__allCounters())
+
+    @property
+    def discarded(self) -> int:
+        """
+        :return: the number of released objects dropped because the pool was full
+        """
+        return sum(counters.discarded for counters in self.__allCounters())
+
+    @property
+    def outstanding(self) -> int:
+        """
+        :return: the number of objects acquired and not yet released
+        """
+        allCounters = self.__allCounters()
+        return sum(counters.acquired for counters in allCounters) - sum(counters.released for counters in allCounters)
+
+    @property
+    def available(self) -> int:
+        """
+        :return: the number of free objects held by the pool, including the per-thread free lists
+        """
+        return sum(len(counters.objects) for counters in self.__allCounters())
 
     def clearPool(self):
         """
         Clears all objects from the pool
         :return:
         """
-        while len(self.data) > 0:
-            del self.data[-1]
\ No newline at end of file
+        with self.__lock:
+            if self.__retiredCounters:
+                self.__mergeRetired()
+            for counters in [self.__shared] + self.__threadCounters:
+                counters.objects.clear()
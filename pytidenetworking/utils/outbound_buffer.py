@@ -0,0 +1,90 @@
+from typing import Iterator, List, Tuple, Union
+
+from pytidenetworking.utils.slab_allocator import SlabAllocator, SlabBuffer
+
+OUTBOUND_SLOT_SIZE = 16 * 1024
+"""
+Size of the pooled buffers queued messages are staged in, larger messages get a buffer of their own
+"""
+OUTBOUND_SLOTS_PER_SLAB = 8
+"""
+Number of staging buffers allocated at once
+"""
+
+
+class OutboundBuffer:
+    """
+    Messages queued on a connection, staged back to back in pooled buffers. Every message is preceded by prefixSize
+    bytes left for the transport's framing (e.g. the length prefix of TCP), so transports sending several messages at
+    once hand over the staged bytes as they are, instead of copying every message again.
+    """
+
+    def __init__(self, allocator: SlabAllocator, prefixSize: int = 0):
+        """
+        Constructor
+
+        :param allocator: allocator the staging buffers are taken from
+        :param prefixSize: number of bytes reserved in front of every message
+        """
+        self.__allocator: SlabAllocator = allocator
+        self.prefixSize: int = prefixSize
+        self.__buffers: List[SlabBuffer] = []
+        self.__used: List[int] = []
+        """
+        Number of bytes staged in each buffer
+        """
+        self.__frames: List[Tuple[int, int, int]] = []
+        """
+        Buffer index, position (behind the prefix) and size of each staged message, oldest first
+        """
+
+    def __len__(self):
+        return len(self.__frames)
+
+    def add(self, dataBuffer: Union[bytes, bytearray, memoryview, List[int]], amount: int) -> Tuple[memoryview, int]:
+        """
+        Stages a message behind the ones added before
+
+        :param dataBuffer: The buffer containing the message
+        :param amount: The number of bytes in the buffer which should be sent
+        :return: the staging buffer and the position of the prefix reserved in front of the message
+        """
+        size = self.prefixSize + amount
+        if len(self.__buffers) == 0 or self.__used[-1] + size > len(self.__buffers[-1]):
+            self.__buffers.append(self.__allocator.allocate(size))
+            self.__used.append(0)
+        index = len(self.__buffers) - 1
+        view = self.__buffers[index].view
+        position = self.__used[index]
+        start = position + self.prefixSize
+        view[start:start + amount] = dataBuffer[:amount] if not isinstance(dataBuffer, list) \
+            else bytes(dataBuffer[:amount])
+        self.__used[index] = start + amount
+        self.__frames.append((index, start, amount))
+        return view, position
+
+    def frames(self) -> Iterator[memoryview]:
+        """
+        Iterates over the staged messages, without their prefixes. The views are only valid until clear() is called.
+        """
+        buffers = self.__buffers
+        for index, start, amount in self.__frames:
+            yield buffers[index].view[start:start + amount]
+
+    def chunks(self) -> Iterator[memoryview]:
+        """
+        Iterates over the staged bytes, prefixes included, one view per staging buffer. The views are only valid until
+        clear() is called.
+        """
+        for buffer, used in zip(self.__buffers, self.__used):
+            yield buffer.view[:used]
+
+    def clear(self):
+        """
+        Drops the staged messages and returns the staging buffers to their allocator
+        """
+        for buffer in self.__buffers:
+            buffer.release()
+        self.__buffers.clear()
+        self.__used.clear()
+        self.__frames.clear()
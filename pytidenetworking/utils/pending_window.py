@@ -0,0 +1,141 @@
+from typing import TYPE_CHECKING, Iterator, List, Optional
+
+from pytidenetworking.utils.exceptions import ArgumentOutOfRangeException
+
+if TYPE_CHECKING:
+    from pytidenetworking.pending_message import PendingMessage
+
+PENDING_WINDOW_SIZE = 1024
+"""
+Default number of consecutive sequence IDs a connection keeps pending messages for, has to be a power of two
+"""
+
+
+class PendingWindow:
+    """
+    Ring of the pending messages of a connection, indexed by sequence ID. As sequence IDs are assigned in order, the
+    pending messages form a window from the oldest pending sequence ID to the latest one, which is full once it spans
+    as many sequence IDs as there are slots.
+    """
+
+    def __init__(self, size: int = PENDING_WINDOW_SIZE):
+        """
+        Constructor
+
+        :param size: number of slots, has to be a power of two no larger than the range of sequence IDs
+        """
+        if size <= 0 or size & (size - 1) != 0 or size > 1 << 16:
+            raise ArgumentOutOfRangeException()
+        self.__slots: List[Optional["PendingMessage"]] = [None] * size
+        self.__mask: int = size - 1
+        self.__oldest: int = 0
+        """
+        Sequence ID of the oldest pending message
+        """
+        self.__span: int = 0
+        """
+        Number of sequence IDs from the oldest to the latest pending message
+        """
+        self.__count: int = 0
+
+    def __len__(self):
+        return self.__count
+
+    @property
+    def isFull(self) -> bool:
+        """
+        :return: True if no message can be added until the oldest pending message is removed
+        """
+        return self.__span > self.__mask
+
+    @property
+    def oldest(self) -> Optional["PendingMessage"]:
+        """
+        :return: the pending message with the oldest sequence ID, None if no message is pending
+        """
+        if self.__count == 0:
+            return None
+        return self.__slots[self.__oldest & self.__mask]
+
+    def canAdd(self, sequenceID: int) -> bool:
+        """
+        :param sequenceID: sequence ID following the ones added before
+        :return: True if a message with the given sequence ID fits into the window
+        """
+        return self.__count == 0 or ((sequenceID - self.__oldest) & 0xffff) <= self.__mask
+
+    def add(self, sequenceID: int, pendingMessage: "PendingMessage"):
+        """
+        Adds a pending message, its sequence ID has to follow the ones added before
+
+        :param sequenceID: sequence ID of the message
+        :param pendingMessage: the pending message
+        :return:
+        """
+        if self.__count == 0:
+            self.__oldest = sequenceID
+            span = 1
+        else:
+            span = max(self.__span, ((sequenceID - self.__oldest) & 0xffff) + 1)
+        if span > self.__mask + 1 or self.__slots[sequenceID & self.__mask] is not None:
+            raise ArgumentOutOfRangeException()
+        self.__slots[sequenceID & self.__mask] = pendingMessage
+        self.__span = span
+        self.__count += 1
+
+    def get(self, sequenceID: int) -> Optional["PendingMessage"]:
+        """
+        :param sequenceID: sequence ID of the message
+        :return: the pending message with the given sequence ID, None if there is none
+        """
+        if ((sequenceID - self.__oldest) & 0xffff) >= self.__span:
+            return None
+        return self.__slots[sequenceID & self.__mask]
+
+    def remove(self, sequenceID: int) -> Optional["PendingMessage"]:
+        """
+        Removes the pending message with the given sequence ID
+
+        :param sequenceID: sequence ID of the message
+        :return: the removed message, None if there is none
+        """
+        pendingMessage = self.get(sequenceID)
+        if pendingMessage is None:
+            return None
+        slots = self.__slots
+        mask = self.__mask
+        slots[sequenceID & mask] = None
+        self.__count -= 1
+        if self.__count == 0:
+            self.__span = 0
+        elif sequenceID == self.__oldest:
+            # Moves on to the next pending message
+            while slots[self.__oldest & mask] is None:
+                self.__oldest = (self.__oldest + 1) & 0xffff
+                self.__span -= 1
+        return pendingMessage
+
+    def __iter__(self) -> Iterator["PendingMessage"]:
+        """
+        Iterates over the pending messages in sequence order, oldest first
+        """
+        slots = self.__slots
+        mask = self.__mask
+        for offset in range(self.__span):
+            pendingMessage = slots[(self.__oldest + offset) & mask]
+            if pendingMessage is not None:
+                yield pendingMessage
+
+    def clear(self) -> List["PendingMessage"]:
+        """
+        Removes all pending messages
+
+        :return: the removed messages, in sequence order
+        """
+        pendingMessages = list(self)
+        mask = self.__mask
+        for offset in range(self.__span):
+            self.__slots[(self.__oldest + offset) & mask] = None
+        self.__span = 0
+        self.__count = 0
+        return pendingMessages
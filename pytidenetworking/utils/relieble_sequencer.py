@@ -1,9 +1,10 @@
 # Updated to 2.1.0
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from .helper import getSequenceGap
 from .logengine import getLogger
+from .sequence_window import WINDOW_SIZE, WINDOW_MASK, setBits
 from .sequencer import Sequencer
 
 if TYPE_CHECKING:
@@ -11,53 +12,93 @@ if TYPE_CHECKING:
 
 logger = getLogger("pytide.reliable_sequencer")
 
+ACK_WINDOW = 16
+"""
+Number of sequence IDs before the last received one which an ack acknowledges in its bitfield
+"""
+
 class ReliableSequencer(Sequencer):
 
     def __init__(self, connection: 'Connection'):
         super(ReliableSequencer, self).__init__(connection)
+        self.__delayedAckSeqId: Optional[int] = None
+        """
+        Oldest received sequence ID whose ack was delayed, None if no ack is delayed
+        """
+
+    @property
+    def hasDelayedAck(self) -> bool:
+        """
+        :return: True if received sequence IDs are waiting to be acknowledged by flushAck()
+        """
+        return self.__delayedAckSeqId is not None
 
     def shouldHandle(self, sequenceID: int):
         doHandle = False
         sequenceGap = getSequenceGap(sequenceID, self.lastReceivedSeqId)
 
+        if sequenceGap > 0 and self.__delayedAckSeqId is not None and \
+                getSequenceGap(sequenceID, self.__delayedAckSeqId) > ACK_WINDOW:
+            # The delayed ack would no longer cover the oldest sequence ID it was delayed for
+            self.flushAck()
+
         if sequenceGap != 0:
             if sequenceGap > 0:
-                if sequenceGap > 64:
+                if sequenceGap > WINDOW_SIZE:
                     logger.warning("The gap between received sequence IDs was very large ({})!".format(sequenceGap))
-                self.receivedSeqIds <<= sequenceGap
+                self.receivedSeqIds.shift(sequenceGap)
                 self.lastReceivedSeqId = sequenceID
             else:
                 sequenceGap = -sequenceGap # ID is older than the previous one
+            # IDs too old for the window count as received already
             doHandle = not self.receivedSeqIds.isSet(sequenceGap)
             self.receivedSeqIds.set(sequenceGap)
 
-        self.connection.sendAck(sequenceID, self.lastReceivedSeqId, self.receivedSeqIds)
+        if not self.connection.delaysAcks or getSequenceGap(self.lastReceivedSeqId, sequenceID) > ACK_WINDOW:
+            self.connection.sendAck(sequenceID, self.lastReceivedSeqId, self.receivedSeqIds)
+        elif self.__delayedAckSeqId is None:
+            self.__delayedAckSeqId = sequenceID
+            self.connection.delayAck()
+        elif getSequenceGap(sequenceID, self.__delayedAckSeqId) < 0:
+            self.__delayedAckSeqId = sequenceID
         return doHandle
 
-    def updateReceivedAcks(self, remoteLastReceivedSeqId: int, remoteReceivedSeqIds: int):
-        sequenceGap = getSequenceGap(remoteLastReceivedSeqId, self.lastReceivedSeqId)
+    def flushAck(self):
+        """
+        Sends a single ack for all sequence IDs received since the last ack was sent, if any
+        :return:
+        """
+        if self.__delayedAckSeqId is None:
+            return
+        self.__delayedAckSeqId = None
+        self.connection.sendAck(self.lastReceivedSeqId, self.lastReceivedSeqId, self.receivedSeqIds)
 
-        if sequenceGap > 0:
-            cap, overflow = self.ackedSeqIds.hasCapacityFor(sequenceGap)
-            if not cap:
-                for i in range(overflow):
-                    check, checkedPosition = self.ackedSeqIds.checkAndTrimLast()
-                    if not check:
-                        self.connection.resendMessage(self.lastReceivedSeqId - checkedPosition)
-                    else:
-                        self.connection.clearMessage(self.lastReceivedSeqId - checkedPosition)
-
-            self.ackedSeqIds <<= sequenceGap
-            self.lastAckedSeqId = remoteLastReceivedSeqId
+    def discardAck(self):
+        """
+        Forgets the delayed ack, if any
+        :return:
+        """
+        self.__delayedAckSeqId = None
 
-            for i in range(16):
-                if not self.ackedSeqIds.isSet(i+1) and remoteReceivedSeqIds & (1 << i) != 0:
-                    self.connection.clearMessage(self.lastAckedSeqId - (i + 1))
+    def updateReceivedAcks(self, remoteLastReceivedSeqId: int, remoteReceivedSeqIds: int):
+        sequenceGap = getSequenceGap(remoteLastReceivedSeqId, self.lastAckedSeqId)
 
-            self.ackedSeqIds.combine(remoteReceivedSeqIds)
+        if sequenceGap > 0:
+            # Messages leaving the window without being acknowledged are resent right away
+            previousAckedSeqId = self.lastAckedSeqId
+            for position in setBits(self.ackedSeqIds.shift(sequenceGap)):
+                self.connection.resendMessage((previousAckedSeqId - position) & 0xffff)
             self.ackedSeqIds.set(sequenceGap)
+            self.lastAckedSeqId = remoteLastReceivedSeqId
             self.connection.clearMessage(remoteLastReceivedSeqId)
-        elif sequenceGap < 0:
-            self.ackedSeqIds.set(-sequenceGap)
+            acked = remoteReceivedSeqIds
         else:
-            self.ackedSeqIds.combine(remoteReceivedSeqIds)
+            # An ack for the latest or an older sequence ID, its bits are relative to that ID
+            offset = -sequenceGap
+            if offset > WINDOW_SIZE:
+                return
+            # The remote's last received ID is at position offset, its bitfield follows
+            acked = ((remoteReceivedSeqIds << 1 | 1) << offset >> 1) & WINDOW_MASK
+
+        for position in setBits(self.ackedSeqIds.combine(acked)):
+            self.connection.clearMessage((self.lastAckedSeqId - position) & 0xffff)
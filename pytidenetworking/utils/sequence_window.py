@@ -0,0 +1,95 @@
+from typing import Iterator
+
+WINDOW_SIZE = 64
+"""
+Number of sequence IDs before the latest one tracked by a SequenceWindow
+"""
+WINDOW_MASK = (1 << WINDOW_SIZE) - 1
+
+
+def setBits(mask: int) -> Iterator[int]:
+    """
+    Iterates over the set bits of a mask, lowest first
+
+    :param mask: the mask
+    :return: the position of each set bit, 1 for the lowest bit of the mask
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length()
+        mask ^= lowest
+
+
+class SequenceWindow:
+    """
+    Fixed size window over the WINDOW_SIZE sequence IDs before the latest one, marking which of them were received or
+    acknowledged. Position 1 is the sequence ID right before the latest one, and maps to the lowest bit of the window.
+    """
+
+    def __init__(self, filled: bool = False):
+        """
+        Constructor
+
+        :param filled: if True, all sequence IDs before the first one start out set
+        """
+        self.__bits: int = WINDOW_MASK if filled else 0
+
+    @property
+    def bits(self) -> int:
+        """
+        :return: the window as mask, the lowest bit is position 1
+        """
+        return self.__bits
+
+    @property
+    def first8(self) -> int:
+        return self.__bits & 0xff
+
+    @property
+    def first16(self) -> int:
+        return self.__bits & 0xffff
+
+    def shift(self, amount: int) -> int:
+        """
+        Moves the window forward, once the latest sequence ID advanced by the given amount. The positions moved into
+        the window start out unset.
+
+        :param amount: the number of sequence IDs the latest one advanced by
+        :return: the unset positions pushed out of the window, as a mask of the window before shifting
+        """
+        if amount >= WINDOW_SIZE:
+            dropped = ~self.__bits & WINDOW_MASK
+            self.__bits = 0
+        else:
+            dropped = ~self.__bits & WINDOW_MASK & ~(WINDOW_MASK >> amount)
+            self.__bits = (self.__bits << amount) & WINDOW_MASK
+        return dropped
+
+    def isSet(self, position: int) -> bool:
+        """
+        :param position: the position to check, 1 for the sequence ID right before the latest one
+        :return: True if the position is set. Positions beyond the window count as set.
+        """
+        if position > WINDOW_SIZE:
+            return True
+        return self.__bits & (1 << (position - 1)) != 0
+
+    def set(self, position: int):
+        """
+        Sets the given position, does nothing for positions beyond the window
+
+        :param position: the position to set, 1 for the sequence ID right before the latest one
+        """
+        if position <= WINDOW_SIZE:
+            self.__bits |= 1 << (position - 1)
+
+    def combine(self, mask: int) -> int:
+        """
+        Sets all positions set in the given mask
+
+        :param mask: the positions to set, the lowest bit is position 1
+        :return: the positions newly set by the mask, which were unset before
+        """
+        added = mask & ~self.__bits & WINDOW_MASK
+        self.__bits |= added
+        return added
@@ -2,7 +2,7 @@
 
 from typing import TYPE_CHECKING
 
-from .bitfield import Bitfield
+from .sequence_window import SequenceWindow
 
 if TYPE_CHECKING:
     from ..connection import Connection
@@ -15,9 +15,10 @@ class Sequencer:
         self.connection = connection
 
         self.lastReceivedSeqId = 0
-        self.receivedSeqIds = Bitfield()
+        self.receivedSeqIds = SequenceWindow()
         self.lastAckedSeqId = 0
-        self.ackedSeqIds = Bitfield()
+        # Sequence IDs before the first one are never sent, so they count as acknowledged
+        self.ackedSeqIds = SequenceWindow(filled=True)
 
     @property
     def nextSequenceID(self):
@@ -25,7 +26,7 @@ class Sequencer:
 
         :return: The next sequence ID to use.
         """
-        self.__nextSequenceId += 1 & 0xffff # Ushort with overflow behaviour
+        self.__nextSequenceId = (self.__nextSequenceId + 1) & 0xffff # Ushort with overflow behaviour
         return self.__nextSequenceId
 
     def shouldHandle(self, sequenceID: int) -> bool:
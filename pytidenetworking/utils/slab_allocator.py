@@ -0,0 +1,152 @@
+from typing import List, Optional
+
+from pytidenetworking.utils.logengine import getLogger
+
+logger = getLogger("pytide.SlabAllocator")
+
+MTU = 1500
+"""
+Default size of a slot, large enough for any datagram sent over a typical link
+"""
+DEFAULT_SLOTS_PER_SLAB = 64
+"""
+Default number of slots allocated at once
+"""
+DEFAULT_MAX_SLABS = 64
+"""
+Default number of slabs an allocator may grow to, further buffers are allocated individually
+"""
+
+
+class SlabBuffer:
+    """
+    A fixed size slot within a slab. Reference counted: returned to its allocator once release() was called for every
+    holder.
+    """
+
+    def __init__(self, allocator: Optional["SlabAllocator"], view: memoryview):
+        """
+        Constructor
+
+        :param allocator: allocator the slot is returned to, None for buffers outside of a slab
+        :param view: view of the slot within its slab
+        """
+        self.view: memoryview = view
+        """
+        Writable view of the whole slot
+        """
+        self.__allocator: Optional[SlabAllocator] = allocator
+        self.__references: int = 0
+
+    def retain(self) -> "SlabBuffer":
+        """
+        Adds a holder to this buffer
+
+        :return: the buffer itself
+        """
+        self.__references += 1
+        return self
+
+    def release(self):
+        """
+        Removes a holder from this buffer, and returns it to its allocator once no holders are left
+        """
+        self.__references -= 1
+        if self.__references == 0 and self.__allocator is not None:
+            self.__allocator.free(self)
+        elif self.__references < 0:
+            logger.warning("Slab buffer released more often than it was retained, ignoring release.")
+            self.__references = 0
+
+    @property
+    def referenceCount(self) -> int:
+        """
+        :return: the number of holders of this buffer
+        """
+        return self.__references
+
+    def __len__(self):
+        return len(self.view)
+
+    def __getitem__(self, item):
+        return self.view[item]
+
+
+class SlabAllocator:
+    """
+    Hands out fixed size buffers carved from large preallocated regions (slabs). Buffers are recycled, so once the
+    allocator has grown to the number of buffers in flight at the same time, no further memory is allocated.
+
+    Not thread safe, each transport uses an allocator of its own.
+    """
+
+    def __init__(self, slotSize: int = MTU, slotsPerSlab: int = DEFAULT_SLOTS_PER_SLAB,
+                 maxSlabs: int = DEFAULT_MAX_SLABS):
+        """
+        Constructor
+
+        :param slotSize: size of a single buffer in bytes
+        :param slotsPerSlab: number of buffers allocated at once
+        :param maxSlabs: number of slabs the allocator may grow to. If all are in use, buffers are allocated
+            individually (and dropped once released), e.g. if messages are never released.
+        """
+        self.slotSize: int = slotSize
+        self.slotsPerSlab: int = slotsPerSlab
+        self.maxSlabs: int = maxSlabs
+
+        self.slabs: List[bytearray] = []
+        self.__free: List[SlabBuffer] = []
+        self.overflows: int = 0
+        """
+        Number of buffers allocated individually, because all slabs were in use or a larger buffer was requested
+        """
+
+    def allocate(self, size: int = -1) -> SlabBuffer:
+        """
+        Takes a buffer from the allocator. The buffer is returned to the allocator once its holder released it.
+
+        :param size: minimal size of the buffer, defaults to < 0 = slotSize. Larger buffers are allocated individually.
+        :return: a buffer with a single holder
+        """
+        if size > self.slotSize or (len(self.__free) == 0 and not self.__grow()):
+            self.overflows += 1
+            return SlabBuffer(None, memoryview(bytearray(max(size, self.slotSize)))).retain()
+        return self.__free.pop().retain()
+
+    def free(self, buffer: SlabBuffer):
+        """
+        Returns the given buffer to the allocator. Called by SlabBuffer.release()
+
+        :param buffer: buffer no longer in use
+        """
+        self.__free.append(buffer)
+
+    def __grow(self) -> bool:
+        """
+        Allocates a new slab
+
+        :return: True if a slab was added, False if the allocator reached its maximal size
+        """
+        if len(self.slabs) >= self.maxSlabs:
+            return False
+        slab = bytearray(self.slotSize * self.slotsPerSlab)
+        self.slabs.append(slab)
+        view = memoryview(slab)
+        # reversed, so buffers are handed out in memory order
+        for i in reversed(range(self.slotsPerSlab)):
+            self.__free.append(SlabBuffer(self, view[i * self.slotSize:(i + 1) * self.slotSize]))
+        return True
+
+    @property
+    def available(self) -> int:
+        """
+        :return: the number of buffers ready to be handed out without growing
+        """
+        return len(self.__free)
+
+    @property
+    def capacity(self) -> int:
+        """
+        :return: the total number of buffers within all slabs
+        """
+        return len(self.slabs) * self.slotsPerSlab
@@ -0,0 +1,219 @@
+from typing import Callable, Dict, List, Optional
+
+# Bits of the timestamp covered by each level of the wheel: level 0 holds the next 256 ticks one slot per tick, each
+# further level covers 64 slots of the whole previous level.
+_LEVEL_BITS = (8, 6, 6, 6)
+_LEVEL_SHIFTS = (0, 8, 14, 20)
+_WHEEL_SPAN = 1 << 26
+
+
+class TimerHandle:
+    """
+    Handle of a scheduled timer, can be used to cancel it
+    """
+
+    def __init__(self, deadline: int, callback: Callable[[], None]):
+        """
+        Constructor
+
+        :param deadline: tick at which the timer expires
+        :param callback: function to call once the timer expired
+        """
+        self.deadline: int = deadline
+        """
+        Tick at which the timer expires
+        """
+        self.callback: Optional[Callable[[], None]] = callback
+        """
+        Function to call once the timer expired, None once the timer fired or was cancelled
+        """
+        self._slot: Optional[Dict["TimerHandle", None]] = None
+        self._level: int = 0
+        self._wheel: Optional["TimingWheel"] = None
+
+    @property
+    def active(self) -> bool:
+        """
+        :return: True if the timer neither fired nor was cancelled yet
+        """
+        return self.callback is not None
+
+    def cancel(self):
+        """
+        Cancels the timer. Does nothing if it already fired or was cancelled.
+        """
+        if self._slot is not None:
+            del self._slot[self]
+            self._wheel._removed(self._level)
+            self._slot = None
+        self.callback = None
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel. Schedules and cancels timers in O(1): timers are kept in slots by their deadline, the
+    slots of the lowest level are visited tick by tick, and timers of higher levels are moved down a level whenever
+    the level below completed a full turn.
+    """
+
+    def __init__(self):
+        self.__time: int = 0
+        """
+        Next tick to process
+        """
+        self.__levels: List[List[Dict[TimerHandle, None]]] = [[{} for _ in range(1 << bits)] for bits in _LEVEL_BITS]
+        self.__counts: List[int] = [0] * len(_LEVEL_BITS)
+
+    @property
+    def time(self) -> int:
+        """
+        :return: the next tick to be processed
+        """
+        return self.__time
+
+    def __len__(self):
+        return sum(self.__counts)
+
+    def schedule(self, deadline: int, callback: Callable[[], None]) -> TimerHandle:
+        """
+        Schedules the given callback
+
+        :param deadline: tick at which to call the callback. Deadlines in the past expire at the next processed tick.
+        :param callback: function to call
+        :return: a handle, which can be used to cancel the timer
+        """
+        handle = TimerHandle(deadline, callback)
+        handle._wheel = self
+        self.__insert(handle)
+        return handle
+
+    def __insert(self, handle: TimerHandle):
+        deadline = max(handle.deadline, self.__time)
+        delta = deadline - self.__time
+        if delta >= _WHEEL_SPAN:
+            # Parked in the highest level, placed again once that slot comes up
+            deadline = self.__time + _WHEEL_SPAN - 1
+            delta = _WHEEL_SPAN - 1
+
+        level = 0
+        while level < len(_LEVEL_BITS) - 1 and delta >= 1 << (_LEVEL_SHIFTS[level + 1]):
+            level += 1
+
+        slot = self.__levels[level][(deadline >> _LEVEL_SHIFTS[level]) & ((1 << _LEVEL_BITS[level]) - 1)]
+        slot[handle] = None
+        handle._slot = slot
+        handle._level = level
+        self.__counts[level] += 1
+
+    def _removed(self, level: int):
+        """
+        Called by TimerHandle.cancel
+        """
+        self.__counts[level] -= 1
+
+    def advance(self, now: int):
+        """
+        Calls all timers whose deadline is before the given tick
+
+        :param now: the current tick
+        """
+        while self.__time < now:
+            if sum(self.__counts) == 0:
+                self.__time = now
+                return
+
+            index = self.__time & ((1 << _LEVEL_BITS[0]) - 1)
+            if index == 0:
+                self.__cascade(1)
+            elif self.__counts[0] == 0:
+                # Nothing due within this turn of the lowest level, skip to its end
+                self.__time = min(now, (self.__time | ((1 << _LEVEL_BITS[0]) - 1)) + 1)
+                continue
+
+            slot = self.__levels[0][index]
+            self.__time += 1
+            if len(slot) == 0:
+                continue
+
+            self.__levels[0][index] = {}
+            self.__counts[0] -= len(slot)
+            # Detach all timers first, callbacks may cancel other timers of the same slot
+            for handle in slot:
+                handle._slot = None
+            for handle in slot:
+                callback = handle.callback
+                if callback is None:
+                    continue
+                handle.callback = None
+                if handle.deadline >= self.__time:
+                    # parked because it was too far in the future
+                    handle.callback = callback
+                    self.__insert(handle)
+                else:
+                    callback()
+
+    def nextDeadline(self) -> Optional[int]:
+        """
+        Lower bound of the earliest deadline among the scheduled timers: exact for timers in the lowest level, the start
+        of their slot's range for timers in higher levels.
+
+        :return: the tick, None if no timer is scheduled
+        """
+        earliest: Optional[int] = None
+        if self.__counts[0] > 0:
+            slots = self.__levels[0]
+            mask = (1 << _LEVEL_BITS[0]) - 1
+            for offset in range(1 << _LEVEL_BITS[0]):
+                if len(slots[(self.__time + offset) & mask]) > 0:
+                    earliest = self.__time + offset
+                    break
+
+        # Timers are not ordered across levels, e.g. one scheduled later may sit in a lower level than an earlier one
+        for level in range(1, len(_LEVEL_BITS)):
+            if self.__counts[level] == 0:
+                continue
+            slots = self.__levels[level]
+            mask = (1 << _LEVEL_BITS[level]) - 1
+            current = self.__time >> _LEVEL_SHIFTS[level]
+            # The current slot is cascaded once the time passes the start of its range
+            first = 0 if self.__time & ((1 << _LEVEL_SHIFTS[level]) - 1) == 0 else 1
+            for offset in range(first, (1 << _LEVEL_BITS[level]) + 1):
+                if len(slots[(current + offset) & mask]) > 0:
+                    start = (current + offset) << _LEVEL_SHIFTS[level]
+                    if earliest is None or start < earliest:
+                        earliest = start
+                    break
+        return earliest
+
+    def __cascade(self, level: int):
+        """
+        Moves the timers of the current slot of the given level down to the lower levels
+
+        :param level: level to cascade from
+        """
+        if level >= len(_LEVEL_BITS):
+            return
+        index = (self.__time >> _LEVEL_SHIFTS[level]) & ((1 << _LEVEL_BITS[level]) - 1)
+        if index == 0:
+            self.__cascade(level + 1)
+
+        slot = self.__levels[level][index]
+        if len(slot) == 0:
+            return
+        self.__levels[level][index] = {}
+        self.__counts[level] -= len(slot)
+        for handle in slot:
+            self.__insert(handle)
+
+    def clear(self):
+        """
+        Cancels all timers and resets the time to 0
+        """
+        for level in self.__levels:
+            for slot in level:
+                for handle in slot:
+                    handle._slot = None
+                    handle.callback = None
+                slot.clear()
+        self.__counts = [0] * len(_LEVEL_BITS)
+        self.__time = 0
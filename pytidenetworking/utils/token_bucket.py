@@ -0,0 +1,74 @@
+class TokenBucket:
+    """
+    Token bucket pacer: tokens (bytes) accumulate at a given rate up to the capacity of the bucket, and are consumed by
+    sending. Allows bursts up to the capacity, and the given rate on average.
+    """
+
+    def __init__(self, rate: float, capacity: int, now: int = 0):
+        """
+        Constructor, the bucket starts out full
+
+        :param rate: tokens (bytes) added per second
+        :param capacity: tokens the bucket holds at most
+        :param now: current time in milliseconds
+        """
+        self.rate: float = rate
+        """
+        Tokens (bytes) added per second
+        """
+        self.capacity: int = capacity
+        """
+        Tokens the bucket holds at most
+        """
+        self.__tokens: float = capacity
+        self.__lastRefill: int = now
+
+    @property
+    def tokens(self) -> float:
+        """
+        :return: the tokens available as of the last refill, negative if more was consumed than available
+        """
+        return self.__tokens
+
+    def refill(self, now: int):
+        """
+        Adds the tokens accumulated since the last refill
+
+        :param now: current time in milliseconds
+        :return:
+        """
+        if now > self.__lastRefill:
+            self.__tokens = min(self.capacity, self.__tokens + (now - self.__lastRefill) * self.rate / 1000)
+            self.__lastRefill = now
+
+    def tryConsume(self, amount: int) -> bool:
+        """
+        Consumes the given amount of tokens if available. A full bucket allows any amount, so amounts beyond the
+        capacity are not blocked forever.
+
+        :param amount: tokens to consume
+        :return: True if the tokens were consumed
+        """
+        if self.__tokens < min(amount, self.capacity):
+            return False
+        self.__tokens -= amount
+        return True
+
+    def consume(self, amount: int):
+        """
+        Consumes the given amount of tokens, even if that leaves the bucket in debt
+
+        :param amount: tokens to consume
+        :return:
+        """
+        self.__tokens -= amount
+
+    def timeUntil(self, amount: int) -> int:
+        """
+        :param amount: tokens to consume
+        :return: time in milliseconds until tryConsume(amount) succeeds, without further consumption
+        """
+        missing = min(amount, self.capacity) - self.__tokens
+        if missing <= 0:
+            return 0
+        return int(missing * 1000 / self.rate) + 1
@@ -0,0 +1,177 @@
+from typing import List, Sequence, Tuple, Union
+
+from pytidenetworking.utils.exceptions import ArgumentOutOfRangeException, NotEnoughBytesError
+
+READABLE_ARRAY = Union[bytes, bytearray, memoryview, List[int]]
+
+#region Encoding table
+
+TABLE_SIZE = 1 << 14
+"""
+Values below this are encoded by a table lookup. Covers all one and two byte varints, i.e. all common message IDs,
+array lengths and string lengths.
+"""
+
+
+def __encode(value: int) -> bytes:
+    result = bytearray()
+    while True:
+        byte_val = value & 0b_0111_1111
+        value >>= 7
+        if value != 0:
+            result.append(byte_val | 0b1000_0000)
+        else:
+            result.append(byte_val)
+            return bytes(result)
+
+
+_ENCODED: List[bytes] = [bytes((value,)) for value in range(0x80)] + \
+                        [bytes(((value & 0x7f) | 0x80, value >> 7)) for value in range(0x80, TABLE_SIZE)]
+
+#endregion
+
+#region Decoding masks
+
+MAX_VARULONG_BYTES = 10
+"""
+Maximal length of a varint holding an unsigned 64 bit value
+"""
+
+# Continuation bits of the first 8 bytes of a varint
+_CONTINUATION_MASK = 0x8080_8080_8080_8080
+_GROUP_MASK = 0x7f7f_7f7f_7f7f_7f7f
+
+#endregion
+
+
+def encodeVarULong(value: int) -> bytes:
+    """
+    Encodes the given value as varint (7 bits per byte, least significant group first, MSB set on all but the last
+    byte)
+
+    :param value: Value to encode, must not be negative
+    :return: the encoded bytes
+    """
+    if value < TABLE_SIZE:
+        if value < 0:
+            raise Exception("Value MUST be positive. Use ZigZag encoding for negative values")
+        return _ENCODED[value]
+    return __encode(value)
+
+
+def varULongSize(value: int) -> int:
+    """
+    :param value: Value to encode, must not be negative
+    :return: the number of bytes the varint encoding of value takes up
+    """
+    if value < 0x80:
+        return 1
+    return (value.bit_length() + 6) // 7
+
+
+def decodeVarULong(data: READABLE_ARRAY, pos: int = 0) -> Tuple[int, int]:
+    """
+    Decodes the varint starting at the given bit position. The (up to) 8 bytes covering the varint are read as a single
+    word, the length is found from its continuation bits, and the groups are compacted with a fixed number of shifts
+    (8 x 7 bit -> 4 x 14 bit -> 2 x 28 bit -> 56 bit).
+    Only varints longer than 8 bytes fall back to reading byte by byte.
+
+    :param data: array to read from
+    :param pos: in bits: position of the varint within data
+    :return: the decoded value and the number of bits read
+    :raises: NotEnoughBytesError if the varint runs past the end of data
+    :raises: ArgumentOutOfRangeException if the varint is longer than MAX_VARULONG_BYTES
+    """
+    start = pos >> 3
+    shift = pos & 7
+    word = int.from_bytes(data[start:start + 9], "little") >> shift
+    # Number of varint bytes within data, an unaligned varint byte spans two bytes of data
+    available = len(data) - start - (shift != 0)
+
+    if not word & 0x80:
+        if available < 1:
+            raise NotEnoughBytesError()
+        return word & 0x7f, 8
+    if not word & 0x8000:
+        if available < 2:
+            raise NotEnoughBytesError()
+        return (word & 0x7f) | ((word >> 1) & 0x3f80), 16
+
+    terminators = ~word & _CONTINUATION_MASK
+    if terminators == 0:
+        return __decodeLong(word, data, start, shift, available)
+
+    # The lowest terminator is the last byte of the varint: bit 8 * n - 1 for a varint of n bytes
+    byteCount = (terminators & -terminators).bit_length() >> 3
+    if byteCount > available:
+        raise NotEnoughBytesError()
+    value = word & _GROUP_MASK & ((1 << (byteCount << 3)) - 1)
+    value = (value & 0x007f_007f_007f_007f) | ((value & 0x7f00_7f00_7f00_7f00) >> 1)
+    value = (value & 0x0000_3fff_0000_3fff) | ((value & 0x3fff_0000_3fff_0000) >> 2)
+    value = (value & 0x0000_0000_0fff_ffff) | ((value & 0x0fff_ffff_0000_0000) >> 4)
+    return value, byteCount << 3
+
+
+def __decodeLong(word: int, data: READABLE_ARRAY, start: int, shift: int, available: int) -> Tuple[int, int]:
+    """
+    Decodes a varint longer than 8 bytes
+
+    :param word: the first 8 bytes of the varint (may contain further bits)
+    :param data: array to read from
+    :param start: index of the byte containing the first bit of the varint
+    :param shift: bit offset of the varint within its first byte
+    :param available: number of varint bytes within data
+    :return: the decoded value and the number of bits read
+    """
+    value = 0
+    bytes_read = 0
+    while True:
+        if bytes_read == MAX_VARULONG_BYTES:
+            raise ArgumentOutOfRangeException()
+        if bytes_read >= available:
+            raise NotEnoughBytesError()
+        if bytes_read and bytes_read & 7 == 0:
+            # Moves on to the next 8 bytes
+            start += 8
+            word = int.from_bytes(data[start:start + 9], "little") >> shift
+        byte_val = (word >> ((bytes_read & 7) << 3)) & 0xff
+        value |= (byte_val & 0x7f) << (7 * bytes_read)
+        bytes_read += 1
+        if byte_val & 0x80 == 0:
+            return value, bytes_read << 3
+
+
+def encodeVarULongs(values: Sequence[int]) -> bytes:
+    """
+    Encodes all given values as consecutive varints
+
+    :param values: Values to encode, must not be negative
+    :return: the encoded bytes
+    """
+    if len(values) > 0 and min(values) < 0:
+        raise Exception("Value MUST be positive. Use ZigZag encoding for negative values")
+    table = _ENCODED
+    try:
+        return b"".join([table[value] for value in values])
+    except (IndexError, TypeError):
+        # Some value is outside of the table (or a numpy integer), encode value by value
+        return b"".join([encodeVarULong(int(value)) for value in values])
+
+
+def decodeVarULongs(data: READABLE_ARRAY, count: int, pos: int = 0) -> Tuple[List[int], int]:
+    """
+    Decodes the given number of consecutive varints
+
+    :param data: array to read from
+    :param count: number of varints to read
+    :param pos: in bits: position of the first varint within data
+    :return: the decoded values and the total number of bits read
+    """
+    result = []
+    append = result.append
+    start = pos
+    for _ in range(count):
+        value, bitCount = decodeVarULong(data, pos)
+        append(value)
+        pos += bitCount
+    return result, pos - start
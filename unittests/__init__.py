@@ -2,6 +2,20 @@ import unittest
 
 from .eventhandler_test import *
 from .message_tests import *
+from .message_schema_test import *
+from .varint_test import *
+from .object_pool_test import *
+from .slab_allocator_test import *
+from .timing_wheel_test import *
+from .message_queue_test import *
+from .async_peer_test import *
+from .reactor_test import *
+from .delayed_ack_test import *
+from .coalescing_test import *
+from .congestion_test import *
+from .batch_send_test import *
+from .sequence_window_test import *
+from .pending_window_test import *
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
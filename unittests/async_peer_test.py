@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+from pytidenetworking import message as messageModule
+from pytidenetworking.async_client import AsyncClient
+from pytidenetworking.async_server import AsyncServer
+from pytidenetworking.message_base import MessageSendMode
+from pytidenetworking.transports.tcp.async_tcp_client import AsyncTCPClient
+from pytidenetworking.transports.tcp.async_tcp_server import AsyncTCPServer
+
+
+class AsyncPeerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    async def waitFor(self, condition, timeout: float = 5):
+        end = self.loop.time() + timeout
+        while not condition() and self.loop.time() < end:
+            await asyncio.sleep(0.01)
+        self.assertTrue(condition())
+
+    async def exchange(self, server: AsyncServer, clients, port: int):
+        received = []
+        replies = []
+
+        def handleServer(fromClientID, message):
+            received.append(message.getUInt16())
+            reply = messageModule.create(MessageSendMode.Reliable, 2)
+            reply.putUInt16(fromClientID)
+            server.send(reply, fromClientID)
+
+        server.registerMessageHandler(1, handleServer)
+        await server.start(port, 10)
+        for client in clients:
+            client.registerMessageHandler(2, lambda message: replies.append(message.getUInt16()))
+            self.assertTrue(await client.connect(("127.0.0.1", port)))
+        await self.waitFor(lambda: all(client.isConnected for client in clients))
+
+        for i in range(20):
+            message = messageModule.create(MessageSendMode.Reliable, 1)
+            message.putUInt16(i)
+            clients[i % len(clients)].send(message)
+        await self.waitFor(lambda: len(received) == 20 and len(replies) == 20)
+        self.assertEqual(list(range(20)), sorted(received))
+        self.assertEqual(sorted(client.id for client in clients for _ in range(10)), sorted(replies))
+
+        for client in clients:
+            client.disconnect()
+        await self.waitFor(lambda: server.clientCount == 0)
+        server.stop()
+
+    def testUDP(self):
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+        self.loop.run_until_complete(self.exchange(AsyncServer(), [AsyncClient(), AsyncClient()], 7821))
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
+
+    def testTCP(self):
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+        self.loop.run_until_complete(self.exchange(AsyncServer(AsyncTCPServer()),
+                                                   [AsyncClient(AsyncTCPClient()), AsyncClient(AsyncTCPClient())],
+                                                   7822))
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
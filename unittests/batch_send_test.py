@@ -0,0 +1,152 @@
+import time
+import unittest
+
+from pytidenetworking import message as messageModule
+from pytidenetworking.client import Client
+from pytidenetworking.message_base import MessageSendMode
+from pytidenetworking.peer import Peer
+from pytidenetworking.server import Server
+from pytidenetworking.transports.tcp.tcp_client import TCPClient
+from pytidenetworking.transports.tcp.tcp_server import TCPServer
+from pytidenetworking.utils.outbound_buffer import OutboundBuffer
+from pytidenetworking.utils.slab_allocator import SlabAllocator
+from unittests.helpers import RecordingConnection
+
+
+class BatchRecordingConnection(RecordingConnection):
+
+    def __init__(self):
+        super(BatchRecordingConnection, self).__init__()
+        self.batches = []
+
+    def sendFrames(self, frames):
+        self.batches.append(len(frames))
+        super(BatchRecordingConnection, self).sendFrames(frames)
+
+
+def createMessages(mode: MessageSendMode, count: int):
+    messages = []
+    for i in range(count):
+        message = messageModule.create(mode, 1)
+        message.putUInt16(i)
+        messages.append(message)
+    return messages
+
+
+class OutboundQueueTests(unittest.TestCase):
+
+    def testSendBatch(self):
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+        connection = BatchRecordingConnection()
+        connection.initialize(Peer(), 5000)
+        connection.canQualityDisconnect = False
+
+        sequenceIDs = connection.sendBatch(createMessages(MessageSendMode.Reliable, 5) +
+                                           createMessages(MessageSendMode.Unreliable, 5))
+        # sent together once the batch is complete
+        self.assertEqual([10], connection.batches)
+        self.assertEqual(10, len(connection.sent))
+        self.assertEqual(5, len(set(sequenceIDs[:5])))
+        self.assertEqual([0] * 5, sequenceIDs[5:])
+
+        connection.sendMessage(createMessages(MessageSendMode.Unreliable, 1)[0])
+        self.assertEqual([10], connection.batches)
+        self.assertEqual(11, len(connection.sent))
+
+        connection.localDisconnect()
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
+
+    def testDeferSends(self):
+        peer = Peer()
+        peer.deferSends = True
+        connections = [BatchRecordingConnection() for _ in range(2)]
+        for connection in connections:
+            connection.initialize(peer, 5000)
+
+        for message in createMessages(MessageSendMode.Unreliable, 3):
+            connections[0].sendMessage(message)
+        connections[1].sendBatch(createMessages(MessageSendMode.Unreliable, 2))
+        connections[1].sendMessage(createMessages(MessageSendMode.Unreliable, 1)[0])
+        self.assertEqual([], connections[0].sent + connections[1].sent)
+        # held until the end of the update
+        self.assertEqual(0, peer.timeUntilNextEvent())
+
+        peer._flushFrames()
+        self.assertEqual([3], connections[0].batches)
+        self.assertEqual([3], connections[1].batches)
+        self.assertEqual(3, len(connections[1].sent))
+        self.assertIsNone(peer.timeUntilNextEvent())
+
+
+class OutboundBufferTests(unittest.TestCase):
+
+    def testStaging(self):
+        allocator = SlabAllocator(16, 4)
+        outbound = OutboundBuffer(allocator, 2)
+        for frame in (b"abcde", bytearray(b"fghij"), [1, 2, 3], b"x" * 20):
+            view, position = outbound.add(frame, len(frame))
+            view[position:position + 2] = len(frame).to_bytes(2, "little")
+        self.assertEqual(4, len(outbound))
+        self.assertEqual([b"abcde", b"fghij", bytes([1, 2, 3]), b"x" * 20], [bytes(f) for f in outbound.frames()])
+        # staged back to back behind their prefixes, a new buffer once a message does not fit
+        self.assertEqual([b"\x05\x00abcde\x05\x00fghij", b"\x03\x00\x01\x02\x03", b"\x14\x00" + b"x" * 20],
+                         [bytes(chunk) for chunk in outbound.chunks()])
+        self.assertEqual(1, allocator.overflows)
+
+        outbound.clear()
+        self.assertEqual(0, len(outbound))
+        self.assertEqual([], list(outbound.chunks()))
+        self.assertEqual(allocator.capacity, allocator.available)
+        # the staging buffers are reused
+        outbound.add(b"abc", 3)
+        self.assertEqual(1, len(allocator.slabs))
+        outbound.clear()
+
+
+class SendManyTests(unittest.TestCase):
+
+    def exchange(self, port: int, server: Server, clients):
+        received = [[] for _ in clients]
+        for client, messages in zip(clients, received):
+            client.registerMessageHandler(1, lambda message, messages=messages: messages.append(message.getUInt16()))
+
+        server.start(port, 10)
+        for client in clients:
+            client.connect(("127.0.0.1", port))
+        try:
+            self.update(server, clients, lambda: all(client.isConnected for client in clients))
+            shared = createMessages(MessageSendMode.Reliable, 1)[0]
+            toSend = [(shared, client.id) for client in clients] + [(shared, 1000)]
+            for i, message in enumerate(createMessages(MessageSendMode.Reliable, 20)):
+                toSend.append((message, clients[i % len(clients)].id))
+            sequenceIDs = server.sendMany(toSend)
+            self.assertEqual(0, sequenceIDs[len(clients)])
+
+            self.update(server, clients, lambda: sum(len(messages) for messages in received) == 20 + len(clients))
+            for index, messages in enumerate(received):
+                self.assertEqual([0] + list(range(index, 20, len(clients))), messages)
+        finally:
+            for client in clients:
+                client.disconnect()
+            server.stop()
+
+    def update(self, server: Server, clients, condition):
+        end = time.time() + 5
+        while not condition() and time.time() < end:
+            server.update()
+            for client in clients:
+                client.update()
+            time.sleep(0.005)
+        self.assertTrue(condition())
+
+    def testUDP(self):
+        self.exchange(7881, Server(), [Client() for _ in range(3)])
+
+    def testTCP(self):
+        server = Server(TCPServer())
+        server.deferSends = True
+        self.exchange(7882, server, [Client(TCPClient()) for _ in range(3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
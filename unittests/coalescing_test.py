@@ -0,0 +1,128 @@
+import time
+import unittest
+
+from pytidenetworking import message as messageModule
+from pytidenetworking.client import Client
+from pytidenetworking.coalescing import PacketCoalescer, splitFrames, MAX_COALESCED_SIZE
+from pytidenetworking.message_base import MessageSendMode, MessageHeader, HEADER_BITMASK
+from pytidenetworking.server import Server
+
+
+class PacketCoalescerTests(unittest.TestCase):
+
+    def testSplit(self):
+        datagrams = []
+        coalescer = PacketCoalescer(lambda data, amount: datagrams.append(bytes(data[:amount])))
+        frames = [bytes([MessageHeader.Unreliable]) + bytes([i % 256]) * (i * 7 % 300 + 1) for i in range(100)]
+        for frame in frames:
+            self.assertTrue(coalescer.add(frame, len(frame)))
+        coalescer.flush()
+        self.assertFalse(coalescer.hasFrames)
+
+        self.assertLess(len(datagrams), len(frames))
+        received = []
+        for datagram in datagrams:
+            self.assertLessEqual(len(datagram), MAX_COALESCED_SIZE)
+            if datagram[0] & HEADER_BITMASK == MessageHeader.Coalesced:
+                received.extend(datagram[start:start + length] for start, length in splitFrames(datagram,
+                                                                                                len(datagram)))
+            else:
+                # single frames are sent as they are
+                received.append(datagram)
+        self.assertEqual(frames, received)
+
+    def testSingleFrame(self):
+        datagrams = []
+        coalescer = PacketCoalescer(lambda data, amount: datagrams.append(bytes(data[:amount])))
+        coalescer.add(b"\x00\x01\x02", 3)
+        coalescer.flush()
+        coalescer.flush()
+        # sent as it is
+        self.assertEqual([b"\x00\x01\x02"], datagrams)
+
+        self.assertFalse(coalescer.add(bytes(MAX_COALESCED_SIZE), MAX_COALESCED_SIZE))
+        self.assertEqual(1, len(datagrams))
+
+
+class CoalescingTests(unittest.TestCase):
+
+    def exchange(self, port: int, serverCoalesces: bool, clientCoalesces: bool):
+        server = Server()
+        server.coalescePackets = serverCoalesces
+        client = Client()
+        client.coalescePackets = clientCoalesces
+        received = []
+        client.registerMessageHandler(1, lambda message: received.append(message.getUInt16()))
+
+        transport = server._Server__transport
+        datagrams = []
+        send = transport.send
+        transport.send = lambda data, amount, endPoint: (datagrams.append(amount), send(data, amount, endPoint))
+
+        server.start(port, 10)
+        client.connect(("127.0.0.1", port))
+        try:
+            self.update(server, client, lambda: client.isConnected)
+            connection = server._Server__clients[client.id]
+            self.assertEqual(serverCoalesces and clientCoalesces, connection.coalescing)
+            self.assertEqual(serverCoalesces and clientCoalesces, client._Client__connection.coalescing)
+
+            datagrams.clear()
+            for i in range(20):
+                message = messageModule.create(MessageSendMode.Unreliable, 1)
+                message.putUInt16(i)
+                server.sendToAll(message)
+            sentImmediately = len(datagrams)
+            server._flushFrames()
+            sentCount = len(datagrams)
+
+            self.update(server, client, lambda: len(received) == 20)
+            self.assertEqual(list(range(20)), received)
+            return sentImmediately, sentCount
+        finally:
+            client.disconnect()
+            server.stop()
+
+    def update(self, server: Server, client: Client, condition):
+        end = time.time() + 5
+        while not condition() and time.time() < end:
+            server.update()
+            client.update()
+            time.sleep(0.005)
+        self.assertTrue(condition())
+
+    def testCoalescing(self):
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+        # held until the end of the update, then sent as one datagram
+        self.assertEqual((0, 1), self.exchange(7871, True, True))
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
+
+    def testConnectData(self):
+        server = Server()
+        server.coalescePackets = True
+        client = Client()
+        client.coalescePackets = True
+        connectData = []
+
+        def handleConnection(connection, connectMessage):
+            connectData.append((connectMessage.getString(), connectMessage.unreadBits))
+            server.accept(connection)
+        server.handleConnection = handleConnection
+
+        message = messageModule.createInternal()
+        message.putString("Lorem ipsum")
+        server.start(7874, 10)
+        client.connect(("127.0.0.1", 7874), message=message)
+        try:
+            self.update(server, client, lambda: client.isConnected)
+            # the flag is negotiated, but removed before the message reaches user code
+            self.assertTrue(server._Server__clients[client.id].coalescing)
+            self.assertEqual("Lorem ipsum", connectData[0][0])
+            self.assertLess(connectData[0][1], 8)
+        finally:
+            client.disconnect()
+            server.stop()
+
+    def testNotNegotiated(self):
+        self.assertEqual((20, 20), self.exchange(7872, True, False))
+        self.assertEqual((20, 20), self.exchange(7873, False, True))
@@ -0,0 +1,186 @@
+import unittest
+
+from pytidenetworking import message as messageModule
+from pytidenetworking.connection import Connection
+from pytidenetworking.message_base import MessageSendMode, MessageHeader, HEADER_BITMASK, _MAX_SIZE
+from pytidenetworking.peer import Peer
+from pytidenetworking.utils.sequence_window import SequenceWindow
+from pytidenetworking.utils.congestion import AIMDController, DelayBasedController
+from pytidenetworking.utils.token_bucket import TokenBucket
+from unittests.helpers import RecordingConnection
+
+
+class TokenBucketTests(unittest.TestCase):
+
+    def testRate(self):
+        bucket = TokenBucket(1000, 100)
+        self.assertTrue(bucket.tryConsume(60))
+        self.assertFalse(bucket.tryConsume(60))
+        self.assertEqual(20, bucket.timeUntil(60) - 1)
+
+        bucket.refill(20)
+        self.assertTrue(bucket.tryConsume(60))
+        # never more than the capacity
+        bucket.refill(10000)
+        self.assertEqual(100, bucket.tokens)
+        # a full bucket lets anything through
+        self.assertTrue(bucket.tryConsume(500))
+        self.assertEqual(-400, bucket.tokens)
+        self.assertFalse(bucket.tryConsume(1))
+
+
+class ControllerTests(unittest.TestCase):
+
+    def testAIMD(self):
+        controller = AIMDController(initialRate=10000, minRate=1000, maxRate=100000, rateIncrease=500)
+        controller.onAcknowledged(0, 50)
+        controller.onAcknowledged(20, 50)
+        self.assertEqual(10000, controller.rate)
+        # doubles per round trip in slow start
+        controller.onAcknowledged(50, 50)
+        controller.onAcknowledged(100, 50)
+        self.assertEqual(40000, controller.rate)
+
+        # losses within a round trip count once
+        controller.onLoss(110, 50)
+        controller.onLoss(120, 50)
+        self.assertEqual(20000, controller.rate)
+        self.assertFalse(controller.slowStart)
+
+        controller.onAcknowledged(140, 50)
+        self.assertEqual(20000, controller.rate)
+        controller.onAcknowledged(160, 50)
+        self.assertEqual(20500, controller.rate)
+
+        for now in range(200, 2000, 60):
+            controller.onLoss(now, 50)
+        self.assertEqual(1000, controller.rate)
+
+    def testDelayBased(self):
+        controller = DelayBasedController(initialRate=10000, delayThreshold=1.5)
+        controller.onAcknowledged(0, 40)
+        controller.onAcknowledged(50, 50)
+        self.assertEqual(20000, controller.rate)
+        # queues building up
+        controller.onAcknowledged(100, 70)
+        self.assertEqual(10000, controller.rate)
+
+
+class PacingTests(unittest.TestCase):
+
+    def connect(self, rate: float) -> RecordingConnection:
+        peer = Peer()
+        peer.congestionControl = lambda: AIMDController(initialRate=rate, minRate=1000)
+        connection = RecordingConnection()
+        connection.initialize(peer, 5000)
+        connection.canQualityDisconnect = False
+        return connection
+
+    def advance(self, connection: Connection, now: int):
+        connection.peer.current_time = now
+        connection.peer.eventQueue.advance(now)
+
+    def sendUnreliable(self, connection: Connection, count: int):
+        for i in range(count):
+            message = messageModule.create(MessageSendMode.Unreliable, 1)
+            message.putUInt16(i)
+            message.putBytes(bytes(98))
+            connection.sendMessage(message)
+
+    def payload(self, datagram) -> int:
+        message = messageModule.createFromBytes(bytearray(datagram), len(datagram))
+        value = message.getUInt16()
+        message.release()
+        return value
+
+    def testPacing(self):
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+        connection = self.connect(10000)
+        self.sendUnreliable(connection, 40)
+        frameSize = len(connection.sent[0])
+        # a burst of one full sized message, the rest is held back
+        burst = len(connection.sent)
+        self.assertEqual(_MAX_SIZE // frameSize, burst)
+        self.assertEqual((40 - burst) * frameSize, connection.pacedBytes)
+
+        # internal messages are not held back
+        connection.sendAck(1, 1, SequenceWindow())
+        self.assertEqual(MessageHeader.Ack, connection.sent[-1][0] & HEADER_BITMASK)
+
+        now = 0
+        while connection.pacedBytes > 0:
+            deadline = connection.peer.eventQueue.nextDeadline()
+            self.assertIsNotNone(deadline)
+            now = max(now, deadline) + 1
+            self.advance(connection, now)
+        # in order, at the send rate
+        self.assertEqual(list(range(40)), [self.payload(datagram) for datagram in connection.sent
+                                           if datagram[0] & HEADER_BITMASK == MessageHeader.Unreliable])
+        self.assertGreaterEqual(now, (40 - burst) * frameSize * 1000 // 10000 - 1)
+
+        connection.localDisconnect()
+        self.assertEqual(0, len(connection.peer.eventQueue))
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
+
+    def testPacedLimit(self):
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+        connection = self.connect(10000)
+        self.sendUnreliable(connection, 5)
+        frameSize = len(connection.sent[0])
+        connection.maxPacedBytes = 10 * frameSize
+        self.sendUnreliable(connection, 40)
+        burst = len(connection.sent)
+        # unreliable messages beyond the limit are dropped
+        self.assertEqual(10 * frameSize, connection.pacedBytes)
+        self.assertEqual(45 - burst - 10, connection.metrics.pacedDiscarded)
+
+        # reliable ones are queued regardless, and delivered in order
+        for i in range(20):
+            message = messageModule.create(MessageSendMode.Reliable, 1)
+            message.putUInt16(100 + i)
+            message.putBytes(bytes(98))
+            connection.sendMessage(message)
+        self.assertEqual(45 - burst - 10, connection.metrics.pacedDiscarded)
+        self.assertGreater(connection.pacedBytes, connection.maxPacedBytes)
+
+        now = 0
+        while connection.pacedBytes > 0:
+            now = max(now, connection.peer.eventQueue.nextDeadline()) + 1
+            self.advance(connection, now)
+        reliable = [self.payload(datagram) for datagram in connection.sent
+                    if datagram[0] & HEADER_BITMASK == MessageHeader.Reliable]
+        self.assertEqual(list(range(100, 120)), reliable[:20])
+
+        connection.localDisconnect()
+        self.assertEqual(0, connection.pacedBytes)
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
+
+    def testResends(self):
+        connection = self.connect(100000)
+        controller = connection.congestionController
+        for i in range(5):
+            message = messageModule.create(MessageSendMode.Reliable, 1)
+            message.putUInt16(i)
+            connection.sendMessage(message)
+        self.assertEqual(5, len(connection.sent))
+
+        # resending slows the connection down
+        self.advance(connection, 51)
+        self.assertEqual(10, len(connection.sent))
+        self.assertEqual(50000, controller.rate)
+
+        # no resends while messages are held back
+        self.sendUnreliable(connection, 200)
+        sent = len(connection.sent)
+        self.advance(connection, 52)
+        self.advance(connection, 120)
+        self.assertTrue(all(datagram[0] & HEADER_BITMASK == MessageHeader.Unreliable for datagram in connection.sent[sent:]))
+
+        connection.congestionController = None
+        self.assertEqual(0, connection.pacedBytes)
+        self.assertEqual(210, len(connection.sent))
+        connection.localDisconnect()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -174,6 +174,40 @@ class ValueConversionTests(unittest.TestCase):
             result = conv.bytesFromBits(tmpbits, len(expected) * 8, bit)
             self.assertEqual(expected, list(result))
 
+    def testWriteBits(self):
+        for _ in range(RANDOM_TEST_COUNT // 100):
+            startBit = random.randint(0, 23)
+            amount = random.randint(1, 120)
+            value = bytes(randomListInt((amount + 7) // 8, 0, 256))
+            original = bytearray(randomListInt(20, 0, 256))
+
+            expected = bytearray(original)
+            for i in range(amount):
+                bit = (value[i // 8] >> (i % 8)) & 1
+                target = startBit + i
+                expected[target // 8] = (expected[target // 8] & ~(1 << (target % 8))) | (bit << (target % 8))
+
+            self.assertEqual(expected, conv.writeBits(value, amount, bytearray(original), startBit))
+            self.assertEqual(expected, conv.writeBitsInt(int.from_bytes(value, "little"), amount, bytearray(original),
+                                                         startBit))
+
+    def testReadBits(self):
+        for _ in range(RANDOM_TEST_COUNT // 100):
+            startBit = random.randint(0, 23)
+            amount = random.randint(1, 120)
+            array = bytes(randomListInt(20, 0, 256))
+
+            expected = 0
+            for i in range(amount):
+                source = startBit + i
+                expected |= ((array[source // 8] >> (source % 8)) & 1) << i
+
+            byteCount = (amount + 7) // 8
+            mask = (1 << amount) - 1
+            self.assertEqual(byteCount, len(conv.readBits(array, amount, startBit)))
+            self.assertEqual(expected, int.from_bytes(conv.readBits(array, amount, startBit), "little") & mask)
+            self.assertEqual(expected, conv.readBitsInt(array, amount, startBit))
+
     #region
 
 #region Tools
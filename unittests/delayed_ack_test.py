@@ -0,0 +1,87 @@
+import unittest
+
+from pytidenetworking import message as messageModule
+from pytidenetworking.message_base import MessageSendMode, MessageHeader, HEADER_BITMASK
+from pytidenetworking.peer import Peer
+from unittests.helpers import RecordingConnection
+
+
+class DelayedAckTests(unittest.TestCase):
+
+    def reliableDatagrams(self, count: int):
+        sender = RecordingConnection()
+        sender.initialize(Peer(), 5000)
+        for i in range(count):
+            message = messageModule.create(MessageSendMode.Reliable, 1)
+            message.putUInt16(i)
+            sender.sendMessage(message)
+        sender.localDisconnect()
+        return sender.sent
+
+    def receive(self, peer: Peer, datagrams):
+        connection = RecordingConnection()
+        connection.initialize(peer, 5000)
+        for datagram in datagrams:
+            peer._handleData(bytearray(datagram), len(datagram), connection)
+        return connection
+
+    def readAck(self, datagram):
+        self.assertEqual(MessageHeader.Ack, datagram[0] & HEADER_BITMASK)
+        message = messageModule.createFromBytes(bytearray(datagram), len(datagram))
+        ack = (message.getUInt16(), message.getUInt16(), message.getBool())
+        message.release()
+        return ack
+
+    def sequenceID(self, datagram) -> int:
+        message = messageModule.createFromBytes(bytearray(datagram), len(datagram))
+        sequenceID = message.seqID
+        message.release()
+        return sequenceID
+
+    def clearQueue(self, peer: Peer):
+        while len(peer.messageQueue) > 0:
+            peer.messageQueue.popleft()[0].release()
+
+    def testImmediateAcks(self):
+        peer = Peer()
+        connection = self.receive(peer, self.reliableDatagrams(50))
+        self.assertEqual(50, len(connection.sent))
+        self.clearQueue(peer)
+
+    def testDelayedAcks(self):
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+        datagrams = self.reliableDatagrams(50)
+        peer = Peer()
+        peer.delayAcks = True
+        peer.maxAckDelay = 1000
+
+        connection = self.receive(peer, datagrams[:16])
+        self.assertEqual([], connection.sent)
+        peer._flushAcks()
+        peer._flushAcks()
+        self.assertEqual(1, len(connection.sent))
+        lastReceived, receivedBits, _ = self.readAck(connection.sent[0])
+        self.assertEqual(self.sequenceID(datagrams[15]), lastReceived)
+        self.assertEqual(0x7fff, receivedBits & 0x7fff)
+
+        # acks are sent early, before the oldest received message drops out of the ack's bitfield
+        connection = self.receive(peer, datagrams)
+        peer._flushAcks()
+        self.assertEqual(3, len(connection.sent))
+        acks = [self.readAck(datagram) for datagram in connection.sent]
+        self.assertEqual(self.sequenceID(datagrams[-1]), acks[-1][0])
+        for previous, ack in zip(acks, acks[1:]):
+            self.assertLessEqual(ack[0] - previous[0], 17)
+        self.assertEqual(0xffff, acks[-1][1])
+
+        self.clearQueue(peer)
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
+
+    def testMaxAckDelay(self):
+        peer = Peer()
+        peer.delayAcks = True
+        peer.maxAckDelay = 0
+        connection = self.receive(peer, self.reliableDatagrams(10))
+        # every delayed ack is overdue right away
+        self.assertEqual(10, len(connection.sent))
+        self.clearQueue(peer)
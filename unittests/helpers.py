@@ -0,0 +1,14 @@
+from pytidenetworking.connection import Connection
+
+
+class RecordingConnection(Connection):
+    """
+    Connection keeping the datagrams it sends, instead of handing them to a transport
+    """
+
+    def __init__(self):
+        super(RecordingConnection, self).__init__()
+        self.sent = []
+
+    def send(self, dataBuffer, amount: int):
+        self.sent.append(bytes(dataBuffer[:amount]))
@@ -0,0 +1,161 @@
+import unittest
+
+from pytidenetworking import message as messageModule
+from pytidenetworking.connection import Connection
+from pytidenetworking.message import Message
+from pytidenetworking.message_base import MessageHeader, MessageSendMode
+from pytidenetworking.peer import Peer, QueueDropPolicy
+from pytidenetworking.server import Server
+from pytidenetworking.utils.message_queue import MessageQueue
+from pytidenetworking.utils.slab_allocator import SlabAllocator
+
+
+class RecordingPeer(Peer):
+
+    def __init__(self):
+        super(RecordingPeer, self).__init__()
+        self.handled = []
+
+    def handle(self, message, header, connection):
+        self.handled.append((header, message.getUInt16()))
+        message.release()
+
+
+class MessageQueueTests(unittest.TestCase):
+
+    def queue(self, peer: Peer, connection: Connection, sendMode: MessageSendMode, value: int):
+        message = messageModule.create(sendMode, 1)
+        message.putUInt16(value)
+        peer._queueMessage(message, message.header, connection)
+
+    def testOrderAndBudget(self):
+        peer = RecordingPeer()
+        connection = Connection()
+        for i in range(10):
+            self.queue(peer, connection, MessageSendMode.Unreliable, i)
+
+        peer.maxMessagesPerUpdate = 4
+        peer._handleMessages()
+        self.assertEqual([0, 1, 2, 3], [value for _, value in peer.handled])
+        peer._handleMessages()
+        peer.maxMessagesPerUpdate = 0
+        peer._handleMessages()
+        self.assertEqual(list(range(10)), [value for _, value in peer.handled])
+        self.assertEqual(0, len(peer.messageQueue))
+
+    def testDropPolicy(self):
+        peer = RecordingPeer()
+        connection = Connection()
+        peer.maxQueuedMessages = 4
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+
+        self.queue(peer, connection, MessageSendMode.Unreliable, 0)
+        self.queue(peer, connection, MessageSendMode.Reliable, 1)
+        self.queue(peer, connection, MessageSendMode.Unreliable, 2)
+        self.queue(peer, connection, MessageSendMode.Reliable, 3)
+        # drops the oldest unreliable message
+        self.queue(peer, connection, MessageSendMode.Unreliable, 4)
+        # unreliable messages make room for reliable ones
+        self.queue(peer, connection, MessageSendMode.Reliable, 5)
+        self.queue(peer, connection, MessageSendMode.Reliable, 6)
+        # no unreliable message left, reliable ones are queued regardless
+        self.queue(peer, connection, MessageSendMode.Reliable, 7)
+        self.assertEqual(5, len(peer.messageQueue))
+        # internal messages are never dropped
+        peer._queueMessage(messageModule.createInternal(MessageHeader.Heartbeat), MessageHeader.Heartbeat, connection)
+        self.assertEqual(6, len(peer.messageQueue))
+        peer.messageQueue.pop()[0].release()
+
+        peer.queueDropPolicy[MessageSendMode.Unreliable] = QueueDropPolicy.DropNewest
+        self.queue(peer, connection, MessageSendMode.Unreliable, 8)
+        self.assertEqual(4, connection.metrics.unreliableDiscarded)
+
+        peer._handleMessages()
+        self.assertEqual([1, 3, 5, 6, 7], [value for _, value in peer.handled])
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
+
+    def testQueueOrder(self):
+        queue = MessageQueue()
+        headers = [MessageHeader.Unreliable, MessageHeader.Reliable, MessageHeader.Ack, MessageHeader.Unreliable,
+                   MessageHeader.Heartbeat, MessageHeader.Reliable, MessageHeader.Unreliable]
+        for value, header in enumerate(headers):
+            queue.append(value, header, None)
+        self.assertEqual(3, queue.count(MessageHeader.Unreliable))
+        self.assertEqual(2, queue.count(MessageHeader.Heartbeat))
+
+        self.assertEqual((0, MessageHeader.Unreliable, None), queue.popOldest(MessageHeader.Unreliable))
+        self.assertEqual([1, 5], [queue.popOldest(MessageHeader.Reliable)[0] for _ in range(2)])
+        self.assertIsNone(queue.popOldest(MessageHeader.Reliable))
+        self.assertEqual(6, queue.pop()[0])
+        self.assertEqual(3, len(queue))
+        # the remaining messages in the order they were queued
+        self.assertEqual([2, 3, 4], [queue.popleft()[0] for _ in range(3)])
+        self.assertRaises(IndexError, queue.popleft)
+
+
+class BatchHandlerTests(unittest.TestCase):
+
+    def receive(self, allocator: SlabAllocator, value: int, messageID: int = 5) -> Message:
+        message = messageModule.create(MessageSendMode.Unreliable, messageID)
+        message.putUInt16(value)
+        bytestream, amount = message.createBytestream()
+        buffer = allocator.allocate()
+        buffer.view[:amount] = bytestream[:amount]
+        message.release()
+
+        received = messageModule.createFromBytes(buffer.view[:amount], amount, buffer)
+        buffer.release()
+        return received
+
+    def testBatchHandler(self):
+        server = Server()
+        allocator = SlabAllocator()
+        connection = Connection()
+        connection.id = 3
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+
+        batches = []
+        single = []
+        server.registerMessageHandler(5, lambda fromClientID, message: single.append(message.getUInt16()))
+        server.registerBatchMessageHandler(
+            5, lambda batch: batches.append([(fromClientID, message.getUInt16()) for fromClientID, message in batch]))
+
+        for i in range(10):
+            server.handle(self.receive(allocator, i), MessageHeader.Unreliable, connection)
+        # kept without copying, the receive buffers are held until the end of the update
+        self.assertEqual(10, allocator.capacity - allocator.available)
+        self.assertEqual([], batches)
+
+        server._handleBatches()
+        server._handleBatches()
+        self.assertEqual([[(3, i) for i in range(10)]], batches)
+        self.assertEqual([], single)
+        self.assertEqual(allocator.capacity, allocator.available)
+
+        server.handle(self.receive(allocator, 10), MessageHeader.Unreliable, connection)
+        server.removeBatchMessageHandler(5)
+        server.handle(self.receive(allocator, 11), MessageHeader.Unreliable, connection)
+        server._handleBatches()
+        self.assertEqual(1, len(batches))
+        self.assertEqual([11], single)
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
+
+    def testRetainFromBatch(self):
+        server = Server()
+        allocator = SlabAllocator()
+        connection = Connection()
+        connection.id = 3
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+
+        kept = []
+        server.registerBatchMessageHandler(5, lambda batch: kept.append(batch[1][1].retain()))
+        for i in range(3):
+            server.handle(self.receive(allocator, i), MessageHeader.Unreliable, connection)
+        self.assertEqual(3, allocator.capacity - allocator.available)
+
+        # the retained message is copied out, every receive buffer is returned
+        server._handleBatches()
+        self.assertEqual(allocator.capacity, allocator.available)
+        self.assertEqual(1, kept[0].getUInt16())
+        kept[0].release()
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
@@ -0,0 +1,99 @@
+import unittest
+
+from pytidenetworking import message as messageModule
+from pytidenetworking.message import Message
+from pytidenetworking.message_base import MessageSendMode, BYTE_ORDER_BIG
+from pytidenetworking.message_schema import MessageSchema, UInt16, Float, Bool, VarULong, String, FloatArray, \
+    BoolArray, Int64
+
+
+class PlayerState(MessageSchema, messageID=12, sendMode=MessageSendMode.Unreliable):
+    playerID = UInt16
+    x = Float
+    y = Float
+    grounded = Bool
+    crouching = Bool
+    score = VarULong
+    name = String
+    path = FloatArray
+    flags = BoolArray
+    timestamp = Int64
+
+
+class MessageSchemaTests(unittest.TestCase):
+
+    def createState(self):
+        return PlayerState(513, 1.5, -0.25, True, False, 300, "Lorem ipsum", [0.5, 2.0], [True, False, True], -2**40)
+
+    def writeManually(self, state: PlayerState, message: Message):
+        message.putUInt16(state.playerID)
+        message.putFloat(state.x)
+        message.putFloat(state.y)
+        message.putBool(state.grounded)
+        message.putBool(state.crouching)
+        message.putVarULong(state.score)
+        message.putString(state.name)
+        message.putFloatArray(state.path)
+        message.putBoolArray(state.flags)
+        message.putInt64(state.timestamp)
+
+    def testSchemaWireLayout(self):
+        for byteOrder in ("little", BYTE_ORDER_BIG):
+            state = self.createState()
+
+            expected = Message()
+            expected.init()
+            expected.byte_order = byteOrder
+            expected.putBool(True)
+            self.writeManually(state, expected)
+
+            message = Message()
+            message.init()
+            message.byte_order = byteOrder
+            message.putBool(True)
+            state.write(message)
+
+            self.assertEqual(expected.writeBit, message.writeBit)
+            self.assertEqual(bytes(expected.data[:expected.bytesInUse]), bytes(message.data[:message.bytesInUse]))
+
+            self.assertEqual(True, message.getBool())
+            self.assertEqual(state, PlayerState.read(message))
+            self.assertEqual(message.writeBit, message.readBit)
+
+    def testSchemaReadTuple(self):
+        state = self.createState()
+        message = Message()
+        message.init()
+        state.write(message)
+
+        self.assertEqual((513, 1.5, -0.25, True, False, 300, "Lorem ipsum", [0.5, 2.0], [True, False, True], -2**40),
+                         PlayerState.readTuple(message))
+
+    def testSchemaCreateMessage(self):
+        message = self.createState().createMessage()
+        self.assertEqual(MessageSendMode.Unreliable, message.sendMode)
+        self.assertEqual(12, message.msgID)
+        bytestream, amount = message.createBytestream()
+        bytestream = bytes(bytestream[:amount])
+        message.release()
+
+        received = messageModule.createFromBytes(bytestream)
+        self.assertEqual(12, received.msgID)
+        self.assertEqual(self.createState(), PlayerState.read(received))
+        received.release()
+
+    def testSchemaInheritance(self):
+        class Extended(PlayerState):
+            health = UInt16
+
+        self.assertEqual(12, Extended.messageID)
+        self.assertEqual(list(PlayerState.schemaFields) + ["health"], list(Extended.schemaFields))
+
+        class Unidentified(MessageSchema):
+            value = UInt16
+
+        self.assertRaises(ValueError, Unidentified(1).createMessage)
+
+
+if __name__ == '__main__':
+    unittest.main()
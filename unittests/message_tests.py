@@ -2,7 +2,18 @@ import math
 import random
 import unittest
 
+from pytidenetworking import message as messageModule
 from pytidenetworking.message import Message
+from pytidenetworking.connection import Connection
+from pytidenetworking.message_base import MessageBase, MessageSendMode, MIN_NOTIFY_BYTES
+from pytidenetworking.peer import Peer
+from pytidenetworking.pending_message import createPending
+from pytidenetworking.utils.converter import BITS_PER_BYTE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class ValueSerialisationTests(unittest.TestCase):
@@ -266,6 +277,19 @@ class ValueSerialisationTests(unittest.TestCase):
 
         self.assertEqual(value, readValue)  # add assertion here
 
+    def testMessageStringUnicode(self):
+        value = "Grüße aus Stuttgart ✓"
+
+        message = Message()
+        message.init()
+
+        message.putBool(True)
+        message.putString(value)
+        message.getBool()
+        readValue = message.getString()
+
+        self.assertEqual(value, readValue)
+
     def testMessageStringArray(self):
         value = ["Lorem ipsum", " in dolor", " sit amen"]
 
@@ -277,6 +301,290 @@ class ValueSerialisationTests(unittest.TestCase):
 
         self.assertEqual(value, readValue)  # add assertion here
 
+    def testMessageMixedAlignment(self):
+        message = Message()
+        message.init()
+
+        message.putInt32(-123456)
+        message.putBool(True)
+        message.putUInt16(0xbeef)
+        message.putDouble(math.e)
+        message.putBool(False)
+        message.putBool(True)
+        message.putInt64(-2**40)
+        message.putFloat(1.5)
+        message.putUInt8(0xa5)
+
+        self.assertEqual(-123456, message.getInt32())
+        self.assertEqual(True, message.getBool())
+        self.assertEqual(0xbeef, message.getUInt16())
+        self.assertEqual(math.e, message.getDouble())
+        self.assertEqual(False, message.getBool())
+        self.assertEqual(True, message.getBool())
+        self.assertEqual(-2**40, message.getInt64())
+        self.assertEqual(1.5, message.getFloat())
+        self.assertEqual(0xa5, message.getUInt8())
+
+    def testMessageOverwriteAtPosition(self):
+        message = Message()
+        message.init()
+
+        message.putBool(True)
+        message.putUInt32(0)
+        message.putUInt32(0)
+        message.putUInt32(0xdeadbeef, 1)
+        message.putUInt32(0x01020304, 33)
+
+        self.assertEqual(True, message.getBool())
+        self.assertEqual(0xdeadbeef, message.getUInt32())
+        self.assertEqual(0x01020304, message.getUInt32())
+        self.assertEqual(0xdeadbeef, message.getUInt32(1))
+
+    def testMessageUnalignedArrays(self):
+        message = Message()
+        message.init()
+
+        message.putBool(True)
+        message.putInt32Array([1, -2, 3])
+        message.putBool(False)
+        message.putDoubleArray([math.pi, -math.e])
+        message.putBytes(b'ABC')
+
+        self.assertEqual(True, message.getBool())
+        self.assertEqual([1, -2, 3], message.getInt32Array())
+        self.assertEqual(False, message.getBool())
+        self.assertEqual([math.pi, -math.e], message.getDoubleArray())
+        self.assertEqual(b'ABC', message.getBytes(3))
+        self.assertEqual([1, -2, 3], message.getInt32Array(pos=1))
+
+    def testMessageBufferReuse(self):
+        message = messageModule.create(MessageSendMode.Unreliable, 1)
+        buffer = message.data
+        message.putString("Lorem ipsum")
+        message.release()
+
+        message = messageModule.create(MessageSendMode.Unreliable, 2)
+        self.assertIs(buffer, message.data)
+        self.assertEqual(0, message.bytesInUse)
+        message.putUInt16(42)
+        self.assertEqual(2, message.bytesInUse)
+        self.assertEqual(42, message.getUInt16())
+        message.release()
+
+    def testMessageRoundTrip(self):
+        for sendMode in (MessageSendMode.Unreliable, MessageSendMode.Reliable):
+            message = messageModule.create(sendMode, 300)
+            message.seqID = 1234
+            message.putBool(True)
+            message.putString("Lorem ipsum")
+            message.putInt32Array([1, -2, 3])
+            bytestream, amount = message.createBytestream()
+            bytestream = bytes(bytestream)
+            message.release()
+
+            received = messageModule.createFromBytes(bytestream)
+            self.assertEqual(sendMode, received.sendMode)
+            self.assertEqual(300, received.msgID)
+            if sendMode == MessageSendMode.Reliable:
+                self.assertEqual(1234, received.seqID)
+            self.assertEqual(True, received.getBool())
+            self.assertEqual("Lorem ipsum", received.getString())
+            self.assertEqual([1, -2, 3], received.getInt32Array())
+            self.assertLess(received.unreadBits, BITS_PER_BYTE)
+            received.release()
+
+    def testMessageBytestreamInPlace(self):
+        for sendMode in (MessageSendMode.Unreliable, MessageSendMode.Notify, MessageSendMode.Reliable):
+            message = messageModule.create(sendMode, 200)
+            message.seqID = 0xabcd
+            message.setNotifyBits(0x12_3456_789a)
+            message.putBool(True)
+            message.putUInt32(0xdeadbeef)
+            message.putString("Lorem ipsum")
+
+            bytestream, amount = message.createBytestream()
+            self.assertIs(message.data, bytestream.obj)
+            self.assertEqual(bytes(MessageBase.createBytestream(message)[0]), bytes(bytestream[:amount]))
+
+            message.msgID = 20000
+            expected = MessageBase.createBytestream(message)[0]
+            bytestream, amount = message.createBytestream()
+            self.assertEqual(bytes(expected), bytes(bytestream[:amount]))
+            message.release()
+
+    def testPendingMessageBytestream(self):
+        message = messageModule.create(MessageSendMode.Reliable, 42)
+        message.putString("Lorem ipsum")
+
+        pending = [createPending(seqID, message, None) for seqID in (1, 2, 0xffff)]
+        message.release()
+
+        for seqID, pendingMessage in zip((1, 2, 0xffff), pending):
+            received = messageModule.createFromBytes(pendingMessage.bytestream)
+            self.assertEqual(seqID, received.seqID)
+            self.assertEqual(42, received.msgID)
+            self.assertEqual("Lorem ipsum", received.getString())
+            received.release()
+            pendingMessage.release()
+
+    def testMessageRetain(self):
+        message = messageModule.create(MessageSendMode.Unreliable, 5)
+        self.assertIs(message, message.retain())
+        self.assertEqual(2, message.referenceCount)
+
+        message.release()
+        self.assertEqual(1, message.referenceCount)
+        available = messageModule.MESSAGE_POOL.available
+        message.release()
+        self.assertEqual(available + 1, messageModule.MESSAGE_POOL.available)
+
+        message.release()
+        self.assertEqual(available + 1, messageModule.MESSAGE_POOL.available)
+        self.assertEqual(0, message.referenceCount)
+
+    def testPendingMessageSharedFrame(self):
+        message = messageModule.create(MessageSendMode.Reliable, 42)
+        message.putString("Lorem ipsum")
+
+        pending = [createPending(seqID, message, None) for seqID in (1, 2)]
+        self.assertEqual(3, message.referenceCount)
+
+        # Modifying the message after sending it must not change what is resent
+        message.putUInt16(0xbeef)
+        pending.append(createPending(3, message, None))
+        message.release()
+
+        for seqID, pendingMessage in zip((1, 2, 3), pending):
+            received = messageModule.createFromBytes(bytes(pendingMessage.bytestream))
+            self.assertEqual(seqID, received.seqID)
+            self.assertEqual("Lorem ipsum", received.getString())
+            if seqID == 3:
+                self.assertEqual(0xbeef, received.getUInt16())
+            self.assertLess(received.unreadBits, BITS_PER_BYTE)
+            received.release()
+
+        self.assertEqual(3, message.referenceCount)
+        for pendingMessage in pending:
+            pendingMessage.clear()
+        self.assertEqual(0, message.referenceCount)
+
+    def testMessageReceivedDetach(self):
+        message = messageModule.create(MessageSendMode.Unreliable, 5)
+        message.putUInt16(0xbeef)
+        message.putString("Lorem ipsum")
+        bytestream, amount = message.createBytestream()
+        bytestream = bytearray(bytestream)
+        message.release()
+
+        received = messageModule.createFromBytes(bytestream, amount)
+        self.assertIsInstance(received.data, memoryview)
+        self.assertEqual(0xbeef, received.getUInt16())
+
+        received.detach()
+        bytestream[:] = bytes(len(bytestream))
+        self.assertEqual("Lorem ipsum", received.getString())
+        self.assertEqual(0xbeef, received.getUInt16(0))
+        received.release()
+
+        received = messageModule.createFromBytes(bytes(amount), amount)
+        received.readBit = received.writeBit
+        received.putUInt16(42)
+        self.assertEqual(42, received.getUInt16())
+        received.release()
+
+    def testShortNotifyReceived(self):
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+        peer = Peer()
+        connection = Connection()
+        connection.initialize(peer, 5000)
+        received = []
+        connection.notifyReceived += lambda message: received.append(message.getUInt8())
+
+        message = messageModule.create(MessageSendMode.Notify, 0)
+        # sequence ID 1
+        message.setNotifyBits(1 << 24)
+        message.putUInt8(0x5a)
+        bytestream, amount = message.createBytestream()
+        bytestream = bytearray(bytestream[:amount])
+        message.release()
+
+        # the frame ends right after the payload
+        self.assertEqual(MIN_NOTIFY_BYTES + 1, amount)
+        peer._handleData(bytestream, amount, connection)
+        self.assertEqual([0x5a], received)
+        # too short for a notify header, dropped
+        peer._handleData(bytestream[:MIN_NOTIFY_BYTES - 1], MIN_NOTIFY_BYTES - 1, connection)
+        self.assertEqual([0x5a], received)
+
+        connection.localDisconnect()
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def testMessageNDArray(self):
+        puts = {np.int8: Message.putInt8Array, np.uint16: Message.putUInt16Array, np.int32: Message.putInt32Array,
+                np.int64: Message.putInt64Array, np.float32: Message.putFloatArray, np.float64: Message.putDoubleArray}
+
+        for byteOrder in ("little", "big"):
+            for dtype, put in puts.items():
+                value = np.arange(-20, 20).astype(dtype)
+
+                message = Message()
+                message.init()
+                message.byte_order = byteOrder
+                expected = Message()
+                expected.init()
+                expected.byte_order = byteOrder
+
+                for aligned in (True, False):
+                    message.putNDArray(value)
+                    message.putBool(aligned)
+                    put(expected, value.tolist())
+                    expected.putBool(aligned)
+
+                self.assertEqual(bytes(expected.data[:expected.bytesInUse]), bytes(message.data[:message.bytesInUse]))
+
+                for aligned in (True, False):
+                    readValue = message.getNDArray(dtype)
+                    self.assertEqual(np.dtype(dtype), readValue.dtype)
+                    self.assertEqual(value.tolist(), readValue.tolist())
+                    self.assertEqual(aligned, message.getBool())
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def testMessageNDArrayBool(self):
+        value = [True, False, True] + [i % 3 == 0 for i in range(20)]
+        message = Message()
+        message.init()
+        message.putBool(True)
+        message.putNDArray(np.array(value).reshape(23, 1))
+        message.putBoolArray(value)
+        message.putUInt8(0x5a)
+
+        # bit packed, as by putBoolArray
+        self.assertEqual(True, message.getBool())
+        self.assertEqual(value, message.getBoolArray())
+        readValue = message.getNDArray(np.bool_)
+        self.assertEqual(np.dtype(np.bool_), readValue.dtype)
+        self.assertEqual(value, readValue.tolist())
+        self.assertEqual(0x5a, message.getUInt8())
+
+        for dtype in (object, np.complex64, "U4"):
+            self.assertRaises(ValueError, message.putNDArray, np.zeros(3, dtype=dtype))
+            self.assertRaises(ValueError, message.getNDArray, dtype)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def testMessageNDArrayReceived(self):
+        value = np.linspace(-1, 1, 100, dtype=np.float32)
+        message = messageModule.create(MessageSendMode.Reliable, 3)
+        message.putNDArray(value)
+        bytestream, amount = message.createBytestream()
+        bytestream = bytes(bytestream[:amount])
+        message.release()
+
+        received = messageModule.createFromBytes(bytestream)
+        self.assertEqual(value.tolist(), received.getNDArray(np.float32).tolist())
+        self.assertEqual(value.tolist(), received.getFloatArray(pos=0))
+        received.release()
+
     def randomListInt(self, count, start, end):
         result = []
         for _ in range(count):
@@ -0,0 +1,115 @@
+import gc
+import queue
+import threading
+import unittest
+
+from pytidenetworking.utils.object_pool import ObjectPool
+
+
+class CountingPool(ObjectPool[object]):
+
+    def createObject(self) -> object:
+        return object()
+
+
+class ObjectPoolTests(unittest.TestCase):
+
+    def testCounters(self):
+        pool = CountingPool(2)
+
+        objects = [pool.acquire() for _ in range(3)]
+        self.assertEqual(0, pool.hits)
+        self.assertEqual(3, pool.misses)
+        self.assertEqual(3, pool.outstanding)
+
+        for obj in objects:
+            pool.release(obj)
+        self.assertEqual(0, pool.outstanding)
+        self.assertEqual(3, pool.available)
+
+        self.assertIs(objects[-1], pool.acquire())
+        self.assertEqual(1, pool.hits)
+
+    def testGrowAndShrink(self):
+        pool = CountingPool(2, maxSize=5, idleTime=3600)
+
+        objects = [pool.acquire() for _ in range(8)]
+        self.assertEqual(5, pool.size)
+        for obj in objects:
+            pool.release(obj)
+        self.assertEqual(5, pool.available)
+        self.assertEqual(3, pool.discarded)
+
+        # The burst is remembered for one more idle period
+        pool.trim()
+        self.assertEqual(5, pool.size)
+        self.assertEqual(5, pool.available)
+
+        pool.release(pool.acquire())
+        pool.trim()
+        self.assertEqual(2, pool.size)
+        self.assertEqual(2, pool.available)
+
+    def testThreadLocal(self):
+        pool = CountingPool(2, threadLocal=True, localSize=4)
+
+        def work():
+            for _ in range(1000):
+                objects = [pool.acquire() for _ in range(3)]
+                for obj in objects:
+                    pool.release(obj)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(0, pool.outstanding)
+        self.assertEqual(4 * 3000, pool.hits + pool.misses)
+        self.assertLessEqual(pool.misses, 4 * 3)
+
+        pool.clearPool()
+        self.assertEqual(0, pool.available)
+
+    def testConcurrentOutstanding(self):
+        for threadLocal in (False, True):
+            pool = CountingPool(2, maxSize=8, threadLocal=threadLocal, localSize=4)
+            handOver = queue.Queue()
+
+            def produce():
+                for i in range(2000):
+                    obj = pool.acquire()
+                    if i % 3 == 0:
+                        # released by another thread
+                        handOver.put(obj)
+                    else:
+                        pool.release(obj)
+                handOver.put(None)
+
+            def consume():
+                while True:
+                    obj = handOver.get()
+                    if obj is None:
+                        return
+                    pool.release(obj)
+
+            threads = [threading.Thread(target=produce) for _ in range(4)]
+            # each producer puts one stop marker, one per consumer
+            threads += [threading.Thread(target=consume) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            del threads, thread
+            gc.collect()
+
+            self.assertEqual(0, pool.outstanding)
+            self.assertEqual(4 * 2000, pool.hits + pool.misses)
+            self.assertLessEqual(pool.size, 8)
+            # the exited threads were merged into the shared counters
+            self.assertEqual([], pool._ObjectPool__threadCounters)
+
+
+if __name__ == '__main__':
+    unittest.main()
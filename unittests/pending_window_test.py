@@ -0,0 +1,119 @@
+import unittest
+
+from pytidenetworking import connection as connectionModule
+from pytidenetworking import message as messageModule
+from pytidenetworking.connection import Connection
+from pytidenetworking.message_base import MessageSendMode
+from pytidenetworking.peer import Peer
+from pytidenetworking.utils.exceptions import ArgumentOutOfRangeException, InsufficientCapacityException
+from pytidenetworking.utils.pending_window import PendingWindow
+from unittests.helpers import RecordingConnection
+
+
+class Pending:
+
+    def __init__(self, seqID: int):
+        self.seqID = seqID
+
+
+class PendingWindowTests(unittest.TestCase):
+
+    def testWindow(self):
+        window = PendingWindow(8)
+        pending = {seqID: Pending(seqID) for seqID in range(65533, 65536)}
+        pending.update({seqID: Pending(seqID) for seqID in range(0, 5)})
+        for seqID in list(range(65533, 65536)) + list(range(0, 5)):
+            window.add(seqID, pending[seqID])
+        self.assertEqual(8, len(window))
+        self.assertTrue(window.isFull)
+        self.assertFalse(window.canAdd(5))
+        self.assertIs(pending[65533], window.oldest)
+        self.assertRaises(ArgumentOutOfRangeException, window.add, 5, Pending(5))
+
+        # out of order removal keeps the window spanning from the oldest pending message
+        self.assertIs(pending[65534], window.remove(65534))
+        self.assertIsNone(window.remove(65534))
+        self.assertIsNone(window.get(65534))
+        self.assertTrue(window.isFull)
+        self.assertIs(pending[65533], window.remove(65533))
+        self.assertFalse(window.isFull)
+        self.assertIs(pending[65535], window.oldest)
+        window.add(5, pending.setdefault(5, Pending(5)))
+        window.add(6, pending.setdefault(6, Pending(6)))
+        self.assertTrue(window.isFull)
+
+        self.assertEqual([65535] + list(range(7)), [message.seqID for message in window])
+        self.assertIsNone(window.get(7))
+        self.assertIsNone(window.get(65530))
+        self.assertIs(pending[3], window.get(3))
+
+        self.assertEqual(8, len(window.clear()))
+        self.assertEqual(0, len(window))
+        self.assertIsNone(window.oldest)
+        self.assertEqual([], list(window))
+        window.add(100, pending[0])
+        self.assertIs(pending[0], window.get(100))
+
+    def testSize(self):
+        self.assertRaises(ArgumentOutOfRangeException, PendingWindow, 12)
+        self.assertRaises(ArgumentOutOfRangeException, PendingWindow, 1 << 17)
+
+
+class FullWindowTests(unittest.TestCase):
+
+    def connect(self) -> RecordingConnection:
+        connection = RecordingConnection()
+        connection._Connection__pendingMessages = PendingWindow(16)
+        connection.initialize(Peer(), 5000)
+        connection.canQualityDisconnect = False
+        return connection
+
+    def sendReliable(self, connection: Connection, count: int):
+        return [connection.sendMessage(messageModule.create(MessageSendMode.Reliable, 1)) for _ in range(count)]
+
+    def sentIDs(self, connection: RecordingConnection):
+        return [int.from_bytes(datagram[:3], "little") >> 4 & 0xffff for datagram in connection.sent]
+
+    def testWaitForRoom(self):
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+        connection = self.connect()
+        full = []
+        connection.pendingWindowFull += full.append
+
+        sequenceIDs = self.sendReliable(connection, 20)
+        self.assertEqual(20, len(set(sequenceIDs)))
+        # nothing is dropped, the messages beyond the window wait
+        self.assertEqual(sequenceIDs[:16], self.sentIDs(connection))
+        self.assertEqual([sequenceIDs[16]], full)
+
+        connection.clearMessage(sequenceIDs[1])
+        self.assertEqual(16, len(connection.sent))
+        connection.clearMessage(sequenceIDs[0])
+        self.assertEqual(sequenceIDs[:18], self.sentIDs(connection))
+
+        self.sendReliable(connection, 1)
+        for sequenceID in sequenceIDs[2:]:
+            connection.clearMessage(sequenceID)
+        self.assertEqual(sequenceIDs + [sequenceIDs[-1] + 1], self.sentIDs(connection))
+        self.assertEqual(1, len(full))
+
+        connection.localDisconnect()
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
+
+    def testWaitingLimit(self):
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+        connection = self.connect()
+        limit = connectionModule.MAX_WAITING_MESSAGES
+        connectionModule.MAX_WAITING_MESSAGES = 4
+        try:
+            self.sendReliable(connection, 20)
+            self.assertRaises(InsufficientCapacityException, self.sendReliable, connection, 1)
+        finally:
+            connectionModule.MAX_WAITING_MESSAGES = limit
+
+        connection.localDisconnect()
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
+
+
+if __name__ == '__main__':
+    unittest.main()
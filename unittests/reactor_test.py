@@ -0,0 +1,66 @@
+import time
+import unittest
+
+from pytidenetworking import message as messageModule
+from pytidenetworking.client import Client
+from pytidenetworking.message_base import MessageSendMode
+from pytidenetworking.server import Server
+from pytidenetworking.threading.reactor import Reactor
+from pytidenetworking.transports.tcp.tcp_client import TCPClient
+from pytidenetworking.transports.tcp.tcp_server import TCPServer
+
+
+class ReactorTests(unittest.TestCase):
+
+    def waitFor(self, condition, timeout: float = 5):
+        end = time.time() + timeout
+        while not condition() and time.time() < end:
+            time.sleep(0.01)
+        self.assertTrue(condition())
+
+    def testPeers(self):
+        reactor = Reactor(maxWait=1)
+        reactor.start()
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+
+        servers = [Server(), Server(TCPServer())]
+        clients = [Client(), Client(), Client(TCPClient())]
+        received = []
+        replies = []
+        for server in servers:
+            def handleServer(fromClientID, message, server=server):
+                received.append(message.getUInt16())
+                reply = messageModule.create(MessageSendMode.Reliable, 2)
+                reply.putUInt16(fromClientID)
+                server.send(reply, fromClientID)
+
+            server.registerMessageHandler(1, handleServer)
+        servers[0].start(7841, 10)
+        servers[1].start(7842, 10)
+
+        try:
+            # a single thread serves all peers
+            for peer in servers + clients:
+                reactor.register(peer)
+            for client, port in zip(clients, (7841, 7841, 7842)):
+                client.registerMessageHandler(2, lambda message: replies.append(message.getUInt16()))
+                client.connect(("127.0.0.1", port))
+                reactor.wakeup()
+            self.waitFor(lambda: all(client.isConnected for client in clients))
+
+            for i in range(30):
+                message = messageModule.create(MessageSendMode.Reliable, 1)
+                message.putUInt16(i)
+                clients[i % len(clients)].send(message)
+            self.waitFor(lambda: len(received) == 30 and len(replies) == 30)
+            self.assertEqual(list(range(30)), sorted(received))
+
+            for client in clients:
+                client.disconnect()
+            self.waitFor(lambda: all(server.clientCount == 0 for server in servers))
+        finally:
+            reactor.requestClose()
+            reactor.join()
+            for server in servers:
+                server.stop()
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
@@ -0,0 +1,126 @@
+import random
+import unittest
+
+from pytidenetworking import message as messageModule
+from pytidenetworking.connection import Connection
+from pytidenetworking.message_base import MessageSendMode, MessageHeader
+from pytidenetworking.peer import Peer
+from pytidenetworking.utils.sequence_window import SequenceWindow, WINDOW_MASK, setBits
+from pytidenetworking.utils.sequencer import Sequencer
+from unittests.helpers import RecordingConnection
+
+
+class SequenceWindowTests(unittest.TestCase):
+
+    def testSetBits(self):
+        self.assertEqual([], list(setBits(0)))
+        self.assertEqual([1, 3, 64, 100], list(setBits(0b101 | 1 << 63 | 1 << 99)))
+
+    def testShift(self):
+        window = SequenceWindow()
+        window.set(1)
+        window.set(3)
+        self.assertTrue(window.isSet(3))
+        self.assertFalse(window.isSet(2))
+        # too old to be tracked
+        self.assertTrue(window.isSet(65))
+        window.set(65)
+        self.assertEqual(0b101, window.bits)
+
+        # the unset positions pushed out
+        self.assertEqual(0, window.shift(1) & ~(1 << 63))
+        self.assertEqual(0b1010, window.bits)
+        dropped = window.shift(62)
+        self.assertEqual([3] + list(range(5, 65)), list(setBits(dropped)))
+        self.assertEqual(1 << 63, window.bits)
+        self.assertEqual(WINDOW_MASK & ~(1 << 63), window.shift(64))
+        self.assertEqual(0, window.bits)
+        self.assertEqual(0, SequenceWindow(filled=True).shift(100))
+
+    def testCombine(self):
+        window = SequenceWindow()
+        window.set(2)
+        self.assertEqual(0b1001, window.combine(0b1011))
+        self.assertEqual(0, window.combine(0b1011))
+        window.set(12)
+        self.assertEqual(0b1011, window.first8)
+        self.assertEqual(0b1011, window.first16 & 0xff)
+        self.assertEqual(1 << 11, window.first16 & ~0xff)
+
+    def testNextSequenceID(self):
+        sequencer = Sequencer(None)
+        sequencer._Sequencer__nextSequenceId = 65534
+        self.assertEqual([65535, 0, 1], [sequencer.nextSequenceID for _ in range(3)])
+
+
+class ReliableDeliveryTests(unittest.TestCase):
+
+    def deliver(self, datagrams, peer: Peer, connection: Connection, rng: random.Random, lossRate: float):
+        for datagram in datagrams:
+            if rng.random() >= lossRate:
+                peer._handleData(bytearray(datagram), len(datagram), connection)
+        datagrams.clear()
+
+    def exchange(self, firstSequenceID: int, lossRate: float, seed: int):
+        outstanding = messageModule.MESSAGE_POOL.outstanding
+        senderPeer = Peer()
+        receiverPeer = Peer()
+        sender = RecordingConnection()
+        sender.initialize(senderPeer, 5000)
+        sender.canQualityDisconnect = False
+        sender._Connection__reliable._Sequencer__nextSequenceId = firstSequenceID
+        receiver = RecordingConnection()
+        receiver.initialize(receiverPeer, 5000)
+        receiver._Connection__reliable.lastReceivedSeqId = firstSequenceID
+
+        rng = random.Random(seed)
+        received = []
+        for i in range(300):
+            message = messageModule.create(MessageSendMode.Reliable, 1)
+            message.putUInt16(i)
+            sender.sendMessage(message)
+
+            if i % 10 == 9:
+                self.exchangeOnce(senderPeer, sender, receiverPeer, receiver, received, rng, lossRate)
+
+        for _ in range(200):
+            if messageModule.MESSAGE_POOL.outstanding == outstanding and len(received) == 300:
+                break
+            self.exchangeOnce(senderPeer, sender, receiverPeer, receiver, received, rng, lossRate)
+
+        # every message handled once, and every pending message acknowledged
+        self.assertEqual(list(range(300)), sorted(received))
+        self.assertEqual(outstanding, messageModule.MESSAGE_POOL.outstanding)
+        sender.localDisconnect()
+        receiver.localDisconnect()
+
+    def exchangeOnce(self, senderPeer: Peer, sender: Connection, receiverPeer: Peer, receiver: Connection,
+                     received, rng: random.Random, lossRate: float):
+        self.deliver(sender.sent, receiverPeer, receiver, rng, lossRate)
+        while len(receiverPeer.messageQueue) > 0:
+            message, header, _ = receiverPeer.messageQueue.popleft()
+            received.append(message.getUInt16())
+            message.release()
+
+        self.deliver(receiver.sent, senderPeer, sender, rng, lossRate)
+        while len(senderPeer.messageQueue) > 0:
+            message, header, _ = senderPeer.messageQueue.popleft()
+            self.assertEqual(MessageHeader.Ack, header)
+            sender.handleAck(message)
+            message.release()
+
+        senderPeer.current_time += 30
+        senderPeer.eventQueue.advance(senderPeer.current_time)
+
+    def testLossless(self):
+        self.exchange(1, 0, 1)
+
+    def testLossy(self):
+        self.exchange(1, 0.2, 2)
+
+    def testWrapAround(self):
+        self.exchange(65400, 0.1, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from pytidenetworking import message as messageModule
+from pytidenetworking.message_base import MessageSendMode
+from pytidenetworking.utils.slab_allocator import SlabAllocator
+
+
+class SlabAllocatorTests(unittest.TestCase):
+
+    def testRecycle(self):
+        allocator = SlabAllocator(slotSize=16, slotsPerSlab=4, maxSlabs=2)
+
+        buffers = [allocator.allocate() for _ in range(6)]
+        self.assertEqual(2, len(allocator.slabs))
+        self.assertEqual(2, allocator.available)
+        self.assertTrue(all(len(buffer) == 16 for buffer in buffers))
+
+        # slots don't overlap
+        for i, buffer in enumerate(buffers):
+            buffer.view[:] = bytes([i]) * 16
+        self.assertEqual([bytes([i]) * 16 for i in range(6)], [bytes(buffer.view) for buffer in buffers])
+
+        buffers[0].retain()
+        buffers[0].release()
+        self.assertEqual(2, allocator.available)
+        buffers[0].release()
+        self.assertEqual(3, allocator.available)
+        self.assertIs(buffers[0], allocator.allocate())
+
+    def testOverflow(self):
+        allocator = SlabAllocator(slotSize=16, slotsPerSlab=1, maxSlabs=1)
+        inSlab = allocator.allocate()
+
+        overflow = allocator.allocate()
+        large = allocator.allocate(100)
+        self.assertEqual(2, allocator.overflows)
+        self.assertEqual(100, len(large))
+
+        overflow.release()
+        large.release()
+        inSlab.release()
+        self.assertEqual(1, allocator.available)
+
+    def testReceivedMessageHoldsBuffer(self):
+        message = messageModule.create(MessageSendMode.Unreliable, 9)
+        message.putString("Lorem ipsum")
+        bytestream, amount = message.createBytestream()
+
+        allocator = SlabAllocator(slotSize=64, slotsPerSlab=1)
+        buffer = allocator.allocate()
+        buffer.view[:amount] = bytestream[:amount]
+        message.release()
+
+        received = messageModule.createFromBytes(buffer.view, amount, buffer)
+        buffer.release()
+        self.assertEqual(0, allocator.available)
+
+        received.retain()
+        self.assertEqual(1, allocator.available)
+        self.assertEqual("Lorem ipsum", received.getString())
+        received.release()
+        received.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import random
+import unittest
+
+from pytidenetworking import message as messageModule
+from pytidenetworking.message_base import MessageSendMode
+from pytidenetworking.peer import Peer
+from pytidenetworking.utils.timing_wheel import TimingWheel
+from unittests.helpers import RecordingConnection
+
+
+class TimingWheelTests(unittest.TestCase):
+
+    def testExpiry(self):
+        wheel = TimingWheel()
+        fired = []
+        # within the lowest level, crossing levels and beyond the span of the wheel
+        deadlines = [0, 1, 5, 255, 256, 300, 16383, 16384, 20000, 1 << 20, (1 << 26) + 5, (1 << 27) + 3]
+        for deadline in deadlines:
+            wheel.schedule(deadline, lambda deadline=deadline: fired.append((deadline, wheel.time)))
+        self.assertEqual(len(deadlines), len(wheel))
+
+        now = 0
+        rng = random.Random(7)
+        while now <= deadlines[-1] + 1:
+            now += rng.randint(1, 1 << 16) if now > 20000 else rng.randint(1, 300)
+            wheel.advance(now)
+            # a timer is due once its deadline is before the current tick
+            self.assertEqual([deadline for deadline in deadlines if deadline < now], [d for d, _ in fired])
+
+        # timers fire at the tick they were due, not at the tick the wheel was advanced to
+        self.assertEqual([deadline + 1 for deadline in deadlines], [time for _, time in fired])
+        self.assertEqual(0, len(wheel))
+
+    def testNextDeadline(self):
+        wheel = TimingWheel()
+        self.assertIsNone(wheel.nextDeadline())
+        rng = random.Random(11)
+        deadlines = sorted(rng.randint(0, 1 << 21) for _ in range(200)) + [256, 16384, (1 << 26) + 5]
+        pending = []
+        for deadline in deadlines:
+            wheel.schedule(deadline, lambda deadline=deadline: pending.remove(deadline))
+            pending.append(deadline)
+
+        now = 0
+        while len(pending) > 0:
+            earliest = min(pending)
+            nextDeadline = wheel.nextDeadline()
+            # never later than the earliest timer
+            self.assertLessEqual(nextDeadline, earliest)
+            if earliest < (wheel.time | 255) and wheel.time & 255 != 0:
+                # exact once moved down to the lowest level
+                self.assertEqual(earliest, nextDeadline)
+            now = max(now, nextDeadline) + rng.choice((1, 1, 100, 256))
+            wheel.advance(now)
+        self.assertIsNone(wheel.nextDeadline())
+
+        wheel = TimingWheel()
+        wheel.schedule(18257, lambda: None)
+        wheel.advance(5000)
+        # ends up in a lower level than the earlier timer
+        wheel.schedule(18662, lambda: None)
+        self.assertLessEqual(wheel.nextDeadline(), 18257)
+
+        wheel = TimingWheel()
+        pending = []
+        now = 0
+        for _ in range(300):
+            # scheduled while the wheel advances, at distances spanning all levels
+            for _ in range(rng.randint(0, 3)):
+                deadline = now + rng.choice((rng.randint(0, 300), rng.randint(0, 1 << 15), rng.randint(0, 1 << 22)))
+                wheel.schedule(deadline, lambda deadline=deadline: pending.remove(deadline))
+                pending.append(deadline)
+            if len(pending) > 0:
+                self.assertLessEqual(wheel.nextDeadline(), min(pending))
+            else:
+                self.assertIsNone(wheel.nextDeadline())
+            now += rng.choice((1, 100, 256, 5000))
+            wheel.advance(now)
+
+    def testCancel(self):
+        wheel = TimingWheel()
+        fired = []
+        handles = [wheel.schedule(deadline, lambda deadline=deadline: fired.append(deadline))
+                   for deadline in range(0, 40000, 100)]
+        for handle in handles[::2]:
+            handle.cancel()
+        handles[0].cancel()
+        self.assertFalse(handles[0].active)
+        self.assertTrue(handles[1].active)
+        self.assertEqual(len(handles) // 2, len(wheel))
+
+        wheel.advance(40000)
+        self.assertEqual(list(range(100, 40000, 200)), fired)
+        self.assertFalse(handles[1].active)
+        handles[1].cancel()
+        self.assertEqual(0, len(wheel))
+
+    def testCallbacks(self):
+        wheel = TimingWheel()
+        fired = []
+        handles = []
+        # timers of the same tick fire in the order they were scheduled
+        wheel.schedule(10, lambda: handles[0].cancel())
+        handles.append(wheel.schedule(10, lambda: fired.append("cancelled")))
+        wheel.schedule(10, lambda: wheel.schedule(5, lambda: fired.append("past")))
+        wheel.schedule(10, lambda: fired.append("first"))
+        wheel.schedule(10, lambda: fired.append("second"))
+
+        wheel.advance(11)
+        self.assertEqual(["first", "second"], fired)
+        wheel.advance(12)
+        self.assertEqual(["first", "second", "past"], fired)
+
+        wheel.schedule(100, lambda: fired.append("cleared"))
+        wheel.clear()
+        self.assertEqual(0, wheel.time)
+        wheel.advance(200)
+        self.assertEqual(3, len(fired))
+
+
+class ResendTimerTests(unittest.TestCase):
+
+    def advance(self, peer: Peer, now: int):
+        peer.current_time = now
+        peer.eventQueue.advance(now)
+
+    def testSingleTimer(self):
+        peer = Peer()
+        connection = RecordingConnection()
+        connection.initialize(peer, 5000)
+        connection.canQualityDisconnect = False
+
+        sequenceIDs = []
+        for i in range(20):
+            message = messageModule.create(MessageSendMode.Reliable, 1)
+            message.putUInt16(i)
+            sequenceIDs.append(connection.sendMessage(message))
+        self.assertEqual(20, len(connection.sent))
+        # one timer for all pending messages
+        self.assertEqual(1, len(peer.eventQueue))
+
+        self.advance(peer, 51)
+        self.assertEqual(40, len(connection.sent))
+        self.assertEqual(connection.sent[:20], connection.sent[20:])
+        self.assertEqual(1, len(peer.eventQueue))
+
+        # acknowledged messages are not resent
+        for sequenceID in sequenceIDs[:10]:
+            connection.clearMessage(sequenceID)
+        self.advance(peer, 102)
+        self.assertEqual(connection.sent[10:20], connection.sent[40:])
+
+        connection.localDisconnect()
+        self.assertEqual(0, len(peer.eventQueue))
+        self.assertEqual(0, messageModule.MESSAGE_POOL.outstanding)
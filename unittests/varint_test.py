@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from pytidenetworking.utils import varint
+from pytidenetworking.utils.exceptions import ArgumentOutOfRangeException, NotEnoughBytesError
+
+
+class VarintTests(unittest.TestCase):
+
+    def referenceEncode(self, value: int) -> bytes:
+        result = bytearray()
+        while True:
+            result.append((value & 0x7f) | (0x80 if value >= 0x80 else 0))
+            value >>= 7
+            if value == 0:
+                return bytes(result)
+
+    def testEncode(self):
+        values = list(range(0, 2**15)) + [2**63 - 1, 2**64 - 1, 2**70] + \
+                 [random.getrandbits(random.randint(1, 64)) for _ in range(10000)]
+
+        for value in values:
+            encoded = varint.encodeVarULong(value)
+            self.assertEqual(self.referenceEncode(value), encoded)
+            self.assertEqual(len(encoded), varint.varULongSize(value))
+
+        self.assertRaises(Exception, varint.encodeVarULong, -1)
+
+    def testDecodeUnaligned(self):
+        values = [0, 1, 127, 128, 16383, 16384, 2**56 - 1, 2**56, 2**63 - 1, 2**64 - 1] + \
+                 [random.getrandbits(random.randint(1, 64)) for _ in range(10000)]
+
+        for value in values:
+            encoded = varint.encodeVarULong(value)
+            for shift in range(8):
+                # surround the varint with set bits, which must not leak into the result
+                bits = (int.from_bytes(encoded, "little") << shift) | ((1 << shift) - 1)
+                bits |= 0xffff << (shift + len(encoded) * 8)
+                data = bits.to_bytes(len(encoded) + 3, "little")
+                self.assertEqual((value, len(encoded) * 8), varint.decodeVarULong(data, shift))
+
+    def testMalformed(self):
+        # longer than a 64 bit value takes up, a continuation bit in every byte
+        self.assertRaises(ArgumentOutOfRangeException, varint.decodeVarULong, varint.encodeVarULong(2**70))
+        self.assertRaises(ArgumentOutOfRangeException, varint.decodeVarULong, b"\xff" * 20)
+        self.assertRaises(ArgumentOutOfRangeException, varint.decodeVarULong, b"\xf0" + b"\xff" * 24, 8)
+
+        for value in [1, 300, 2**40, 2**63, 2**64 - 1]:
+            encoded = varint.encodeVarULong(value)
+            for shift in range(8):
+                data = (int.from_bytes(encoded, "little") << shift).to_bytes(len(encoded) + (shift != 0), "little")
+                self.assertEqual((value, len(encoded) * 8), varint.decodeVarULong(data, shift))
+                # the last byte missing
+                self.assertRaises(NotEnoughBytesError, varint.decodeVarULong, data[:-1], shift)
+        self.assertRaises(NotEnoughBytesError, varint.decodeVarULong, b"\xff" * 9)
+        self.assertRaises(NotEnoughBytesError, varint.decodeVarULong, b"\x05", 8)
+
+    def testBatch(self):
+        values = [random.getrandbits(random.randint(1, 64)) for _ in range(1000)] + list(range(300))
+        random.shuffle(values)
+
+        encoded = varint.encodeVarULongs(values)
+        self.assertEqual(b"".join(varint.encodeVarULong(value) for value in values), encoded)
+
+        data = b"\x05" + encoded
+        decoded, bitCount = varint.decodeVarULongs(data, len(values), 8)
+        self.assertEqual(values, decoded)
+        self.assertEqual(len(encoded) * 8, bitCount)
+
+        self.assertRaises(Exception, varint.encodeVarULongs, [1, -1])
+
+
+if __name__ == '__main__':
+    unittest.main()